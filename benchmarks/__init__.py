@@ -0,0 +1 @@
+"""Benchmarks for the build pipeline; see benchmarks/run.py."""
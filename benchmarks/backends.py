@@ -0,0 +1,145 @@
+"""
+Check that every render backend writes the same cell values.
+
+A synthetic program is calculated once and rendered with each backend in
+RENDER_BACKENDS; the saved workbooks are read back and every cell value
+is compared with the openpyxl backend's. Numbers are compared exactly, so
+a backend that loses precision on the way to the XML is reported.
+
+    PYTHONPATH=src python -m benchmarks.backends
+    PYTHONPATH=src python -m benchmarks.backends --weeks 26 --rep-table-ratio 0.5
+"""
+
+from __future__ import annotations
+
+import argparse
+import tempfile
+from pathlib import Path
+from typing import Any
+
+from benchmarks.synthetic import (
+    TRAINING_MAXES,
+    ProgramShape,
+    generate_program,
+    generate_settings,
+    write_rep_tables,
+)
+
+REFERENCE_BACKEND = "openpyxl"
+
+
+def read_values(workbook_path: str | Path) -> dict[str, dict[tuple[int, int], Any]]:
+    """Sheet title -> (row, column) -> value of every non-empty cell."""
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(workbook_path, read_only=True)
+    try:
+        sheets = {}
+        for ws in workbook.worksheets:
+            values = {}
+            for row, cells in enumerate(ws.iter_rows(values_only=True), start=1):
+                for column, value in enumerate(cells, start=1):
+                    if value is not None:
+                        values[(row, column)] = value
+            sheets[ws.title] = values
+        return sheets
+    finally:
+        workbook.close()
+
+
+def compare_values(
+    expected: dict[str, dict[tuple[int, int], Any]],
+    actual: dict[str, dict[tuple[int, int], Any]],
+) -> list[str]:
+    """A message for every sheet or cell whose value differs."""
+    from openpyxl.utils import get_column_letter
+
+    differences = []
+    for title in expected.keys() | actual.keys():
+        if title not in actual or title not in expected:
+            differences.append(f"sheet {title!r} is only in one workbook")
+            continue
+        want, got = expected[title], actual[title]
+        for row, column in sorted(want.keys() | got.keys()):
+            before, after = want.get((row, column)), got.get((row, column))
+            if before != after:
+                differences.append(
+                    f"{title}!{get_column_letter(column)}{row}: "
+                    f"{before!r} != {after!r}"
+                )
+    return differences
+
+
+def check_backends(shape: ProgramShape) -> dict[str, list[str]]:
+    """Render shape with every backend; backend -> its differences."""
+    from colorful_training_template.calculator import calculate_program
+    from colorful_training_template.excel_generator.workout_template_generator import (
+        RENDER_BACKENDS,
+    )
+    from colorful_training_template.model import Program
+    from colorful_training_template.rep_table import compile_rep_tables
+    from colorful_training_template.renderer import render_workbook
+
+    with tempfile.TemporaryDirectory(prefix="ctt-backends-") as tmp:
+        workdir = Path(tmp)
+        rep_table_dir = workdir / "rep_tables"
+        write_rep_tables(rep_table_dir)
+        compile_rep_tables(rep_table_dir)
+
+        settings = generate_settings(workdir / "output", rep_table_dir)
+        calculated = calculate_program(
+            program=Program.from_data(generate_program(shape)),
+            training_maxes=TRAINING_MAXES,
+            settings=settings,
+        )
+
+        values = {}
+        for backend in RENDER_BACKENDS:
+            output_workbook = workdir / f"{backend}.xlsx"
+            render_workbook(
+                calculated,
+                {
+                    **settings,
+                    "output_workbook": str(output_workbook),
+                    "render": {**settings["render"], "backend": backend},
+                },
+            )
+            values[backend] = read_values(output_workbook)
+
+    return {
+        backend: compare_values(values[REFERENCE_BACKEND], backend_values)
+        for backend, backend_values in values.items()
+        if backend != REFERENCE_BACKEND
+    }
+
+
+def main() -> int:
+    defaults = ProgramShape(weeks=4, rep_table_ratio=0.5)
+    parser = argparse.ArgumentParser(
+        description="Check that the render backends write the same cell values."
+    )
+    parser.add_argument("--weeks", type=int, default=defaults.weeks)
+    parser.add_argument(
+        "--rep-table-ratio", type=float, default=defaults.rep_table_ratio
+    )
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+    args = parser.parse_args()
+
+    shape = ProgramShape(
+        weeks=args.weeks, rep_table_ratio=args.rep_table_ratio, seed=args.seed
+    )
+    results = check_backends(shape)
+    failed = False
+    for backend, differences in results.items():
+        if not differences:
+            print(f"{backend}: same values as {REFERENCE_BACKEND}")
+            continue
+        failed = True
+        print(f"{backend}: {len(differences)} value(s) differ from {REFERENCE_BACKEND}:")
+        for message in differences[:20]:
+            print(f"  {message}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,387 @@
+"""
+Benchmark the calculate and render stages on synthetic programs.
+
+Each scenario runs in its own process, so its peak RSS is its own. For
+every stage the wall time (best of --repeat runs), the process peak RSS
+once the stage has finished, and a throughput are reported in the units
+the stage works in: sets/s for calculation and the YAML, weeks/s for the
+charts, cells/s of the sheets a stage fills for the week boxes and the
+companion views (and of the whole workbook for render), and KiB/s of
+uncompressed package XML for save.
+
+    PYTHONPATH=src python -m benchmarks.run --suite scaling
+    PYTHONPATH=src python -m benchmarks.run --save-baseline benchmarks/baseline.json
+    PYTHONPATH=src python -m benchmarks.run --baseline benchmarks/baseline.json
+
+With --baseline, any stage more than --tolerance slower than in the
+baseline (and by more than --min-delta seconds) is reported as a
+regression and the exit status is 1.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import multiprocessing
+import resource
+import sys
+import tempfile
+import time
+import xml.etree.ElementTree as ET
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any
+
+from benchmarks.synthetic import (
+    TRAINING_MAXES,
+    ProgramShape,
+    generate_program,
+    generate_settings,
+    write_rep_tables,
+)
+from colorful_training_template.excel_generator.workout_template_generator import (
+    RENDER_BACKENDS,
+)
+
+# 2: week boxes are sized to the program (render.box_size "global").
+BASELINE_FORMAT_VERSION = 2
+DEFAULT_TOLERANCE = 0.25
+DEFAULT_MIN_DELTA = 0.02
+
+SUITES: dict[str, list[ProgramShape]] = {
+    "quick": [
+        ProgramShape(weeks=4),
+        ProgramShape(weeks=26),
+    ],
+    # Weeks is the dimension the real programs grow in.
+    "scaling": [ProgramShape(weeks=weeks) for weeks in (4, 13, 26, 52, 104)],
+    "shape": [
+        ProgramShape(weeks=12, days_per_week=7),
+        ProgramShape(weeks=12, exercises_per_day=12),
+        ProgramShape(weeks=12, sets_per_exercise=10),
+    ],
+    "mix": [
+        ProgramShape(weeks=26, rep_table_ratio=ratio) for ratio in (0.0, 0.5, 1.0)
+    ],
+}
+SUITES["full"] = [shape for suite in SUITES.values() for shape in suite]
+
+# Stages whose throughput is reported per set or per week.
+PER_SET_STAGES = ("calculate", "write yaml")
+PER_WEEK_STAGES = ("charts",)
+# Sheets written by the "companion views" stage; every other sheet but
+# Charts holds week boxes.
+COMPANION_SHEETS = ("Week View", "Today", "_Program_Data")
+CHART_SHEETS = ("Charts",)
+
+_PACKAGE_NS = {"main": "http://schemas.openxmlformats.org/spreadsheetml/2006/main"}
+_RELATIONSHIP_ID = (
+    "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}id"
+)
+
+
+def _peak_rss_mib() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in KiB on Linux and in bytes on macOS.
+    if sys.platform == "darwin":
+        return peak / (1024 * 1024)
+    return peak / 1024
+
+
+def count_cells(workbook_path: str | Path) -> dict[str, int]:
+    """Sheet title -> cells written to that worksheet of a saved workbook."""
+    with zipfile.ZipFile(workbook_path) as archive:
+        targets = {
+            rel.get("Id"): rel.get("Target")
+            for rel in ET.fromstring(archive.read("xl/_rels/workbook.xml.rels"))
+        }
+        workbook = ET.fromstring(archive.read("xl/workbook.xml"))
+        cells = {}
+        for sheet in workbook.iterfind("main:sheets/main:sheet", _PACKAGE_NS):
+            target = targets[sheet.get(_RELATIONSHIP_ID)]
+            name = target.lstrip("/") if target.startswith("/") else f"xl/{target}"
+            cells[sheet.get("name")] = archive.read(name).count(b"<c ")
+    return cells
+
+
+def package_kib(workbook_path: str | Path) -> float:
+    """Uncompressed size of a saved workbook's parts, in KiB."""
+    with zipfile.ZipFile(workbook_path) as archive:
+        return sum(info.file_size for info in archive.infolist()) / 1024
+
+
+def stage_units(
+    shape: ProgramShape, cells: dict[str, int], kib: float
+) -> dict[str, tuple[float, str]]:
+    """Stage name -> (amount of work, throughput unit) for one run."""
+    companion = sum(cells.get(title, 0) for title in COMPANION_SHEETS)
+    boxes = sum(
+        count
+        for title, count in cells.items()
+        if title not in COMPANION_SHEETS and title not in CHART_SHEETS
+    )
+    units = {
+        "boxes": (boxes, "cells/s"),
+        "companion views": (companion, "cells/s"),
+        "save": (kib, "KiB/s"),
+        "render": (sum(cells.values()), "cells/s"),
+    }
+    for name in PER_SET_STAGES:
+        units[name] = (shape.total_sets, "sets/s")
+    for name in PER_WEEK_STAGES:
+        units[name] = (shape.weeks, "weeks/s")
+    return units
+
+
+def _run_once(
+    shape: ProgramShape, backend: str, workdir: Path
+) -> tuple[dict[str, float], dict[str, float], dict[str, int], float]:
+    from colorful_training_template.calculator import calculate_program
+    from colorful_training_template.model import Program
+    from colorful_training_template.renderer import render_workbook, write_yaml_output
+    from colorful_training_template.timing import StageTimer, recording
+
+    rep_table_dir = workdir / "rep_tables"
+    settings = generate_settings(workdir / "output", rep_table_dir, backend)
+    program = Program.from_data(generate_program(shape))
+
+    seconds: dict[str, float] = {}
+    rss: dict[str, float] = {}
+
+    started = time.perf_counter()
+    calculated = calculate_program(
+        program=program, training_maxes=TRAINING_MAXES, settings=settings
+    )
+    seconds["calculate"] = time.perf_counter() - started
+    rss["calculate"] = _peak_rss_mib()
+
+    started = time.perf_counter()
+    write_yaml_output(calculated.to_data(), settings["output_yaml"])
+    seconds["write yaml"] = time.perf_counter() - started
+    rss["write yaml"] = _peak_rss_mib()
+
+    timer = StageTimer()
+    with recording(timer):
+        render_workbook(calculated, settings)
+    for record in timer.root.children:
+        seconds[record.name] = record.seconds
+    seconds["render"] = timer.root.seconds
+    # RSS is only sampled once render has finished, so its sub-stages
+    # share render's peak.
+    for name in seconds:
+        rss.setdefault(name, _peak_rss_mib())
+
+    output_workbook = settings["output_workbook"]
+    return seconds, rss, count_cells(output_workbook), package_kib(output_workbook)
+
+
+def run_scenario(shape: ProgramShape, backend: str, repeat: int) -> dict[str, Any]:
+    """Benchmark one shape. Meant to run in a fresh process."""
+    from colorful_training_template.rep_table import compile_rep_tables
+
+    with tempfile.TemporaryDirectory(prefix="ctt-bench-") as tmp:
+        workdir = Path(tmp)
+        rep_table_dir = workdir / "rep_tables"
+        write_rep_tables(rep_table_dir)
+        # Builds normally read compiled tables; parsing xlsx is not what
+        # is being measured here.
+        compile_rep_tables(rep_table_dir)
+
+        best: dict[str, float] = {}
+        rss: dict[str, float] = {}
+        cells: dict[str, int] = {}
+        kib = 0.0
+        for _ in range(repeat):
+            seconds, run_rss, cells, kib = _run_once(shape, backend, workdir)
+            for name, value in seconds.items():
+                best[name] = min(best.get(name, value), value)
+            rss = run_rss
+
+    units_by_stage = stage_units(shape, cells, kib)
+    stages = {}
+    for name, value in best.items():
+        # Stages added to the renderer later fall back to workbook cells.
+        units, unit = units_by_stage.get(name, units_by_stage["render"])
+        stages[name] = {
+            "seconds": round(value, 6),
+            "peak_rss_mib": round(rss[name], 1),
+            "throughput": round(units / value, 1) if value > 0 else None,
+            "unit": unit,
+        }
+    return {
+        "scenario": shape.name,
+        "shape": shape.to_dict(),
+        "backend": backend,
+        "sets": shape.total_sets,
+        "cells": sum(cells.values()),
+        "sheet_cells": cells,
+        "package_kib": round(kib, 1),
+        "stages": stages,
+    }
+
+
+def run_suite(
+    shapes: list[ProgramShape], backend: str, repeat: int
+) -> list[dict[str, Any]]:
+    results = []
+    context = multiprocessing.get_context("spawn")
+    for shape in shapes:
+        print(f"Running {shape.name} ({shape.total_sets} sets)...", file=sys.stderr)
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+            results.append(
+                executor.submit(run_scenario, shape, backend, repeat).result()
+            )
+    return results
+
+
+def to_baseline(results: list[dict[str, Any]], backend: str) -> dict[str, Any]:
+    return {
+        "version": BASELINE_FORMAT_VERSION,
+        "backend": backend,
+        "scenarios": {
+            result["scenario"]: {
+                name: stage["seconds"] for name, stage in result["stages"].items()
+            }
+            for result in results
+        },
+    }
+
+
+def load_baseline(path: str | Path) -> dict[str, Any]:
+    with Path(path).open(encoding="utf-8") as f:
+        baseline = json.load(f)
+    if baseline.get("version") != BASELINE_FORMAT_VERSION:
+        raise ValueError(
+            f"{path} has baseline format {baseline.get('version')!r}, "
+            f"expected {BASELINE_FORMAT_VERSION}"
+        )
+    return baseline
+
+
+def compare(
+    results: list[dict[str, Any]],
+    baseline: dict[str, Any],
+    tolerance: float = DEFAULT_TOLERANCE,
+    min_delta: float = DEFAULT_MIN_DELTA,
+) -> list[str]:
+    """
+    Return a message for every stage that is more than `tolerance` (a
+    fraction) and more than `min_delta` seconds slower than the baseline.
+    Stages and scenarios missing from the baseline are not compared.
+    """
+    regressions = []
+    for result in results:
+        expected = baseline["scenarios"].get(result["scenario"], {})
+        for name, stage in result["stages"].items():
+            if name not in expected:
+                continue
+            before, after = expected[name], stage["seconds"]
+            if after > before * (1 + tolerance) and after - before > min_delta:
+                regressions.append(
+                    f"{result['scenario']} / {name}: {before * 1000:.1f}ms -> "
+                    f"{after * 1000:.1f}ms ({(after / before - 1) * 100:+.0f}%)"
+                )
+    return regressions
+
+
+def format_results(
+    results: list[dict[str, Any]], baseline: dict[str, Any] | None = None
+) -> str:
+    header = (
+        f"{'Scenario':<26} {'Stage':<16} {'Time (ms)':>10} "
+        f"{'Throughput':>16} {'Peak RSS (MiB)':>15}"
+    )
+    if baseline is not None:
+        header += f" {'vs baseline':>12}"
+    lines = [header, "-" * len(header)]
+
+    for result in results:
+        expected = (baseline or {}).get("scenarios", {}).get(result["scenario"], {})
+        for name, stage in result["stages"].items():
+            throughput = stage["throughput"]
+            rate = f"{throughput:,.0f} {stage['unit']}" if throughput else "-"
+            line = (
+                f"{result['scenario']:<26} {name:<16} "
+                f"{stage['seconds'] * 1000:>10.1f} {rate:>16} "
+                f"{stage['peak_rss_mib']:>15.1f}"
+            )
+            if baseline is not None:
+                before = expected.get(name)
+                change = (
+                    f"{(stage['seconds'] / before - 1) * 100:+.0f}%"
+                    if before
+                    else "-"
+                )
+                line += f" {change:>12}"
+            lines.append(line)
+    return "\n".join(lines)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Benchmark calculation and rendering on synthetic programs."
+    )
+    parser.add_argument("--suite", choices=sorted(SUITES), default="quick")
+    parser.add_argument("--backend", choices=RENDER_BACKENDS, default="openpyxl")
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=1,
+        help="Runs per scenario; the fastest time of each stage is kept.",
+    )
+    parser.add_argument("--json", metavar="PATH", help="Write full results to PATH.")
+    parser.add_argument(
+        "--baseline", metavar="PATH", help="Compare against a saved baseline."
+    )
+    parser.add_argument(
+        "--save-baseline", metavar="PATH", help="Save these results as a baseline."
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=DEFAULT_TOLERANCE,
+        help="Allowed slowdown per stage as a fraction (default: 0.25).",
+    )
+    parser.add_argument(
+        "--min-delta",
+        type=float,
+        default=DEFAULT_MIN_DELTA,
+        help="Ignore slowdowns smaller than this many seconds (default: 0.02).",
+    )
+    args = parser.parse_args()
+
+    if args.repeat < 1:
+        parser.error(f"--repeat must be >= 1, got {args.repeat}")
+
+    baseline = load_baseline(args.baseline) if args.baseline else None
+    if baseline is not None and baseline["backend"] != args.backend:
+        parser.error(
+            f"baseline was recorded with backend {baseline['backend']!r}, "
+            f"not {args.backend!r}"
+        )
+
+    results = run_suite(SUITES[args.suite], args.backend, args.repeat)
+    print(format_results(results, baseline))
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(results, indent=2) + "\n")
+    if args.save_baseline:
+        Path(args.save_baseline).write_text(
+            json.dumps(to_baseline(results, args.backend), indent=2) + "\n"
+        )
+        print(f"Saved baseline to {args.save_baseline}")
+
+    if baseline is not None:
+        regressions = compare(results, baseline, args.tolerance, args.min_delta)
+        if regressions:
+            print(f"\nREGRESSION: {len(regressions)} stage(s) slower than baseline:")
+            for message in regressions:
+                print(f"  {message}")
+            return 1
+        print("\nNo regressions against the baseline.")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,291 @@
+"""
+Synthetic inputs for the benchmarks: programs of any shape, matching
+training maxes and settings, and rep tables in the StrengthLevel layout.
+
+Run as a module to write a complete input set to a directory, e.g. to
+build a 104-week plan by hand:
+
+    PYTHONPATH=src python -m benchmarks.synthetic /tmp/big --weeks 104
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any
+
+from colorful_training_template.excel_generator.box_layout import BOX_SIZE_MODES
+from colorful_training_template.excel_generator.workout_template_generator import (
+    RENDER_BACKENDS,
+)
+from colorful_training_template.rep_table import REP_TABLE_FILES
+from colorful_training_template.yaml_io import safe_dump
+
+WEEKDAYS = (
+    "Monday",
+    "Tuesday",
+    "Wednesday",
+    "Thursday",
+    "Friday",
+    "Saturday",
+    "Sunday",
+)
+# Percentage-based sets use these lifts so rep_table mode has a table.
+MAIN_LIFTS = tuple(REP_TABLE_FILES)
+# Reps covered by the synthetic (and the bundled) rep tables.
+REP_TABLE_REPS = tuple(range(2, 11))
+TRAINING_MAXES = {
+    "Weighted Pull-Ups": 100.0,
+    "Weighted Dips": 117.5,
+    "Weighted Muscle-Ups": 40.0,
+    "Squat": 210.0,
+    "Close Grip Bench Press": 115.0,
+}
+
+
+@dataclass(frozen=True, slots=True)
+class ProgramShape:
+    """
+    The dimensions of a synthetic program.
+
+    rep_table_ratio is the share of main-lift exercises that set
+    `calculation_mode: rep_table`; the rest use training_max.
+    accessory_ratio is the share of exercises that are accessories with
+    "NxM" reps and no percentage, like most of data/program.yaml.
+    """
+
+    weeks: int = 12
+    days_per_week: int = 4
+    exercises_per_day: int = 6
+    sets_per_exercise: int = 4
+    rep_table_ratio: float = 0.0
+    accessory_ratio: float = 0.25
+    seed: int = 0
+
+    def __post_init__(self) -> None:
+        if not 1 <= self.days_per_week <= len(WEEKDAYS):
+            raise ValueError(
+                f"days_per_week must be between 1 and {len(WEEKDAYS)}, "
+                f"got {self.days_per_week}"
+            )
+        for name in ("weeks", "exercises_per_day", "sets_per_exercise"):
+            if getattr(self, name) < 1:
+                raise ValueError(f"{name} must be >= 1, got {getattr(self, name)}")
+        for name in ("rep_table_ratio", "accessory_ratio"):
+            if not 0.0 <= getattr(self, name) <= 1.0:
+                raise ValueError(
+                    f"{name} must be between 0 and 1, got {getattr(self, name)}"
+                )
+
+    @property
+    def name(self) -> str:
+        return (
+            f"w{self.weeks}-d{self.days_per_week}-e{self.exercises_per_day}"
+            f"-s{self.sets_per_exercise}-rt{round(self.rep_table_ratio * 100)}"
+        )
+
+    @property
+    def total_sets(self) -> int:
+        """Sets after expansion, i.e. as calculated and rendered."""
+        return (
+            self.weeks
+            * self.days_per_week
+            * self.exercises_per_day
+            * self.sets_per_exercise
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+def _main_lift(rng: random.Random, shape: ProgramShape) -> dict[str, Any]:
+    exercise: dict[str, Any] = {"name": rng.choice(MAIN_LIFTS)}
+    if rng.random() < shape.rep_table_ratio:
+        exercise["calculation_mode"] = "rep_table"
+    else:
+        exercise["calculation_mode"] = "training_max"
+    exercise["sets"] = [
+        {
+            "reps": rng.choice(REP_TABLE_REPS),
+            "percentage_1rm": rng.randrange(120, 191) * 0.5,
+            "notes": f"Set {index + 1}; leave 1-2 reps in reserve",
+        }
+        for index in range(shape.sets_per_exercise)
+    ]
+    return exercise
+
+
+def _accessory(rng: random.Random, shape: ProgramShape, index: int) -> dict[str, Any]:
+    return {
+        "name": f"Accessory {index + 1}",
+        "sets": [
+            {
+                "reps": f"{shape.sets_per_exercise}x{rng.choice((8, 10, 12, 15))}",
+                "notes": "Controlled tempo; RPE 7-8",
+            }
+        ],
+    }
+
+
+def generate_program(shape: ProgramShape) -> list[dict[str, Any]]:
+    """
+    Program data in the layout of data/program.yaml. Every week is built
+    separately, so no two weeks share objects the way YAML aliases would.
+    """
+    rng = random.Random(shape.seed)
+    day_indexes = [
+        round(index * len(WEEKDAYS) / shape.days_per_week)
+        for index in range(shape.days_per_week)
+    ]
+
+    program = []
+    for week_number in range(1, shape.weeks + 1):
+        days = []
+        for day_number, weekday_index in enumerate(day_indexes, start=1):
+            exercises = [
+                _accessory(rng, shape, index)
+                if rng.random() < shape.accessory_ratio
+                else _main_lift(rng, shape)
+                for index in range(shape.exercises_per_day)
+            ]
+            days.append(
+                {
+                    "weekday": WEEKDAYS[weekday_index],
+                    "session": f"Day {day_number}",
+                    "exercises": exercises,
+                }
+            )
+        program.append({f"week_{week_number}": days})
+    return program
+
+
+def generate_settings(
+    output_dir: str | Path,
+    rep_table_dir: str | Path,
+    backend: str = "openpyxl",
+    box_size: str = "global",
+) -> dict[str, Any]:
+    """
+    Settings for a synthetic program. Week boxes are sized to the program
+    by default; the "fixed" box holds only 8 exercises of 7 sets and cuts
+    off larger days.
+    """
+    output_dir = Path(output_dir)
+    return {
+        "start_date": "2026-01-05",
+        "output_yaml": str(output_dir / "calc_workout_data.yaml"),
+        "output_workbook": str(output_dir / "workout_plan.xlsx"),
+        "calculation_mode": "training_max",
+        "rep_table_dir": str(rep_table_dir),
+        "rounding": {"default": 2.5},
+        "render": {"backend": backend, "box_size": box_size},
+    }
+
+
+def write_rep_tables(
+    directory: str | Path,
+    min_weight: float = 20.0,
+    max_weight: float = 300.0,
+    step: float = 2.5,
+) -> list[Path]:
+    """
+    Write a rep table for every lift in REP_TABLE_FILES, laid out like the
+    StrengthLevel exports: a "Reps" banner row, a header row of rep counts,
+    then one row per base weight with Epley e1RM values as "123.4kg" text.
+    """
+    from openpyxl import Workbook
+
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+
+    rows = round((max_weight - min_weight) / step) + 1
+    base_weights = [min_weight + index * step for index in range(rows)]
+
+    paths = []
+    for filename in REP_TABLE_FILES.values():
+        workbook = Workbook(write_only=True)
+        sheet = workbook.create_sheet()
+        sheet.append([None, "Reps"] + [None] * (len(REP_TABLE_REPS) - 1))
+        sheet.append(["Weight (kg)", *REP_TABLE_REPS])
+        for weight in base_weights:
+            sheet.append(
+                [weight]
+                + [f"{weight * (1 + reps / 30):.1f}kg" for reps in REP_TABLE_REPS]
+            )
+        path = directory / filename
+        workbook.save(path)
+        paths.append(path)
+    return paths
+
+
+def write_inputs(
+    directory: str | Path,
+    shape: ProgramShape,
+    backend: str = "openpyxl",
+    box_size: str = "global",
+) -> dict[str, Path]:
+    """
+    Write program.yaml, training_maxes.yaml, settings.yaml and a rep_tables/
+    directory under directory. Outputs go to directory/output.
+    """
+    directory = Path(directory)
+    rep_table_dir = directory / "rep_tables"
+    write_rep_tables(rep_table_dir)
+
+    files = {
+        "program": (directory / "program.yaml", generate_program(shape)),
+        "training_maxes": (directory / "training_maxes.yaml", TRAINING_MAXES),
+        "settings": (
+            directory / "settings.yaml",
+            generate_settings(
+                directory / "output", rep_table_dir, backend, box_size
+            ),
+        ),
+    }
+    for path, data in files.values():
+        with path.open("w", encoding="utf-8") as f:
+            safe_dump(data, f, sort_keys=False, default_flow_style=False)
+    return {role: path for role, (path, _) in files.items()}
+
+
+def main() -> int:
+    defaults = ProgramShape()
+    parser = argparse.ArgumentParser(
+        description="Write a synthetic program, settings and rep tables."
+    )
+    parser.add_argument("directory", help="Directory to write the inputs to.")
+    parser.add_argument("--weeks", type=int, default=defaults.weeks)
+    parser.add_argument("--days", type=int, default=defaults.days_per_week)
+    parser.add_argument("--exercises", type=int, default=defaults.exercises_per_day)
+    parser.add_argument("--sets", type=int, default=defaults.sets_per_exercise)
+    parser.add_argument(
+        "--rep-table-ratio", type=float, default=defaults.rep_table_ratio
+    )
+    parser.add_argument(
+        "--accessory-ratio", type=float, default=defaults.accessory_ratio
+    )
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+    parser.add_argument("--backend", choices=RENDER_BACKENDS, default="openpyxl")
+    parser.add_argument("--box-size", choices=BOX_SIZE_MODES, default="global")
+    args = parser.parse_args()
+
+    shape = ProgramShape(
+        weeks=args.weeks,
+        days_per_week=args.days,
+        exercises_per_day=args.exercises,
+        sets_per_exercise=args.sets,
+        rep_table_ratio=args.rep_table_ratio,
+        accessory_ratio=args.accessory_ratio,
+        seed=args.seed,
+    )
+    paths = write_inputs(args.directory, shape, args.backend, args.box_size)
+    print(f"Wrote {shape.name} ({shape.total_sets} sets):")
+    for path in paths.values():
+        print(f"- {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
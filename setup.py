@@ -7,10 +7,11 @@ setup(
     package_dir={"": "src"},
     install_requires=[
         "openpyxl==3.1.5",
+        "numpy==2.0.2",
         "pandas==2.2.3",
         "PyYAML==6.0.2",
     ],
-    python_requires=">=3.9",
+    python_requires=">=3.10",
     entry_points={
         "console_scripts": [
             "training-plan=colorful_training_template.cli:main",
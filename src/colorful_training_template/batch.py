@@ -0,0 +1,203 @@
+from __future__ import annotations
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from colorful_training_template.build_cache import BuildCache, build_cache_key
+from colorful_training_template.config import (
+    ConfigError,
+    load_training_maxes,
+    load_yaml,
+    validate_settings,
+)
+from colorful_training_template.incremental import IncrementalBuild
+from colorful_training_template.main import build_plan
+from colorful_training_template.model import Program
+from colorful_training_template.rep_table import DEFAULT_REP_TABLE_DIR
+
+ATHLETE_MAXES_FILE = "training_maxes.yaml"
+ATHLETE_SETTINGS_FILE = "settings.yaml"
+DEFAULT_BATCH_OUTPUT_DIR = Path("output") / "athletes"
+
+# Shared program, sent to each worker process once by _init_worker.
+_WORKER_PROGRAM: Program | None = None
+
+
+class BatchError(Exception):
+    """Raised when a batch build cannot be started."""
+
+
+@dataclass(slots=True)
+class AthleteResult:
+    name: str
+    output_yaml: str | None = None
+    output_workbook: str | None = None
+    seconds: float = 0.0
+    error: str | None = None
+    cached: bool = False
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def discover_athletes(athletes_dir: str | Path) -> list[Path]:
+    """
+    Return the athlete directories under athletes_dir, sorted by name.
+    An athlete directory is any subdirectory holding a training_maxes.yaml.
+    """
+    athletes_dir = Path(athletes_dir)
+    if not athletes_dir.is_dir():
+        raise BatchError(f"Athletes directory not found: {athletes_dir}")
+
+    return sorted(
+        path
+        for path in athletes_dir.iterdir()
+        if path.is_dir() and (path / ATHLETE_MAXES_FILE).is_file()
+    )
+
+
+def merge_settings(
+    base: dict[str, Any], overrides: dict[str, Any]
+) -> dict[str, Any]:
+    """
+    Apply an athlete's settings overrides. Nested mappings such as
+    `rounding` and `render` are merged key by key rather than replaced.
+    """
+    merged = dict(base)
+    for key, value in overrides.items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = {**merged[key], **value}
+        else:
+            merged[key] = value
+    return merged
+
+
+def athlete_settings(
+    athlete_dir: Path,
+    base_settings: dict[str, Any],
+    output_dir: Path,
+) -> dict[str, Any]:
+    """
+    Settings for one athlete: the shared settings, outputs redirected to
+    output_dir/<athlete>/, then the athlete's own settings.yaml if present.
+    """
+    settings = dict(base_settings)
+    athlete_output_dir = output_dir / athlete_dir.name
+    settings["output_yaml"] = str(
+        athlete_output_dir / Path(base_settings["output_yaml"]).name
+    )
+    settings["output_workbook"] = str(
+        athlete_output_dir / Path(base_settings["output_workbook"]).name
+    )
+
+    overrides_path = athlete_dir / ATHLETE_SETTINGS_FILE
+    if overrides_path.is_file():
+        overrides = load_yaml(overrides_path)
+        if not isinstance(overrides, dict):
+            raise ConfigError(f"{overrides_path} must be a mapping")
+        settings = merge_settings(settings, overrides)
+
+    return validate_settings(settings)
+
+
+def _init_worker(program: Program) -> None:
+    global _WORKER_PROGRAM
+    _WORKER_PROGRAM = program
+
+
+def _build_athlete(
+    athlete_dir: Path,
+    base_settings: dict[str, Any],
+    output_dir: Path,
+    cache_inputs: dict[str, Path] | None,
+) -> AthleteResult:
+    result = AthleteResult(name=athlete_dir.name)
+    started = time.perf_counter()
+    try:
+        settings = athlete_settings(athlete_dir, base_settings, output_dir)
+        outputs = [settings["output_yaml"], settings["output_workbook"]]
+
+        cache_key = None
+        if cache_inputs is not None:
+            cache_key = build_cache_key(
+                {
+                    **cache_inputs,
+                    "training_maxes": athlete_dir / ATHLETE_MAXES_FILE,
+                    "athlete_settings": athlete_dir / ATHLETE_SETTINGS_FILE,
+                },
+                rep_table_dir=settings.get("rep_table_dir", DEFAULT_REP_TABLE_DIR),
+            )
+            result.cached = BuildCache().restore(cache_key, outputs)
+
+        if not result.cached:
+            training_maxes = load_training_maxes(athlete_dir / ATHLETE_MAXES_FILE)
+            incremental = IncrementalBuild() if cache_key is not None else None
+            build_plan(_WORKER_PROGRAM, training_maxes, settings, incremental)
+            if cache_key is not None:
+                BuildCache().store(cache_key, outputs)
+    except Exception as exc:
+        result.error = f"{type(exc).__name__}: {exc}"
+    else:
+        result.output_yaml, result.output_workbook = outputs
+    result.seconds = time.perf_counter() - started
+    return result
+
+
+def build_batch(
+    athletes_dir: str | Path,
+    program: Program,
+    base_settings: dict[str, Any],
+    output_dir: str | Path = DEFAULT_BATCH_OUTPUT_DIR,
+    workers: int | None = None,
+    cache_inputs: dict[str, Path] | None = None,
+) -> list[AthleteResult]:
+    """
+    Build a plan for every athlete under athletes_dir from one shared,
+    already parsed program.
+
+    Athletes are built across a pool of `workers` processes (default: one
+    per CPU, capped at the number of athletes). With workers=1 everything
+    runs in this process. A failing athlete is reported in its result and
+    does not stop the others.
+
+    cache_inputs names the files the shared program and settings were
+    loaded from. When given, each athlete's build is looked up in the
+    build cache by those files plus the athlete's own, and stored after.
+    """
+    athlete_dirs = discover_athletes(athletes_dir)
+    if not athlete_dirs:
+        raise BatchError(
+            f"No athlete directories with a {ATHLETE_MAXES_FILE} in {athletes_dir}"
+        )
+
+    output_dir = Path(output_dir)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers < 1:
+        raise BatchError(f"workers must be >= 1, got {workers}")
+    workers = min(workers, len(athlete_dirs))
+
+    if workers == 1:
+        _init_worker(program)
+        return [
+            _build_athlete(athlete_dir, base_settings, output_dir, cache_inputs)
+            for athlete_dir in athlete_dirs
+        ]
+
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(program,),
+    ) as executor:
+        futures = [
+            executor.submit(
+                _build_athlete, athlete_dir, base_settings, output_dir, cache_inputs
+            )
+            for athlete_dir in athlete_dirs
+        ]
+        return [future.result() for future in futures]
@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+import filecmp
+import hashlib
+import os
+import shutil
+from pathlib import Path
+
+from colorful_training_template import __version__
+
+BUILD_CACHE_DIR = Path(".build_cache")
+# Bump when the layout of cache entries changes.
+CACHE_FORMAT_VERSION = 1
+# Once entries take up more than this, the least recently used are evicted.
+DEFAULT_MAX_CACHE_BYTES = 256 * 1024 * 1024
+
+PACKAGE_DIR = Path(__file__).resolve().parent
+_SOURCE_DIGEST: str | None = None
+
+
+def source_digest() -> str:
+    """
+    Digest of the package's own source, so a code change invalidates
+    cached builds even when the version number has not been bumped.
+    """
+    global _SOURCE_DIGEST
+    if _SOURCE_DIGEST is None:
+        digest = hashlib.sha256()
+        for path in sorted(PACKAGE_DIR.rglob("*.py")):
+            digest.update(path.relative_to(PACKAGE_DIR).as_posix().encode())
+            digest.update(path.read_bytes())
+        _SOURCE_DIGEST = digest.hexdigest()
+    return _SOURCE_DIGEST
+
+
+def build_cache_key(
+    inputs: dict[str, str | Path | None],
+    rep_table_dir: str | Path | None = None,
+    extra: dict[str, str] | None = None,
+) -> str:
+    """
+    Hash everything a build's outputs depend on.
+
+    `inputs` maps a role (e.g. "program") to a file whose bytes are hashed;
+    a None or missing path records that the input is absent. Every rep
+    table xlsx in rep_table_dir is hashed too, as are `extra` strings that
+    affect the outputs without living in an input file.
+    """
+    digest = hashlib.sha256()
+
+    def update(label: str, data: bytes) -> None:
+        digest.update(f"{label}\0{len(data)}\0".encode())
+        digest.update(data)
+
+    update("format", str(CACHE_FORMAT_VERSION).encode())
+    update("version", __version__.encode())
+    update("source", source_digest().encode())
+
+    for role in sorted(inputs):
+        path = inputs[role]
+        if path is None or not Path(path).is_file():
+            update(f"absent:{role}", b"")
+        else:
+            update(f"input:{role}", Path(path).read_bytes())
+
+    if rep_table_dir is not None and Path(rep_table_dir).is_dir():
+        for path in sorted(Path(rep_table_dir).glob("*.xlsx")):
+            update(f"rep_table:{path.name}", path.read_bytes())
+
+    for name in sorted(extra or {}):
+        update(f"extra:{name}", extra[name].encode())
+
+    return digest.hexdigest()
+
+
+def _is_cache_key(name: str) -> bool:
+    return len(name) == 64 and all(char in "0123456789abcdef" for char in name)
+
+
+def _tree_size(path: Path) -> int:
+    return sum(item.stat().st_size for item in path.rglob("*") if item.is_file())
+
+
+class BuildCache:
+    """
+    Build outputs stored under cache_dir/<key>/, one file per output,
+    named after the output's basename.
+
+    Entries are kept to max_bytes in total: after every store, the least
+    recently stored or restored entries are evicted until the rest fit.
+    The entry just stored is always kept.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str | Path = BUILD_CACHE_DIR,
+        max_bytes: int = DEFAULT_MAX_CACHE_BYTES,
+    ):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+
+    def _entry_dir(self, key: str) -> Path:
+        return self.cache_dir / key
+
+    def restore(self, key: str, outputs: list[str | Path]) -> bool:
+        """
+        Copy a cached build's artifacts to the output paths. Returns False,
+        touching nothing, if there is no complete entry for key. Outputs
+        that already match the cached artifact are left alone.
+        """
+        entry = self._entry_dir(key)
+        artifacts = [entry / Path(output).name for output in outputs]
+        if not all(artifact.is_file() for artifact in artifacts):
+            return False
+
+        try:
+            for artifact, output in zip(artifacts, outputs):
+                output = Path(output)
+                if output.is_file() and filecmp.cmp(artifact, output, shallow=False):
+                    continue
+                output.parent.mkdir(parents=True, exist_ok=True)
+                shutil.copyfile(artifact, output)
+            # Mark the entry as recently used for eviction.
+            os.utime(entry)
+        except FileNotFoundError:
+            # Evicted by a concurrent build; the caller rebuilds.
+            return False
+        return True
+
+    def store(self, key: str, outputs: list[str | Path]) -> None:
+        """
+        Save the outputs of a finished build. The entry is written to a
+        temporary directory and renamed into place, so concurrent builds
+        never see a partial entry.
+        """
+        entry = self._entry_dir(key)
+        if entry.is_dir():
+            return
+
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        staging = self.cache_dir / f".{key}.{os.getpid()}.tmp"
+        shutil.rmtree(staging, ignore_errors=True)
+        staging.mkdir()
+        for output in outputs:
+            shutil.copyfile(output, staging / Path(output).name)
+
+        try:
+            staging.rename(entry)
+        except OSError:
+            # Another build stored the same key first.
+            shutil.rmtree(staging, ignore_errors=True)
+        self.prune(keep=key)
+
+    def prune(self, keep: str | None = None) -> list[str]:
+        """
+        Evict the least recently used entries until the rest take up at
+        most max_bytes, never evicting keep. Returns the evicted keys.
+        """
+        entries = []
+        try:
+            children = list(self.cache_dir.iterdir())
+        except FileNotFoundError:
+            return []
+        for path in children:
+            if not (path.is_dir() and _is_cache_key(path.name)):
+                continue
+            try:
+                entries.append((path.stat().st_mtime, _tree_size(path), path))
+            except FileNotFoundError:
+                continue
+        entries.sort(reverse=True)
+
+        evicted = []
+        total = 0
+        for _, size, path in entries:
+            if total + size <= self.max_bytes or path.name == keep:
+                total += size
+                continue
+            # Rename first so a concurrent restore never sees a partial entry.
+            doomed = self.cache_dir / f".{path.name}.{os.getpid()}.evict"
+            try:
+                path.rename(doomed)
+            except OSError:
+                continue
+            shutil.rmtree(doomed, ignore_errors=True)
+            evicted.append(path.name)
+        return evicted
@@ -1,16 +1,24 @@
 from __future__ import annotations
 
-from copy import deepcopy
 from typing import Any
 
+import numpy as np
+
+from colorful_training_template.model import (
+    Day,
+    Exercise,
+    Program,
+    SetPrescription,
+    Week,
+)
 from colorful_training_template.rounding import (
     get_rounding_increment,
-    round_to_increment,
+    round_to_increment_array,
 )
 from colorful_training_template.rep_table import (
+    DEFAULT_REP_TABLE_DIR,
     RepTableError,
-    calculate_weight_from_rep_table,
-    get_rep_table_percent_for_reps,
+    get_rep_table_store,
 )
 
 
@@ -69,27 +77,21 @@ def parse_reps_field(reps_value: Any) -> tuple[int, int]:
     return num_sets, reps_per_set
 
 
-def expand_sets(sets: list[dict[str, Any]]) -> list[dict[str, Any]]:
+def expand_sets(sets: list[SetPrescription]) -> list[SetPrescription]:
     """
     Expand set prescriptions like:
-    {'reps': '4x4', 'percentage_1rm': 60}
+    reps='4x4', percentage_1rm=60
     into four individual sets with reps=4.
+
+    Expanded sets share their source mapping instead of copying it.
     """
-    expanded: list[dict[str, Any]] = []
+    expanded: list[SetPrescription] = []
 
     for set_data in sets:
-        if not isinstance(set_data, dict):
-            raise CalculationError(f"Each set must be a mapping, got: {set_data!r}")
-
-        if "reps" not in set_data:
-            raise CalculationError(f"Missing 'reps' in set: {set_data!r}")
-
-        num_sets, reps_per_set = parse_reps_field(set_data["reps"])
+        num_sets, reps_per_set = parse_reps_field(set_data.reps)
 
         for _ in range(num_sets):
-            new_set = deepcopy(set_data)
-            new_set["reps"] = reps_per_set
-            expanded.append(new_set)
+            expanded.append(set_data.with_reps(reps_per_set))
 
     return expanded
 
@@ -118,8 +120,8 @@ def validate_percentage(percentage: Any, exercise_name: str) -> float:
 
 def resolve_calculation_mode(
     *,
-    set_data: dict[str, Any],
-    exercise: dict[str, Any],
+    set_data: SetPrescription,
+    exercise: Exercise,
     settings: dict[str, Any],
 ) -> str:
     """
@@ -129,8 +131,8 @@ def resolve_calculation_mode(
     3. global settings calculation_mode
     """
     mode = (
-        set_data.get("calculation_mode")
-        or exercise.get("calculation_mode")
+        set_data.calculation_mode
+        or exercise.calculation_mode
         or settings.get("calculation_mode", "training_max")
     )
 
@@ -140,84 +142,134 @@ def resolve_calculation_mode(
     return mode
 
 
-def calculate_set_weight_training_max_mode(
-    *,
-    exercise_name: str,
-    percentage_1rm: float,
-    training_maxes: dict[str, float],
-    rounding_cfg: dict[str, float],
-) -> str:
-    canonical_name = canonical_exercise_name(exercise_name)
-
-    if canonical_name not in training_maxes:
-        raise CalculationError(
-            f"No training max found for exercise '{exercise_name}' "
-            f"(canonical: '{canonical_name}')"
-        )
-
-    training_max = float(training_maxes[canonical_name])
-    increment = float(get_rounding_increment(canonical_name, rounding_cfg))
-
-    raw_weight = training_max * (percentage_1rm / 100.0)
-    rounded_weight = round_to_increment(raw_weight, increment, mode="nearest")
-
-    return format_weight(rounded_weight)
-
-
-def calculate_set_weight_rep_table_mode(
-    *,
-    exercise_name: str,
-    reps: int,
-    percentage_1rm: float,
-    training_maxes: dict[str, float],
-    rounding_cfg: dict[str, float],
-    rep_table_dir: str,
-) -> tuple[str, float]:
+class WeightBatch:
     """
-    Returns:
-        (formatted_weight, rep_table_percent_for_reps)
+    Columnar batch of percentage-based sets awaiting a weight.
 
-    In rep_table mode:
-    - percentage_1rm is applied to the exercise training max to get a target e1RM
-    - the requested reps column is searched for the nearest e1RM match
-    - the matching base-weight row becomes the planned weight
+    Sets are collected in program order with their training max, rounding
+    increment, reps, percentage and mode. resolve() then computes every
+    weight with array operations and writes the results back onto the sets.
+    Lookups that can fail (missing training max, bad rounding config) are
+    done in add() so errors still surface at the first offending set.
     """
-    canonical_name = canonical_exercise_name(exercise_name)
 
-    if canonical_name not in training_maxes:
-        raise CalculationError(
-            f"No training max found for exercise '{exercise_name}' "
-            f"(canonical: '{canonical_name}')"
-        )
-
-    training_max = float(training_maxes[canonical_name])
-    increment = float(get_rounding_increment(canonical_name, rounding_cfg))
-
-    target_weight = training_max * (percentage_1rm / 100.0)
-
-    table_weight = calculate_weight_from_rep_table(
-        exercise_name=canonical_name,
-        reps=reps,
-        target_weight=target_weight,
-        rep_table_dir=rep_table_dir,
-    )
-
-    rounded_weight = round_to_increment(table_weight, increment, mode="nearest")
-    rep_table_percent = get_rep_table_percent_for_reps(
-        exercise_name=canonical_name,
-        reps=reps,
-        rep_table_dir=rep_table_dir,
-    )
-
-    return format_weight(rounded_weight), rep_table_percent
+    def __init__(
+        self,
+        *,
+        training_maxes: dict[str, float],
+        rounding_cfg: dict[str, Any],
+        rep_table_dir: str,
+    ) -> None:
+        self.training_maxes = training_maxes
+        self.rounding_cfg = rounding_cfg
+        self.rep_table_dir = rep_table_dir
+
+        self.sets: list[SetPrescription] = []
+        self.training_max_values: list[float] = []
+        self.increments: list[float] = []
+        self.reps: list[int] = []
+        self.percentages: list[float] = []
+        # (canonical exercise name, reps) -> batch indices of rep_table sets
+        self.rep_table_groups: dict[tuple[str, int], list[int]] = {}
+
+        self._exercise_cache: dict[str, tuple[str, float, float]] = {}
+
+    def __len__(self) -> int:
+        return len(self.sets)
+
+    def _resolve_exercise(self, exercise_name: str) -> tuple[str, float, float]:
+        cached = self._exercise_cache.get(exercise_name)
+        if cached is not None:
+            return cached
+
+        canonical_name = canonical_exercise_name(exercise_name)
+
+        if canonical_name not in self.training_maxes:
+            raise CalculationError(
+                f"No training max found for exercise '{exercise_name}' "
+                f"(canonical: '{canonical_name}')"
+            )
+
+        training_max = float(self.training_maxes[canonical_name])
+        increment = float(get_rounding_increment(canonical_name, self.rounding_cfg))
+
+        resolved = (canonical_name, training_max, increment)
+        self._exercise_cache[exercise_name] = resolved
+        return resolved
+
+    def add(
+        self,
+        set_data: SetPrescription,
+        *,
+        exercise_name: str,
+        reps: int,
+        percentage_1rm: float,
+        mode: str,
+    ) -> None:
+        canonical_name, training_max, increment = self._resolve_exercise(exercise_name)
+
+        index = len(self.sets)
+        self.sets.append(set_data)
+        self.training_max_values.append(training_max)
+        self.increments.append(increment)
+        self.reps.append(reps)
+        self.percentages.append(percentage_1rm)
+
+        if mode == "rep_table":
+            self.rep_table_groups.setdefault((canonical_name, reps), []).append(index)
+
+    def resolve(self) -> None:
+        if not self.sets:
+            return
+
+        training_max = np.asarray(self.training_max_values, dtype=np.float64)
+        percentages = np.asarray(self.percentages, dtype=np.float64)
+        increments = np.asarray(self.increments, dtype=np.float64)
+
+        target_weights = training_max * (percentages / 100.0)
+        weights = round_to_increment_array(target_weights, increments, mode="nearest")
+
+        # Each rep_table set is either resolved from its table or records why
+        # it fell back to the training-max weight already in `weights`.
+        rep_table_results: dict[int, dict[str, Any]] = {}
+
+        store = get_rep_table_store()
+        for (canonical_name, reps), indices in self.rep_table_groups.items():
+            rows = np.asarray(indices, dtype=np.intp)
+
+            try:
+                table = store.get(canonical_name, self.rep_table_dir)
+                table_weights = table.nearest_base_weights(reps, target_weights[rows])
+            except RepTableError as exc:
+                fallback = {
+                    "rep_table_fallback": "training_max",
+                    "rep_table_error": str(exc),
+                }
+                for index in indices:
+                    rep_table_results[index] = fallback
+                continue
+
+            weights[rows] = round_to_increment_array(
+                table_weights, increments[rows], mode="nearest"
+            )
+            found = {"rep_table_percent_for_reps": float(reps)}
+            for index in indices:
+                rep_table_results[index] = found
+
+        for index, (set_data, weight) in enumerate(zip(self.sets, weights.tolist())):
+            set_data.weight = format_weight(weight)
+            set_data.weight_kg = weight
+            extra = rep_table_results.get(index)
+            if extra is not None:
+                set_data.computed.update(extra)
 
 
 def calculate_program(
     *,
-    program: list[dict[str, Any]],
+    program: Program,
     training_maxes: dict[str, float],
     settings: dict[str, Any],
-) -> list[dict[str, Any]]:
+) -> Program:
     """
     Walk the whole program structure and calculate set weights for any set that has
     'percentage_1rm'. Accessories without percentages are left untouched.
@@ -228,83 +280,71 @@ def calculate_program(
 
     Rep-table mode automatically falls back to training-max mode when the
     rep table does not support the requested reps, e.g. singles.
+
+    Sets are validated while walking the program and collected into a
+    WeightBatch; all weights are then calculated in one vectorised pass.
+    The input program is never mutated.
     """
-    calculated_program = deepcopy(program)
     rounding_cfg = settings.get("rounding", {"default": 2.5})
-    rep_table_dir = settings.get("rep_table_dir", "reference/rep_max_tables")
-
-    for week in calculated_program:
-        for _, day_list in week.items():
-            if not isinstance(day_list, list):
-                raise CalculationError("Each week value must be a list of training days")
-
-            for day in day_list:
-                exercises = day.get("exercises", [])
-                if not isinstance(exercises, list):
-                    raise CalculationError("Day 'exercises' must be a list")
-
-                for exercise in exercises:
-                    exercise_name = exercise.get("name")
-                    if not isinstance(exercise_name, str) or not exercise_name.strip():
-                        raise CalculationError(
-                            f"Exercise must have a valid name: {exercise!r}"
-                        )
-
-                    raw_sets = exercise.get("sets", [])
-                    if not isinstance(raw_sets, list):
-                        raise CalculationError(
-                            f"Exercise '{exercise_name}' has invalid 'sets': {raw_sets!r}"
-                        )
-
-                    expanded_sets = expand_sets(raw_sets)
-
-                    for set_data in expanded_sets:
-                        if "percentage_1rm" not in set_data:
-                            continue
-
-                        pct = validate_percentage(set_data["percentage_1rm"], exercise_name)
-                        set_data["percentage_1rm"] = pct
-
-                        mode = resolve_calculation_mode(
-                            set_data=set_data,
-                            exercise=exercise,
-                            settings=settings,
-                        )
-
-                        reps_for_set = int(set_data["reps"])
-
-                        if mode == "training_max":
-                            set_data["weight"] = calculate_set_weight_training_max_mode(
-                                exercise_name=exercise_name,
-                                percentage_1rm=pct,
-                                training_maxes=training_maxes,
-                                rounding_cfg=rounding_cfg,
-                            )
-
-                        elif mode == "rep_table":
-                            try:
-                                weight, rep_table_percent = (
-                                    calculate_set_weight_rep_table_mode(
-                                        exercise_name=exercise_name,
-                                        reps=reps_for_set,
-                                        percentage_1rm=pct,
-                                        training_maxes=training_maxes,
-                                        rounding_cfg=rounding_cfg,
-                                        rep_table_dir=rep_table_dir,
-                                    )
-                                )
-                                set_data["weight"] = weight
-                                set_data["rep_table_percent_for_reps"] = rep_table_percent
-                            except RepTableError as exc:
-                                set_data["weight"] = calculate_set_weight_training_max_mode(
-                                    exercise_name=exercise_name,
-                                    percentage_1rm=pct,
-                                    training_maxes=training_maxes,
-                                    rounding_cfg=rounding_cfg,
-                                )
-                                set_data["rep_table_fallback"] = "training_max"
-                                set_data["rep_table_error"] = str(exc)
-
-                    exercise["sets"] = expanded_sets
-
-    return calculated_program
+    rep_table_dir = settings.get("rep_table_dir", DEFAULT_REP_TABLE_DIR)
+
+    batch = WeightBatch(
+        training_maxes=training_maxes,
+        rounding_cfg=rounding_cfg,
+        rep_table_dir=rep_table_dir,
+    )
+
+    calculated_weeks: list[Week] = []
+
+    for week in program.weeks:
+        calculated_days: list[Day] = []
+
+        for day in week.days:
+            calculated_exercises: list[Exercise] = []
+
+            for exercise in day.exercises:
+                expanded_sets = expand_sets(exercise.sets)
+
+                for set_data in expanded_sets:
+                    if not set_data.has_percentage:
+                        continue
+
+                    pct = validate_percentage(set_data.percentage_1rm, exercise.name)
+                    set_data.percentage_1rm = pct
+
+                    mode = resolve_calculation_mode(
+                        set_data=set_data,
+                        exercise=exercise,
+                        settings=settings,
+                    )
+
+                    batch.add(
+                        set_data,
+                        exercise_name=exercise.name,
+                        reps=int(set_data.reps),
+                        percentage_1rm=pct,
+                        mode=mode,
+                    )
+
+                calculated_exercises.append(
+                    Exercise(
+                        name=exercise.name,
+                        sets=expanded_sets,
+                        calculation_mode=exercise.calculation_mode,
+                        source=exercise.source,
+                    )
+                )
+
+            calculated_days.append(
+                Day(
+                    weekday=day.weekday,
+                    session=day.session,
+                    exercises=calculated_exercises,
+                    source=day.source,
+                )
+            )
+
+        calculated_weeks.append(Week(key=week.key, days=calculated_days))
+
+    batch.resolve()
+    return Program(weeks=calculated_weeks)
@@ -1,13 +1,18 @@
 import argparse
 import sys
 
-from colorful_training_template.main import build
 from colorful_training_template.config import (
+    ConfigError,
+    input_paths,
     load_program,
     load_settings,
     load_training_maxes,
 )
 
+# The build, batch and compile-tables modules pull in numpy, pandas and
+# openpyxl, so each command imports only what it needs. That keeps
+# `validate` (run on every program edit by the pre-commit hook) cheap.
+
 
 def validate() -> int:
     """
@@ -26,30 +31,321 @@ def validate() -> int:
     return 0
 
 
+def build(
+    use_cache: bool = True,
+    timings: bool = False,
+    timings_json: str | None = None,
+    trace_memory: bool = False,
+    profile: str | None = None,
+    draft: bool = False,
+) -> int:
+    """
+    Build the plan (a draft of it, with draft), optionally reporting
+    per-stage timings (as a table on stderr and/or as JSON) and dumping a
+    cProfile stats file.
+
+    With timings_json "-" the JSON is the only thing written to stdout;
+    the build's status messages go to stderr instead.
+    """
+    from contextlib import redirect_stdout
+
+    from colorful_training_template.main import build as build_main
+    from colorful_training_template.timing import StageTimer, recording
+
+    timer = StageTimer(trace_memory=trace_memory)
+    status = sys.stderr if timings_json == "-" else sys.stdout
+    profiler = None
+    if profile:
+        import cProfile
+
+        profiler = cProfile.Profile()
+
+    with recording(timer), redirect_stdout(status):
+        if profiler is not None:
+            profiler.enable()
+        try:
+            result = build_main(use_cache=use_cache, draft=draft)
+        finally:
+            if profiler is not None:
+                profiler.disable()
+
+    if profiler is not None:
+        profiler.dump_stats(profile)
+        print(
+            f"Wrote profile to {profile} (inspect with python -m pstats)",
+            file=status,
+        )
+    if timings or trace_memory:
+        print(timer.format_table(), file=sys.stderr)
+    if timings_json == "-":
+        print(timer.to_json())
+    elif timings_json:
+        with open(timings_json, "w", encoding="utf-8") as f:
+            f.write(timer.to_json() + "\n")
+    return result
+
+
+def batch(
+    athletes_dir: str,
+    output_dir: str | None = None,
+    workers: int | None = None,
+    use_cache: bool = True,
+) -> int:
+    """
+    Build one plan per athlete directory from the shared program and
+    settings, then print a per-athlete summary.
+    """
+    from colorful_training_template.batch import (
+        DEFAULT_BATCH_OUTPUT_DIR,
+        BatchError,
+        build_batch,
+    )
+
+    if output_dir is None:
+        output_dir = DEFAULT_BATCH_OUTPUT_DIR
+
+    cache_inputs = None
+    if use_cache:
+        # Each athlete's own training maxes replace the shared file's.
+        paths = input_paths()
+        cache_inputs = {"program": paths["program"], "settings": paths["settings"]}
+
+    try:
+        settings = load_settings()
+        program = load_program()
+        results = build_batch(
+            athletes_dir,
+            program=program,
+            base_settings=settings,
+            output_dir=output_dir,
+            workers=workers,
+            cache_inputs=cache_inputs,
+        )
+    except (ConfigError, BatchError) as exc:
+        print(f"Batch build failed: {exc}", file=sys.stderr)
+        return 1
+
+    failures = [result for result in results if not result.ok]
+    print(f"Built {len(results) - len(failures)} of {len(results)} athlete plans:")
+    for result in results:
+        if result.ok:
+            source = "cached" if result.cached else f"{result.seconds:.2f}s"
+            print(f"- {result.name}: {result.output_workbook} ({source})")
+        else:
+            print(f"- {result.name}: FAILED ({result.seconds:.2f}s) {result.error}")
+
+    return 1 if failures else 0
+
+
+def watch(poll_interval: float, debounce: float, draft: bool = False) -> int:
+    from colorful_training_template.watch import watch as watch_inputs
+
+    return watch_inputs(poll_interval=poll_interval, debounce=debounce, draft=draft)
+
+
+def compile_tables(rep_table_dir: str | None = None) -> int:
+    """
+    Compile every rep table xlsx into the binary format read by rep_table mode.
+    Defaults to settings.rep_table_dir when no directory is given.
+    """
+    from colorful_training_template.rep_table import (
+        DEFAULT_REP_TABLE_DIR,
+        RepTableError,
+        compile_rep_tables,
+    )
+
+    try:
+        if rep_table_dir is None:
+            settings = load_settings()
+            rep_table_dir = settings.get("rep_table_dir", DEFAULT_REP_TABLE_DIR)
+        compiled = compile_rep_tables(rep_table_dir)
+    except (ConfigError, RepTableError) as exc:
+        print(f"Compiling rep tables failed: {exc}", file=sys.stderr)
+        return 1
+
+    if not compiled:
+        print(f"No rep tables found in {rep_table_dir}", file=sys.stderr)
+        return 1
+
+    print("Compiled rep tables:")
+    for exercise_name, path in compiled.items():
+        print(f"- {path} ({exercise_name})")
+    return 0
+
+
+def report_imports() -> None:
+    """
+    Print the non-standard-library packages loaded so far, with how many
+    of their modules were imported. For per-module import times use
+    `python -X importtime`.
+    """
+    packages: dict[str, int] = {}
+    for name in list(sys.modules):
+        package = name.partition(".")[0]
+        if package in sys.stdlib_module_names or package.startswith("_"):
+            continue
+        packages[package] = packages.get(package, 0) + 1
+
+    print("Imported packages (modules loaded):", file=sys.stderr)
+    for package, count in sorted(packages.items(), key=lambda item: (-item[1], item[0])):
+        print(f"- {package}: {count}", file=sys.stderr)
+
+
 def main() -> int:
     parser = argparse.ArgumentParser(
         prog="training-plan",
         description="Build and validate a training plan from YAML config files.",
     )
+    parser.add_argument(
+        "--profile-imports",
+        action="store_true",
+        help="After the command, report which modules it imported.",
+    )
     subparsers = parser.add_subparsers(dest="command", required=True)
 
-    subparsers.add_parser(
+    build_parser = subparsers.add_parser(
         "build",
         help="Build calculated workout data and the Excel workbook.",
     )
+    build_parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Rebuild even if the inputs match a cached build.",
+    )
+    build_parser.add_argument(
+        "--timings",
+        action="store_true",
+        help="Print a table of per-stage wall times to stderr.",
+    )
+    build_parser.add_argument(
+        "--timings-json",
+        metavar="PATH",
+        default=None,
+        help=(
+            "Write per-stage timings as JSON to PATH ('-' for stdout, "
+            "moving status messages to stderr)."
+        ),
+    )
+    build_parser.add_argument(
+        "--trace-memory",
+        action="store_true",
+        help="Also record each stage's peak memory with tracemalloc (slower).",
+    )
+    build_parser.add_argument(
+        "--profile",
+        metavar="PATH",
+        default=None,
+        help="Write cProfile stats for the build to PATH.",
+    )
+    build_parser.add_argument(
+        "--draft",
+        action="store_true",
+        help=(
+            "Quick build: no charts, companion views or column auto-width, "
+            "written by the xml backend and saved uncompressed."
+        ),
+    )
     subparsers.add_parser(
         "validate",
         help="Validate config files only.",
     )
+    batch_parser = subparsers.add_parser(
+        "build-batch",
+        help="Build plans for a squad of athletes sharing one program.",
+    )
+    batch_parser.add_argument(
+        "athletes_dir",
+        help=(
+            "Directory with one subdirectory per athlete, each holding a "
+            "training_maxes.yaml and optionally a settings.yaml of overrides."
+        ),
+    )
+    batch_parser.add_argument(
+        "--output-dir",
+        default=None,
+        help="Where per-athlete outputs are written (default: output/athletes).",
+    )
+    batch_parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Number of worker processes (default: one per CPU).",
+    )
+    batch_parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Rebuild every athlete even if their inputs match a cached build.",
+    )
+    watch_parser = subparsers.add_parser(
+        "watch",
+        help="Rebuild whenever the config files or rep tables change.",
+    )
+    watch_parser.add_argument(
+        "--interval",
+        type=float,
+        default=0.2,
+        help="Seconds between checks for changed files (default: %(default)s).",
+    )
+    watch_parser.add_argument(
+        "--debounce",
+        type=float,
+        default=0.3,
+        help="Seconds files must stay unchanged before a rebuild (default: %(default)s).",
+    )
+    watch_parser.add_argument(
+        "--draft",
+        action="store_true",
+        help="Rebuild drafts (see build --draft).",
+    )
+    compile_parser = subparsers.add_parser(
+        "compile-tables",
+        help="Compile rep table xlsx files into a fast binary format.",
+    )
+    compile_parser.add_argument(
+        "--rep-table-dir",
+        default=None,
+        help="Directory of rep table xlsx files (default: settings.rep_table_dir).",
+    )
 
     args = parser.parse_args()
 
+    if not args.profile_imports:
+        return run_command(parser, args)
+
+    try:
+        return run_command(parser, args)
+    finally:
+        report_imports()
+
+
+def run_command(parser: argparse.ArgumentParser, args: argparse.Namespace) -> int:
     if args.command == "build":
-        return build()
+        return build(
+            use_cache=not args.no_cache,
+            timings=args.timings,
+            timings_json=args.timings_json,
+            trace_memory=args.trace_memory,
+            profile=args.profile,
+            draft=args.draft,
+        )
 
     if args.command == "validate":
         return validate()
 
+    if args.command == "build-batch":
+        return batch(
+            args.athletes_dir,
+            args.output_dir,
+            args.workers,
+            use_cache=not args.no_cache,
+        )
+
+    if args.command == "watch":
+        return watch(args.interval, args.debounce, args.draft)
+
+    if args.command == "compile-tables":
+        return compile_tables(args.rep_table_dir)
+
     parser.print_help()
     return 1
 
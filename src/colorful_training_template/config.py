@@ -1,7 +1,8 @@
 from pathlib import Path
 from typing import Any
 
-import yaml
+from colorful_training_template.model import Program, ProgramError
+from colorful_training_template.yaml_io import load_yaml_file
 
 
 DATA_DIR = Path("data")
@@ -11,14 +12,22 @@ class ConfigError(Exception):
     """Raised when config files are missing or invalid."""
 
 
+def input_paths() -> dict[str, Path]:
+    """The default input files under DATA_DIR, keyed by role."""
+    return {
+        "program": DATA_DIR / "program.yaml",
+        "training_maxes": DATA_DIR / "training_maxes.yaml",
+        "settings": DATA_DIR / "settings.yaml",
+    }
+
+
 def load_yaml(path: str | Path) -> Any:
     path = Path(path)
 
     if not path.exists():
         raise ConfigError(f"Config file not found: {path}")
 
-    with path.open("r", encoding="utf-8") as f:
-        data = yaml.safe_load(f)
+    data = load_yaml_file(path)
 
     if data is None:
         raise ConfigError(f"Config file is empty: {path}")
@@ -26,8 +35,8 @@ def load_yaml(path: str | Path) -> Any:
     return data
 
 
-def load_training_maxes() -> dict[str, float]:
-    data = load_yaml(DATA_DIR / "training_maxes.yaml")
+def load_training_maxes(path: str | Path | None = None) -> dict[str, float]:
+    data = load_yaml(path or DATA_DIR / "training_maxes.yaml")
 
     if not isinstance(data, dict):
         raise ConfigError("training_maxes.yaml must be a mapping of exercise -> number")
@@ -52,9 +61,11 @@ def load_training_maxes() -> dict[str, float]:
     return cleaned
 
 
-def load_settings() -> dict[str, Any]:
-    data = load_yaml(DATA_DIR / "settings.yaml")
+def load_settings(path: str | Path | None = None) -> dict[str, Any]:
+    return validate_settings(load_yaml(path or DATA_DIR / "settings.yaml"))
+
 
+def validate_settings(data: Any) -> dict[str, Any]:
     if not isinstance(data, dict):
         raise ConfigError("settings.yaml must be a mapping")
 
@@ -67,11 +78,16 @@ def load_settings() -> dict[str, Any]:
     if rounding and not isinstance(rounding, dict):
         raise ConfigError("settings.rounding must be a mapping if provided")
 
-    return data
+    render = data.get("render", {})
+    if render and not isinstance(render, dict):
+        raise ConfigError("settings.render must be a mapping if provided")
+
+    # load_yaml returns a cached document; hand callers their own copy.
+    return dict(data)
 
 
-def load_program() -> list[dict[str, Any]]:
-    data = load_yaml(DATA_DIR / "program.yaml")
+def load_program(path: str | Path | None = None) -> Program:
+    data = load_yaml(path or DATA_DIR / "program.yaml")
 
     if not isinstance(data, list):
         raise ConfigError("program.yaml must be a list of week objects")
@@ -80,4 +96,7 @@ def load_program() -> list[dict[str, Any]]:
         if not isinstance(week, dict):
             raise ConfigError("Each week entry in program.yaml must be a mapping")
 
-    return data
+    try:
+        return Program.from_data(data)
+    except ProgramError as exc:
+        raise ConfigError(f"program.yaml is invalid: {exc}") from exc
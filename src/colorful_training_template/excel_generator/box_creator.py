@@ -1,11 +1,4 @@
-from openpyxl.styles import Border, PatternFill, Side
-
-THIN_BORDER = Border(
-    left=Side(style="thin", color="000000"),
-    right=Side(style="thin", color="000000"),
-    top=Side(style="thin", color="000000"),
-    bottom=Side(style="thin", color="000000"),
-)
+from colorful_training_template.excel_generator.styles import solid_fill, thin_border
 
 
 class BoxCreator:
@@ -17,40 +10,35 @@ class BoxCreator:
         self.add_border(start_row, start_col, end_row, end_col)
 
     def fill_range(self, start_row, start_col, end_row, end_col, fill_color):
-        fill = PatternFill(
-            start_color=fill_color, end_color=fill_color, fill_type="solid"
-        )
+        fill = solid_fill(fill_color)
         for row in range(start_row, end_row + 1):
             for col in range(start_col, end_col + 1):
                 self.sheet.cell(row=row, column=col).fill = fill
 
     def add_border(self, start_row, start_col, end_row, end_col):
-        # Apply borders to the top and bottom rows
-        for col in range(start_col, end_col + 1):
-            self.sheet.cell(row=start_row, column=col).border = Border(
-                top=THIN_BORDER.top
-            )
-            self.sheet.cell(row=end_row, column=col).border = Border(
-                bottom=THIN_BORDER.bottom
-            )
-        # Apply borders to the left and right columns
+        # Each cell on the outline gets one border holding its outer edges.
+        # In a box one row high or one column wide the bottom and right edges
+        # win over the top and left ones.
         for row in range(start_row, end_row + 1):
-            self.sheet.cell(row=row, column=start_col).border = Border(
-                left=THIN_BORDER.left
-            )
-            self.sheet.cell(row=row, column=end_col).border = Border(
-                right=THIN_BORDER.right
-            )
-        # Set borders for the four corners explicitly
-        self.sheet.cell(row=start_row, column=start_col).border = Border(
-            top=THIN_BORDER.top, left=THIN_BORDER.left
-        )
-        self.sheet.cell(row=start_row, column=end_col).border = Border(
-            top=THIN_BORDER.top, right=THIN_BORDER.right
-        )
-        self.sheet.cell(row=end_row, column=start_col).border = Border(
-            bottom=THIN_BORDER.bottom, left=THIN_BORDER.left
-        )
-        self.sheet.cell(row=end_row, column=end_col).border = Border(
-            bottom=THIN_BORDER.bottom, right=THIN_BORDER.right
-        )
+            if row in (start_row, end_row):
+                cols = range(start_col, end_col + 1)
+            else:
+                cols = (start_col, end_col)
+
+            if row == end_row:
+                horizontal = ("bottom",)
+            elif row == start_row:
+                horizontal = ("top",)
+            else:
+                horizontal = ()
+
+            for col in cols:
+                if col == end_col:
+                    vertical = ("right",)
+                elif col == start_col:
+                    vertical = ("left",)
+                else:
+                    vertical = ()
+                self.sheet.cell(row=row, column=col).border = thin_border(
+                    *horizontal, *vertical
+                )
@@ -0,0 +1,164 @@
+"""
+Week box sizes derived from the program being rendered, and where the
+boxes go.
+
+A week box has a column group per set and, for each of the seven day
+blocks, a row per exercise. "fixed" sizing gives every box the configured
+counts. "global" sizes every box to the most sets and exercises any
+rendered day of the program has, and "per_week" does the same for each
+week on its own, so nothing is cut off and no empty grid is drawn.
+
+With compact rest days, a day block with no training is one row high.
+Under fixed and global sizing only days that are rest days in every week
+are compacted, so the boxes keep the same shape; under per_week sizing
+each week compacts its own rest days.
+
+Boxes are placed side by side ("horizontal"), stacked ("vertical"),
+weeks_per_row to a row ("grid"), or weeks_per_sheet to a sheet, side by
+side ("per_block").
+"""
+
+from dataclasses import dataclass
+from itertools import accumulate
+
+from colorful_training_template.excel_generator.data_populator import days_by_index
+
+BOX_SIZE_MODES = ("fixed", "global", "per_week")
+WEEK_LAYOUTS = ("horizontal", "vertical", "grid", "per_block")
+DAYS_PER_WEEK = 7
+
+
+@dataclass(frozen=True, slots=True)
+class BoxLayout:
+    num_sets: int
+    num_exercises: int
+    # Rows in each day block, Monday first.
+    day_heights: tuple[int, ...]
+
+    @property
+    def day_offsets(self):
+        """Row offset of each day block from the first day block."""
+        return tuple(
+            accumulate((height + 1 for height in self.day_heights[:-1]), initial=0)
+        )
+
+
+def week_shape(week):
+    """
+    (most exercises in a rendered day, most sets in a rendered exercise,
+    day block indexes with training) for one week.
+    """
+    days = days_by_index(week.days)
+    num_exercises = max((len(day.exercises) for day in days.values()), default=0)
+    num_sets = max(
+        (
+            len(exercise.sets)
+            for day in days.values()
+            for exercise in day.exercises
+        ),
+        default=0,
+    )
+    trained = frozenset(index for index, day in days.items() if day.exercises)
+    return num_exercises, num_sets, trained
+
+
+def plan_box_layouts(weeks, mode, num_sets, num_exercises, compact_rest_days=False):
+    """
+    Return the BoxLayout of each week. num_sets and num_exercises are the
+    fixed sizes; the derived sizes are at least one set and one exercise.
+    """
+    if mode not in BOX_SIZE_MODES:
+        raise ValueError(
+            f"Unknown box size mode {mode!r}; expected one of {BOX_SIZE_MODES}"
+        )
+
+    shapes = [week_shape(week) for week in weeks]
+    if mode == "per_week":
+        return [
+            _layout(
+                max(week_sets, 1),
+                max(week_exercises, 1),
+                trained if compact_rest_days else None,
+            )
+            for week_exercises, week_sets, trained in shapes
+        ]
+
+    if mode == "global":
+        num_exercises = max((shape[0] for shape in shapes), default=0) or 1
+        num_sets = max((shape[1] for shape in shapes), default=0) or 1
+    trained = None
+    if compact_rest_days:
+        trained = frozenset().union(*(shape[2] for shape in shapes))
+    layout = _layout(num_sets, num_exercises, trained)
+    return [layout] * len(weeks)
+
+
+def _layout(num_sets, num_exercises, trained):
+    if trained is None:
+        day_heights = (num_exercises,) * DAYS_PER_WEEK
+    else:
+        day_heights = tuple(
+            num_exercises if index in trained else 1 for index in range(DAYS_PER_WEEK)
+        )
+    return BoxLayout(num_sets, num_exercises, day_heights)
+
+
+@dataclass(frozen=True, slots=True)
+class BoxPlacement:
+    # Index of the sheet the box goes on; 0 is the main sheet.
+    sheet_index: int
+    row: int
+    col: int
+
+
+def place_boxes(
+    sizes,
+    layout,
+    start_row,
+    start_col,
+    space_between,
+    weeks_per_row=4,
+    weeks_per_sheet=4,
+):
+    """
+    Return a BoxPlacement for each (height, width) in sizes. Boxes are
+    space_between rows or columns apart, and a row of boxes in the grid
+    is as tall as its tallest box.
+    """
+    if layout not in WEEK_LAYOUTS:
+        raise ValueError(
+            f"Unknown week layout {layout!r}; expected one of {WEEK_LAYOUTS}"
+        )
+    if layout == "horizontal":
+        per_row, per_sheet = len(sizes) or 1, None
+    elif layout == "vertical":
+        per_row, per_sheet = 1, None
+    elif layout == "grid":
+        per_row, per_sheet = weeks_per_row, None
+    else:
+        per_row, per_sheet = weeks_per_sheet, weeks_per_sheet
+    if per_row < 1:
+        raise ValueError(f"weeks per row/sheet must be >= 1, got {per_row}")
+
+    placements = []
+    sheet_index = 0
+    row, col = start_row, start_col
+    row_height = 0
+    for index, (height, width) in enumerate(sizes):
+        if per_sheet is not None and index and index % per_sheet == 0:
+            sheet_index += 1
+            row, col, row_height = start_row, start_col, 0
+        elif index and index % per_row == 0:
+            row += row_height + space_between
+            col, row_height = start_col, 0
+        placements.append(BoxPlacement(sheet_index, row, col))
+        col += width + space_between
+        row_height = max(row_height, height)
+    return placements
+
+
+def block_sheet_title(first_week, last_week):
+    """Sheet title for a per_block sheet holding weeks first..last."""
+    if first_week == last_week:
+        return f"Week {first_week}"
+    return f"Weeks {first_week}-{last_week}"
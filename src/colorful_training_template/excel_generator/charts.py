@@ -1,10 +1,16 @@
 import logging
 
-import yaml
 from openpyxl.chart import LineChart, Reference
 
+from colorful_training_template.model import Program
+from colorful_training_template.yaml_io import load_yaml_file
+
 logger = logging.getLogger(__name__)
 
+# Significant digits kept in each metric. Beyond these the sums carry only
+# floating-point noise, which one backend would write and another round off.
+METRIC_DIGITS = 16
+
 
 def parse_reps(reps_value):
     """
@@ -43,16 +49,13 @@ def parse_weight(weight_value):
 
 def get_chart_data_from_yaml(yaml_path):
     """
-    Loads workout data from the YAML file and computes three metrics per week:
-      - Stress Index: sum of (reps × weight × %1RM)
-      - Volume: sum of (reps × weight)
-      - Intensity: average %1RM across all sets
+    Loads workout data from the YAML file and computes the weekly chart
+    metrics with get_chart_data.
 
     Returns:
       (weeks, stress_indices, volumes, intensities)
     """
-    with open(yaml_path, "r", encoding="utf-8") as file:
-        data = yaml.safe_load(file)
+    data = load_yaml_file(yaml_path)
 
     if isinstance(data, dict):
         weeks_list = data.get("weeks", [])
@@ -61,68 +64,114 @@ def get_chart_data_from_yaml(yaml_path):
     else:
         weeks_list = []
 
+    return get_chart_data(Program.from_data(weeks_list))
+
+
+def get_chart_data(program):
+    """
+    Computes three metrics per week of a program:
+      - Stress Index: sum of (reps × weight × %1RM)
+      - Volume: sum of (reps × weight)
+      - Intensity: average %1RM across all sets
+
+    Returns:
+      (weeks, stress_indices, volumes, intensities)
+    """
     week_numbers = []
     stress_indices = []
     volumes = []
     intensities = []
-    week_index = 1
-
-    for week_dict in weeks_list:
-        for _, days in week_dict.items():
-            week_numbers.append(week_index)
-            week_index += 1
-
-            set_percentages = []
-            total_volume = 0.0
-            total_stress = 0.0
-
-            for day in days:
-                exercises = day.get("exercises", [])
-                for exercise in exercises:
-                    for set_entry in exercise.get("sets", []):
-                        reps_val = set_entry.get("reps")
-                        weight_val = set_entry.get("weight")
-                        perc_val = set_entry.get("percentage_1rm")
-
-                        perc_float = None
-                        if perc_val is not None:
-                            try:
-                                perc_float = float(perc_val)
-                                set_percentages.append(perc_float)
-                            except Exception:
-                                logger.warning(
-                                    "Could not parse percentage_1rm from %r", perc_val
-                                )
-
-                        if reps_val is None or weight_val is None:
-                            continue
-
-                        count, reps_per_set = parse_reps(reps_val)
-                        weight_num = parse_weight(weight_val)
-
-                        set_volume = count * reps_per_set * weight_num
-                        total_volume += set_volume
-
-                        if perc_float is not None:
-                            total_stress += set_volume * (perc_float / 100.0)
-
-            avg_intensity = (
-                sum(set_percentages) / len(set_percentages) if set_percentages else 0.0
-            )
-
-            stress_indices.append(total_stress)
-            volumes.append(total_volume)
-            intensities.append(avg_intensity)
+
+    for week_index, week in enumerate(program.weeks, start=1):
+        stress, volume, intensity = get_week_metrics(week)
+        week_numbers.append(week_index)
+        stress_indices.append(stress)
+        volumes.append(volume)
+        intensities.append(intensity)
 
     return week_numbers, stress_indices, volumes, intensities
 
 
-def add_charts_to_workbook(wb, yaml_path="data/program.yaml"):
+def get_week_metrics(week):
+    """
+    Returns (stress_index, volume, intensity) for a single week.
+
+    Calculated sets carry a numeric weight_kg; the weight string is only
+    parsed for sets whose weight was written by hand. Each metric is kept to
+    METRIC_DIGITS significant digits.
+    """
+    set_percentages = []
+    total_volume = 0.0
+    total_stress = 0.0
+
+    for day in week.days:
+        for exercise in day.exercises:
+            for set_entry in exercise.sets:
+                reps_val = set_entry.reps
+                weight_val = set_entry.weight
+                perc_val = set_entry.percentage_1rm
+
+                perc_float = None
+                if perc_val is not None:
+                    try:
+                        perc_float = float(perc_val)
+                        set_percentages.append(perc_float)
+                    except Exception:
+                        logger.warning(
+                            "Could not parse percentage_1rm from %r", perc_val
+                        )
+
+                if reps_val is None or weight_val is None:
+                    continue
+
+                if isinstance(reps_val, int):
+                    count, reps_per_set = 1, reps_val
+                else:
+                    count, reps_per_set = parse_reps(reps_val)
+
+                if set_entry.weight_kg is not None:
+                    weight_num = set_entry.weight_kg
+                else:
+                    weight_num = parse_weight(weight_val)
+
+                set_volume = count * reps_per_set * weight_num
+                total_volume += set_volume
+
+                if perc_float is not None:
+                    total_stress += set_volume * (perc_float / 100.0)
+
+    avg_intensity = (
+        sum(set_percentages) / len(set_percentages) if set_percentages else 0.0
+    )
+
+    return (
+        _significant(total_stress),
+        _significant(total_volume),
+        _significant(avg_intensity),
+    )
+
+
+def _significant(value):
+    return float(f"{value:.{METRIC_DIGITS}g}")
+
+
+def add_charts_to_workbook(
+    wb, calculated_program=None, yaml_path="data/program.yaml", metrics=None
+):
     """
-    Reads actual workout data from the YAML file, computes weekly metrics,
-    and adds three charts to the workbook.
+    Computes weekly metrics and adds three charts to the workbook.
+
+    Metrics are taken from, in order of preference: a precomputed `metrics`
+    tuple as returned by get_chart_data, the in-memory `calculated_program`,
+    or the YAML file at `yaml_path`.
     """
-    weeks, stress_indices, volumes, intensities = get_chart_data_from_yaml(yaml_path)
+    if metrics is None:
+        if calculated_program is not None:
+            metrics = get_chart_data(calculated_program)
+        else:
+            metrics = get_chart_data_from_yaml(yaml_path)
+
+    weeks, stress_indices, volumes, intensities = metrics
 
     if not weeks:
         logger.error("No week data found. Charts cannot be generated.")
@@ -3,9 +3,19 @@ from __future__ import annotations
 from datetime import datetime, timedelta
 from typing import Any
 
-from openpyxl.styles import Alignment, Border, Font, PatternFill, Side
+from openpyxl.styles import PatternFill
+from openpyxl.workbook.defined_name import DefinedName
 from openpyxl.worksheet.datavalidation import DataValidation
 
+from colorful_training_template.excel_generator.styles import (
+    THIN_BORDER,
+    StyleStamp,
+    alignment,
+    font,
+    set_styles,
+)
+from colorful_training_template.model import Program, SetPrescription, Week
+
 WEEKDAY_TO_DAY_NUM = {
     "Monday": 1,
     "Tuesday": 2,
@@ -17,13 +27,43 @@ WEEKDAY_TO_DAY_NUM = {
 }
 
 DAY_LABELS = [f"Day {i}" for i in range(1, 8)]
+DAYS_PER_WEEK = 7
+
+PROGRAM_DATA_SHEET = "_Program_Data"
+
+# "formulas" builds interactive Week View/Today sheets that look weeks up
+# in _Program_Data. "static" writes every week and session out as values
+# in Week View, grouped by week. It leaves _Program_Data out, and Today
+# too: without a lookup there is no single day to show, and a copy of
+# Week View under that name would only double the file.
+COMPANION_VIEW_MODES = ("formulas", "static")
+
+# Workbook names over the used rows of _Program_Data. Each view lookup is
+# one INDEX into these, at a row taken from the session index below.
+DAY_LABEL_RANGE = "ProgramDayLabel"
+EXERCISE_RANGE = "ProgramExercise"
+PLAN_RANGE = "ProgramPlan"
+NOTES_RANGE = "ProgramNotes"
+# One row per (week, day) slot, in order: the position in the data ranges
+# of the session's first exercise (0 for a rest day) and its exercise count.
+SESSION_FIRST_ROW_RANGE = "SessionFirstRow"
+SESSION_EXERCISES_RANGE = "SessionExercises"
+
+# Data columns of _Program_Data, then the session index after a gap.
+PROGRAM_DATA_COLUMNS = {
+    DAY_LABEL_RANGE: "E",
+    EXERCISE_RANGE: "I",
+    PLAN_RANGE: "J",
+    NOTES_RANGE: "K",
+}
+SESSION_INDEX_COLUMNS = {
+    SESSION_FIRST_ROW_RANGE: "O",
+    SESSION_EXERCISES_RANGE: "P",
+}
 
 REST_DAYS_BETWEEN_SESSIONS = 1
 TRAINING_DAY_GAP = REST_DAYS_BETWEEN_SESSIONS + 1
 
-THIN = Side(style="thin", color="000000")
-THIN_BORDER = Border(left=THIN, right=THIN, top=THIN, bottom=THIN)
-
 TITLE_FILL = PatternFill("solid", fgColor="65BCCC")
 SECTION_FILL = PatternFill("solid", fgColor="8CCDD8")
 HEADER_FILL = PatternFill("solid", fgColor="79C4D2")
@@ -31,13 +71,13 @@ CONTROL_FILL = PatternFill("solid", fgColor="EEF8FA")
 DATA_FILL = PatternFill("solid", fgColor="F7FCFD")
 MUTED_FILL = PatternFill("solid", fgColor="E8F5F7")
 
-TITLE_FONT = Font(size=14, bold=True)
-SECTION_FONT = Font(size=12, bold=True)
-HEADER_FONT = Font(bold=True)
-BODY_FONT = Font(size=11)
-BODY_BOLD_FONT = Font(size=11, bold=True)
-SMALL_FONT = Font(size=10, italic=True)
-SMALL_BOLD_FONT = Font(size=10, bold=True)
+TITLE_FONT = font(size=14, bold=True)
+SECTION_FONT = font(size=12, bold=True)
+HEADER_FONT = font(bold=True)
+BODY_FONT = font(size=11)
+BODY_BOLD_FONT = font(size=11, bold=True)
+SMALL_FONT = font(size=10, italic=True)
+SMALL_BOLD_FONT = font(size=10, bold=True)
 
 
 class CompanionViewError(Exception):
@@ -46,51 +86,81 @@ class CompanionViewError(Exception):
 
 def add_companion_views_to_workbook(
     workbook,
-    calculated_program: list[dict[str, Any]],
+    calculated_program: Program,
     start_date: datetime,
+    summaries: list[list[list[tuple[str, str, str]]]] | None = None,
+    mode: str = "formulas",
 ) -> None:
-    rows, week_labels, max_exercises = _flatten_program(calculated_program, start_date)
+    """
+    `summaries`, if given, holds week_summaries() for every week of the
+    program, e.g. reused from an earlier build for unchanged weeks.
+    `mode` is one of COMPANION_VIEW_MODES.
+    """
+    if mode not in COMPANION_VIEW_MODES:
+        raise CompanionViewError(
+            f"companion view mode must be one of {COMPANION_VIEW_MODES}, "
+            f"got {mode!r}"
+        )
+
+    rows, week_labels, max_exercises = _flatten_program(
+        calculated_program, start_date, summaries
+    )
 
-    for sheet_name in ("Week View", "Today", "_Program_Data"):
+    for sheet_name in ("Week View", "Today", PROGRAM_DATA_SHEET):
         if sheet_name in workbook.sheetnames:
             del workbook[sheet_name]
 
     week_view = workbook.create_sheet("Week View")
-    today_view = workbook.create_sheet("Today")
-    program_data = workbook.create_sheet("_Program_Data")
-
-    _populate_program_data_sheet(program_data, rows)
-    _build_week_view_sheet(week_view, max_exercises, week_labels)
-    _build_today_sheet(today_view, max_exercises, week_labels)
 
-    program_data.sheet_state = "hidden"
+    if mode == "static":
+        _build_static_week_view_sheet(week_view, week_labels, _group_days(rows))
+    else:
+        today_view = workbook.create_sheet("Today")
+        sessions = _session_index(rows, len(week_labels))
+        program_data = workbook.create_sheet(PROGRAM_DATA_SHEET)
+        _populate_program_data_sheet(program_data, rows, sessions)
+        _define_program_data_ranges(workbook, len(rows), len(sessions))
+        _build_week_view_sheet(week_view, max_exercises, week_labels)
+        _build_today_sheet(today_view, max_exercises, week_labels)
+        program_data.sheet_state = "hidden"
 
     _reorder_sheets(workbook)
     workbook.active = workbook.sheetnames.index("Week View")
 
 
+def week_summaries(week: Week) -> list[list[tuple[str, str, str]]]:
+    """
+    (exercise name, prescription summary, notes summary) for each exercise
+    of each day in the week. This is the part of a week's companion-view
+    rows that does not depend on the week's position or dates.
+    """
+    return [
+        [
+            (
+                exercise.name,
+                _build_prescription_summary(exercise.sets),
+                _build_notes_summary(exercise.sets),
+            )
+            for exercise in day.exercises
+        ]
+        for day in week.days
+    ]
+
+
 def _flatten_program(
-    calculated_program: list[dict[str, Any]],
+    calculated_program: Program,
     start_date: datetime,
+    summaries: list[list[list[tuple[str, str, str]]]] | None = None,
 ) -> tuple[list[dict[str, Any]], list[str], int]:
     rows: list[dict[str, Any]] = []
     week_labels: list[str] = []
     max_exercises = 1
     global_session_index = 0
 
-    for week_index, week_dict in enumerate(calculated_program, start=1):
-        if not isinstance(week_dict, dict):
-            raise CompanionViewError(
-                f"Each week must be a mapping, got {type(week_dict).__name__}"
-            )
-
-        week_days = next(iter(week_dict.values()), [])
-
-        if not isinstance(week_days, list):
-            raise CompanionViewError(
-                f"Each week value must be a list of days, got {type(week_days).__name__}"
-            )
+    if summaries is None:
+        summaries = [week_summaries(week) for week in calculated_program.weeks]
 
+    for week_index, week_days in enumerate(summaries, start=1):
         week_start = start_date + timedelta(
             days=global_session_index * TRAINING_DAY_GAP
         )
@@ -104,9 +174,6 @@ def _flatten_program(
             if day_num > 7:
                 continue
 
-            if not isinstance(day, dict):
-                continue
-
             training_date = start_date + timedelta(
                 days=global_session_index * TRAINING_DAY_GAP
             )
@@ -115,10 +182,11 @@ def _flatten_program(
             short_day_label = training_date.strftime("%a %d-%m-%Y")
             day_label = f"Day {day_num} - {short_day_label}"
 
-            exercises = day.get("exercises", [])
-            max_exercises = max(max_exercises, len(exercises) or 1)
+            max_exercises = max(max_exercises, len(day) or 1)
 
-            for exercise_index, exercise in enumerate(exercises, start=1):
+            for exercise_index, (name, prescription, notes) in enumerate(
+                day, start=1
+            ):
                 rows.append(
                     {
                         "week_num": week_index,
@@ -129,11 +197,9 @@ def _flatten_program(
                         "training_date": training_date_text,
                         "training_weekday": training_weekday_text,
                         "exercise_index": exercise_index,
-                        "exercise": exercise.get("name", ""),
-                        "prescription": _build_prescription_summary(
-                            exercise.get("sets", [])
-                        ),
-                        "notes": _build_notes_summary(exercise.get("sets", [])),
+                        "exercise": name,
+                        "prescription": prescription,
+                        "notes": notes,
                         "key": week_index * 1000 + day_num * 100 + exercise_index,
                     }
                 )
@@ -143,13 +209,30 @@ def _flatten_program(
     return rows, week_labels, max_exercises
 
 
-def _build_prescription_summary(sets: list[dict[str, Any]]) -> str:
+def _session_index(
+    rows: list[dict[str, Any]], week_count: int
+) -> list[tuple[int, int]]:
+    """
+    (first row, exercise count) for every day slot of every week, where
+    first row is the 1-based position in rows of the session's first
+    exercise, or 0 if that day has no session. Slot (week, day) is at
+    index (week - 1) * 7 + day - 1.
+    """
+    sessions = [(0, 0)] * (week_count * DAYS_PER_WEEK)
+    for position, row in enumerate(rows, start=1):
+        slot = (row["week_num"] - 1) * DAYS_PER_WEEK + row["day_num"] - 1
+        first_row, count = sessions[slot]
+        sessions[slot] = (first_row or position, count + 1)
+    return sessions
+
+
+def _build_prescription_summary(sets: list[SetPrescription]) -> str:
     groups: list[tuple[int, Any, Any, Any]] = []
 
     for set_data in sets:
-        reps = set_data.get("reps")
-        weight = set_data.get("weight")
-        percentage = set_data.get("percentage_1rm")
+        reps = set_data.reps
+        weight = set_data.weight
+        percentage = set_data.percentage_1rm
 
         if groups and groups[-1][1:] == (reps, weight, percentage):
             count, _, _, _ = groups[-1]
@@ -177,11 +260,11 @@ def _build_prescription_summary(sets: list[dict[str, Any]]) -> str:
     return " • ".join(parts)
 
 
-def _build_notes_summary(sets: list[dict[str, Any]]) -> str:
+def _build_notes_summary(sets: list[SetPrescription]) -> str:
     note_groups: list[str] = []
 
     for set_data in sets:
-        note = str(set_data.get("notes", "") or "").strip()
+        note = str(set_data.notes or "").strip()
         if not note:
             continue
         if not note_groups or note_groups[-1] != note:
@@ -205,7 +288,9 @@ def _week_label(week_num: int, week_start: datetime) -> str:
     return f"Block Week {week_num} - Starts {week_start.strftime('%d-%m-%Y')}"
 
 
-def _populate_program_data_sheet(sheet, rows: list[dict[str, Any]]) -> None:
+def _populate_program_data_sheet(
+    sheet, rows: list[dict[str, Any]], sessions: list[tuple[int, int]]
+) -> None:
     headers = [
         "Week Num",
         "Week Label",
@@ -219,18 +304,26 @@ def _populate_program_data_sheet(sheet, rows: list[dict[str, Any]]) -> None:
         "Prescription",
         "Notes",
         "Key",
+        None,
+        "Slot",
+        "First Row",
+        "Exercises",
     ]
     sheet.append(headers)
 
     for cell in sheet[1]:
+        if cell.value is None:
+            continue
         cell.font = HEADER_FONT
         cell.fill = HEADER_FILL
         cell.border = THIN_BORDER
-        cell.alignment = Alignment(horizontal="center", vertical="center")
+        cell.alignment = alignment(horizontal="center", vertical="center")
 
-    for row in rows:
-        sheet.append(
-            [
+    blank_row = [None] * 12
+    for index in range(max(len(rows), len(sessions))):
+        if index < len(rows):
+            row = rows[index]
+            values = [
                 row["week_num"],
                 row["week_label"],
                 row["week_start"],
@@ -244,7 +337,12 @@ def _populate_program_data_sheet(sheet, rows: list[dict[str, Any]]) -> None:
                 row["notes"],
                 row["key"],
             ]
-        )
+        else:
+            values = list(blank_row)
+        if index < len(sessions):
+            first_row, count = sessions[index]
+            values += [None, index + 1, first_row, count]
+        sheet.append(values)
 
     widths = {
         "A": 10,
@@ -259,11 +357,115 @@ def _populate_program_data_sheet(sheet, rows: list[dict[str, Any]]) -> None:
         "J": 58,
         "K": 80,
         "L": 12,
+        "M": 3,
+        "N": 8,
+        "O": 10,
+        "P": 10,
     }
     for col, width in widths.items():
         sheet.column_dimensions[col].width = width
 
 
+def _define_program_data_ranges(workbook, row_count: int, slot_count: int) -> None:
+    """
+    Name the used rows of the _Program_Data columns the views read, so
+    their lookups never scan to the bottom of the sheet.
+    """
+    ranges = [
+        (name, column, row_count) for name, column in PROGRAM_DATA_COLUMNS.items()
+    ]
+    ranges += [
+        (name, column, slot_count) for name, column in SESSION_INDEX_COLUMNS.items()
+    ]
+    for name, column, count in ranges:
+        # An empty range still spans one row so the reference stays valid.
+        last_row = max(count, 1) + 1
+        workbook.defined_names[name] = DefinedName(
+            name,
+            attr_text=f"{PROGRAM_DATA_SHEET}!${column}$2:${column}${last_row}",
+        )
+
+
+def _session_lookup(
+    name: str, week_ref: str, day: int | str, week_count: int
+) -> str:
+    """
+    Formula for the session-index entry of (week_ref, day), or 0 if the
+    week, or a day given as a cell reference, is not a valid whole number.
+    """
+    checks = [
+        f"{week_ref}>=1",
+        f"{week_ref}<={week_count}",
+        f"{week_ref}=INT({week_ref})",
+    ]
+    if isinstance(day, str):
+        checks += [f"{day}>=1", f"{day}<={DAYS_PER_WEEK}", f"{day}=INT({day})"]
+    return (
+        f"IFERROR(IF(AND({','.join(checks)}),"
+        f"INDEX({name},({week_ref}-1)*{DAYS_PER_WEEK}+{day}),0),0)"
+    )
+
+
+def _write_session_helpers(
+    sheet,
+    first_row_cell: str,
+    count_cell: str,
+    week_ref: str,
+    day: int | str,
+    week_count: int,
+) -> None:
+    """
+    Fill two cells of the hidden helper column with the selected session's
+    first row in the data ranges (0 if none) and its exercise count.
+    """
+    sheet[first_row_cell] = "=" + _session_lookup(
+        SESSION_FIRST_ROW_RANGE, week_ref, day, week_count
+    )
+    sheet[count_cell] = "=" + _session_lookup(
+        SESSION_EXERCISES_RANGE, week_ref, day, week_count
+    )
+
+
+def _write_exercise_rows(
+    sheet,
+    first_data_row: int,
+    max_exercises: int,
+    first_row_ref: str,
+    count_ref: str,
+    height: int = 34,
+) -> None:
+    """
+    Exercise, plan and notes formulas for one session. Each cell is a single
+    bounded INDEX at an offset from the session's first row.
+    """
+    for exercise_index in range(1, max_exercises + 1):
+        row = first_data_row + exercise_index - 1
+        offset = f"{first_row_ref}+{exercise_index - 1}"
+        missing = f"{exercise_index}>{count_ref}"
+
+        if exercise_index == 1:
+            exercise_formula = (
+                f'=IF({count_ref}=0,"Rest / no session",'
+                f"INDEX({EXERCISE_RANGE},{first_row_ref}))"
+            )
+            plan_formula = (
+                f'=IF(A{row}="Rest / no session","—",'
+                f"INDEX({PLAN_RANGE},{first_row_ref}))"
+            )
+        else:
+            exercise_formula = f'=IF({missing},"",INDEX({EXERCISE_RANGE},{offset}))'
+            plan_formula = f'=IF({missing},"",INDEX({PLAN_RANGE},{offset}))'
+
+        notes_formula = f'=IF({missing},"",INDEX({NOTES_RANGE},{offset}))'
+
+        sheet.cell(row, 1, value=exercise_formula)
+        sheet.cell(row, 2, value=plan_formula)
+        sheet.cell(row, 3, value=notes_formula)
+        _style_data_row(
+            sheet, row, emphasize_first=(exercise_index == 1), height=height
+        )
+
+
 def _build_week_view_sheet(sheet, max_exercises: int, week_labels: list[str]) -> None:
     _configure_companion_sheet(sheet)
 
@@ -328,17 +530,25 @@ def _build_week_view_sheet(sheet, max_exercises: int, week_labels: list[str]) ->
             end_column=3,
         )
 
-        day_label_range = "_Program_Data!$E$2:$E$1048576"
-        data_range_key = "_Program_Data!$L$2:$L$1048576"
-        header_key_expr = f"IFERROR($B$2*1000+{day_num}*100+1,0)"
+        headers_row = day_row + 1
+        # Hidden column D holds the day's first data row and exercise count.
+        first_row_ref = f"$D${day_row}"
+        count_ref = f"$D${headers_row}"
+        _write_session_helpers(
+            sheet,
+            f"D{day_row}",
+            f"D{headers_row}",
+            "$B$2",
+            day_num,
+            week_count,
+        )
 
         sheet.cell(day_row, 1).value = (
-            f"=IFERROR(INDEX({day_label_range},MATCH({header_key_expr},{data_range_key},0)),"
-            f'"Day {day_num} - Rest")'
+            f'=IF({first_row_ref}=0,"Day {day_num} - Rest",'
+            f"INDEX({DAY_LABEL_RANGE},{first_row_ref}))"
         )
         _style_cell(sheet.cell(day_row, 1), fill=SECTION_FILL, font=SECTION_FONT)
 
-        headers_row = day_row + 1
         for col, title in enumerate(["Exercise", "Plan", "Notes"], start=1):
             cell = sheet.cell(headers_row, col, value=title)
             _style_cell(
@@ -349,34 +559,9 @@ def _build_week_view_sheet(sheet, max_exercises: int, week_labels: list[str]) ->
                 vertical="center",
             )
 
-        first_data_row = day_row + 2
-        for exercise_index in range(1, max_exercises + 1):
-            row = first_data_row + exercise_index - 1
-            key_expr = f"IFERROR($B$2*1000+{day_num}*100+{exercise_index},0)"
-            data_range_key = "_Program_Data!$L$2:$L$1048576"
-            data_range_ex = "_Program_Data!$I$2:$I$1048576"
-            data_range_plan = "_Program_Data!$J$2:$J$1048576"
-            data_range_notes = "_Program_Data!$K$2:$K$1048576"
-
-            if exercise_index == 1:
-                exercise_formula = (
-                    f'=IF(COUNTIF({data_range_key},{key_expr})=0,"Rest / no session",'
-                    f'IFERROR(INDEX({data_range_ex},MATCH({key_expr},{data_range_key},0)),""))'
-                )
-                plan_formula = (
-                    f'=IF(A{row}="Rest / no session","—",'
-                    f'IFERROR(INDEX({data_range_plan},MATCH({key_expr},{data_range_key},0)),""))'
-                )
-            else:
-                exercise_formula = f'=IFERROR(INDEX({data_range_ex},MATCH({key_expr},{data_range_key},0)),"")'
-                plan_formula = f'=IFERROR(INDEX({data_range_plan},MATCH({key_expr},{data_range_key},0)),"")'
-
-            notes_formula = f'=IFERROR(INDEX({data_range_notes},MATCH({key_expr},{data_range_key},0)),"")'
-
-            sheet.cell(row, 1, value=exercise_formula)
-            sheet.cell(row, 2, value=plan_formula)
-            sheet.cell(row, 3, value=notes_formula)
-            _style_data_row(sheet, row, emphasize_first=(exercise_index == 1))
+        _write_exercise_rows(
+            sheet, day_row + 2, max_exercises, first_row_ref, count_ref
+        )
 
     sheet.freeze_panes = "A5"
 
@@ -425,11 +610,10 @@ def _build_today_sheet(sheet, max_exercises: int, week_labels: list[str]) -> Non
         vertical="center",
     )
 
+    # Hidden column D holds the selected day's first data row and count.
+    _write_session_helpers(sheet, "D3", "D4", "$B$2", "$B$3", week_count)
     sheet["C3"] = (
-        "=IFERROR("
-        "INDEX(_Program_Data!$E$2:$E$1048576,"
-        "MATCH($B$2*1000+$B$3*100+1,_Program_Data!$L$2:$L$1048576,0)),"
-        '"Day "&B3&" - Rest")'
+        f'=IF($D$3=0,"Day "&B3&" - Rest",INDEX({DAY_LABEL_RANGE},$D$3))'
     )
     _style_cell(sheet["C3"], fill=CONTROL_FILL, font=BODY_FONT, border=True)
 
@@ -443,7 +627,7 @@ def _build_today_sheet(sheet, max_exercises: int, week_labels: list[str]) -> Non
     _style_cell(sheet["A4"], fill=MUTED_FILL, font=SMALL_FONT)
 
     _write_week_legend(sheet, week_labels, start_row=3, start_col=5)
-    _write_day_legend(sheet, start_row=week_count + 6, start_col=5)
+    _write_day_legend(sheet, week_count, start_row=week_count + 6, start_col=5)
 
     if week_count > 0:
         _add_integer_validation(
@@ -478,35 +662,134 @@ def _build_today_sheet(sheet, max_exercises: int, week_labels: list[str]) -> Non
             vertical="center",
         )
 
-    for exercise_index in range(1, max_exercises + 1):
-        row = 6 + exercise_index
-        key_expr = f"IFERROR($B$2*1000+$B$3*100+{exercise_index},0)"
-        data_range_key = "_Program_Data!$L$2:$L$1048576"
-        data_range_ex = "_Program_Data!$I$2:$I$1048576"
-        data_range_plan = "_Program_Data!$J$2:$J$1048576"
-        data_range_notes = "_Program_Data!$K$2:$K$1048576"
+    _write_exercise_rows(sheet, 7, max_exercises, "$D$3", "$D$4", height=42)
 
-        if exercise_index == 1:
-            exercise_formula = (
-                f'=IF(COUNTIF({data_range_key},{key_expr})=0,"Rest / no session",'
-                f'IFERROR(INDEX({data_range_ex},MATCH({key_expr},{data_range_key},0)),""))'
-            )
-            plan_formula = (
-                f'=IF(A{row}="Rest / no session","—",'
-                f'IFERROR(INDEX({data_range_plan},MATCH({key_expr},{data_range_key},0)),""))'
+    sheet.freeze_panes = "A6"
+
+
+def _group_days(
+    rows: list[dict[str, Any]],
+) -> dict[tuple[int, int], list[dict[str, Any]]]:
+    """The rows of each (week, day) session, in exercise order."""
+    days: dict[tuple[int, int], list[dict[str, Any]]] = {}
+    for row in rows:
+        days.setdefault((row["week_num"], row["day_num"]), []).append(row)
+    return days
+
+
+def _style_data_cell(
+    cell, bold: bool = False, stamp: StyleStamp | None = None
+) -> None:
+    style = stamp.apply if stamp is not None else set_styles
+    style(
+        cell,
+        fill=DATA_FILL,
+        border=THIN_BORDER,
+        alignment=alignment(horizontal="left", vertical="top", wrap_text=True),
+        font=BODY_BOLD_FONT if bold else BODY_FONT,
+    )
+
+
+def _build_static_week_view_sheet(
+    sheet,
+    week_labels: list[str],
+    days: dict[tuple[int, int], list[dict[str, Any]]],
+) -> None:
+    """
+    Every week of the program, one after another, each with the blocks of
+    days 1-7 written out as values. The rows under a week's heading are
+    grouped so each week can be collapsed from the outline.
+    """
+    _configure_companion_sheet(sheet)
+    # Each week's heading sits above its grouped rows.
+    sheet.sheet_properties.outlinePr.summaryBelow = False
+
+    sheet.merge_cells("A1:F1")
+    sheet["A1"] = "Week View"
+    _style_cell(sheet["A1"], fill=TITLE_FILL, font=TITLE_FONT, align="center")
+
+    sheet.merge_cells("A2:C2")
+    if week_labels:
+        sheet["A2"] = (
+            f"All {len(week_labels)} weeks. Use the outline to collapse weeks."
+        )
+    else:
+        sheet["A2"] = "No weeks available."
+    _style_cell(sheet["A2"], fill=MUTED_FILL, font=SMALL_FONT)
+
+    # The same few styles repeat for every week and day.
+    stamp = StyleStamp()
+    row = 4
+    for week_num, week_label in enumerate(week_labels, start=1):
+        sheet.merge_cells(start_row=row, start_column=1, end_row=row, end_column=3)
+        _style_cell(
+            sheet.cell(row, 1, value=week_label),
+            fill=TITLE_FILL,
+            font=SECTION_FONT,
+            stamp=stamp,
+        )
+        first_grouped_row = row + 1
+
+        for day_num in range(1, DAYS_PER_WEEK + 1):
+            day_rows = days.get((week_num, day_num), [])
+            day_label = (
+                day_rows[0]["day_label"] if day_rows else f"Day {day_num} - Rest"
             )
-        else:
-            exercise_formula = f'=IFERROR(INDEX({data_range_ex},MATCH({key_expr},{data_range_key},0)),"")'
-            plan_formula = f'=IFERROR(INDEX({data_range_plan},MATCH({key_expr},{data_range_key},0)),"")'
+            row = _write_static_day(sheet, stamp, row + 1, day_label, day_rows)
 
-        notes_formula = f'=IFERROR(INDEX({data_range_notes},MATCH({key_expr},{data_range_key},0)),"")'
+        for grouped_row in range(first_grouped_row, row + 1):
+            sheet.row_dimensions[grouped_row].outline_level = 1
+        # A blank row between weeks.
+        row += 2
 
-        sheet.cell(row, 1, value=exercise_formula)
-        sheet.cell(row, 2, value=plan_formula)
-        sheet.cell(row, 3, value=notes_formula)
-        _style_data_row(sheet, row, emphasize_first=(exercise_index == 1), height=42)
+    sheet.freeze_panes = "A3"
 
-    sheet.freeze_panes = "A6"
+
+def _write_static_day(
+    sheet,
+    stamp: StyleStamp,
+    day_row: int,
+    title: str,
+    day_rows: list[dict[str, Any]],
+    height: int = 34,
+) -> int:
+    """Write one day block as values and return its last row."""
+    sheet.merge_cells(
+        start_row=day_row, start_column=1, end_row=day_row, end_column=3
+    )
+    _style_cell(
+        sheet.cell(day_row, 1, value=title),
+        fill=SECTION_FILL,
+        font=SECTION_FONT,
+        stamp=stamp,
+    )
+
+    headers_row = day_row + 1
+    for col, header in enumerate(["Exercise", "Plan", "Notes"], start=1):
+        _style_cell(
+            sheet.cell(headers_row, col, value=header),
+            fill=HEADER_FILL,
+            font=HEADER_FONT,
+            align="center",
+            vertical="center",
+            stamp=stamp,
+        )
+
+    values = [
+        (item["exercise"], item["prescription"], item["notes"]) for item in day_rows
+    ] or [("Rest / no session", "—", "")]
+
+    row = headers_row
+    for exercise_index, row_values in enumerate(values, start=1):
+        row = headers_row + exercise_index
+        for col, value in enumerate(row_values, start=1):
+            _style_data_cell(
+                sheet.cell(row, col, value=value),
+                bold=exercise_index == 1 and col == 1,
+                stamp=stamp,
+            )
+        sheet.row_dimensions[row].height = height
+    return row
 
 
 def _write_week_legend(
@@ -528,7 +811,9 @@ def _write_week_legend(
         _style_cell(right, fill=DATA_FILL, font=BODY_FONT)
 
 
-def _write_day_legend(sheet, start_row: int, start_col: int) -> None:
+def _write_day_legend(
+    sheet, week_count: int, start_row: int, start_col: int
+) -> None:
     number_col = start_col
     label_col = start_col + 1
 
@@ -540,15 +825,17 @@ def _write_day_legend(sheet, start_row: int, start_col: int) -> None:
     for idx in range(1, 8):
         row = start_row + idx
 
+        # The day's first data row goes in the hidden helper column D.
+        sheet.cell(row, 4).value = "=" + _session_lookup(
+            SESSION_FIRST_ROW_RANGE, "$B$2", idx, week_count
+        )
         left = sheet.cell(row, number_col, value=idx)
         right = sheet.cell(
             row,
             label_col,
             value=(
-                "=IFERROR("
-                "INDEX(_Program_Data!$E$2:$E$1048576,"
-                f"MATCH($B$2*1000+{idx}*100+1,_Program_Data!$L$2:$L$1048576,0)),"
-                f'"Day {idx} - Rest")'
+                f'=IF($D${row}=0,"Day {idx} - Rest",'
+                f"INDEX({DAY_LABEL_RANGE},$D${row}))"
             ),
         )
 
@@ -602,11 +889,7 @@ def _style_data_row(
     height: int = 34,
 ) -> None:
     for col in range(1, 4):
-        cell = sheet.cell(row, col)
-        cell.fill = DATA_FILL
-        cell.border = THIN_BORDER
-        cell.alignment = Alignment(horizontal="left", vertical="top", wrap_text=True)
-        cell.font = BODY_BOLD_FONT if (emphasize_first and col == 1) else BODY_FONT
+        _style_data_cell(sheet.cell(row, col), bold=(emphasize_first and col == 1))
 
     sheet.row_dimensions[row].height = height
 
@@ -619,30 +902,33 @@ def _style_cell(
     align: str | None = "left",
     vertical: str | None = None,
     border: bool = True,
+    stamp: StyleStamp | None = None,
 ) -> None:
-    if fill is not None:
-        cell.fill = fill
-    if font is not None:
-        cell.font = font
-    if border:
-        cell.border = THIN_BORDER
-    if align or vertical:
-        cell.alignment = Alignment(horizontal=align, vertical=vertical, wrap_text=True)
+    style = stamp.apply if stamp is not None else set_styles
+    style(
+        cell,
+        fill=fill,
+        font=font,
+        border=THIN_BORDER if border else None,
+        alignment=(
+            alignment(horizontal=align, vertical=vertical, wrap_text=True)
+            if align or vertical
+            else None
+        ),
+    )
 
 
 def _reorder_sheets(workbook) -> None:
-    primary_title = workbook.worksheets[0].title if workbook.worksheets else None
-    ordered_titles: list[str] = []
-
-    if primary_title:
-        ordered_titles.append(primary_title)
-
-    for title in ("Week View", "Today", "Charts", "_Program_Data"):
-        if title in workbook.sheetnames and title not in ordered_titles:
-            ordered_titles.append(title)
-
-    for title in workbook.sheetnames:
-        if title not in ordered_titles:
-            ordered_titles.append(title)
+    """
+    Keep the plan sheets (the main sheet and any further week sheets) first,
+    in their current order, then the views, charts and program data.
+    """
+    trailing_titles = ("Week View", "Today", "Charts", PROGRAM_DATA_SHEET)
+    ordered_titles = [
+        title for title in workbook.sheetnames if title not in trailing_titles
+    ]
+    ordered_titles += [
+        title for title in trailing_titles if title in workbook.sheetnames
+    ]
 
     workbook._sheets = [workbook[title] for title in ordered_titles]
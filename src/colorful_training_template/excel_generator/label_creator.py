@@ -1,17 +1,27 @@
-from openpyxl.styles import Alignment, Border, Font, PatternFill, Side
-
-BOLD_FONT = Font(bold=True)
-THIN_BORDER = Border(
-    left=Side(style="thin", color="000000"),
-    right=Side(style="thin", color="000000"),
-    top=Side(style="thin", color="000000"),
-    bottom=Side(style="thin", color="000000"),
+from colorful_training_template.excel_generator.styles import (
+    BOLD_FONT,
+    THIN_BORDER,
+    alignment,
+    solid_fill,
+    thin_border,
 )
 
+# How labels that span several columns are drawn. "merge" merges their
+# cells. "center_across" leaves the cells unmerged and gets the same look
+# from centerContinuous alignment (or text overflow, for left-aligned
+# labels) and borders on the outside edges only. Day labels span rows,
+# which alignment cannot do, so they are merged in either mode.
+MERGE_MODES = ("merge", "center_across")
+
 
 class LabelCreator:
-    def __init__(self, sheet):
+    def __init__(self, sheet, merge_mode="merge"):
+        if merge_mode not in MERGE_MODES:
+            raise ValueError(
+                f"Unknown merge mode {merge_mode!r}; expected one of {MERGE_MODES}"
+            )
         self.sheet = sheet
+        self.merge_mode = merge_mode
 
     def add_border_to_label(self, start_row, start_col, end_row, end_col):
         self._apply_fill_and_border(
@@ -21,13 +31,12 @@ class LabelCreator:
     def _apply_fill_and_border(
         self, start_row, start_col, end_row, end_col, fill_color, border
     ):
+        fill = solid_fill(fill_color) if fill_color else None
         for row in range(start_row, end_row + 1):
             for col in range(start_col, end_col + 1):
                 cell = self.sheet.cell(row=row, column=col)
-                if fill_color:
-                    cell.fill = PatternFill(
-                        start_color=fill_color, end_color=fill_color, fill_type="solid"
-                    )
+                if fill is not None:
+                    cell.fill = fill
                 cell.border = border
 
     def label_days(
@@ -40,11 +49,18 @@ class LabelCreator:
         num_sets,
         set_width,
         grid_fill_color,
+        day_heights=None,
     ):
+        """
+        Draw the seven day blocks, each day_height rows high unless
+        day_heights gives a height per day. Blocks are one row apart.
+        """
+        if day_heights is None:
+            day_heights = [day_height] * 7
         days = [f"Day {i+1}" for i in range(7)]
-        for i, day in enumerate(days):
-            day_start_row = start_row + i * (day_height + 1)
-            day_end_row = day_start_row + day_height - 1
+        day_start_row = start_row
+        for day, height in zip(days, day_heights):
+            day_end_row = day_start_row + height - 1
             self._label_single_day(
                 day, day_start_row, start_col + 1, day_end_row, day_fill_color
             )
@@ -59,22 +75,22 @@ class LabelCreator:
                 set_width,
                 grid_fill_color,
             )
+            day_start_row = day_end_row + 2
 
     def _label_single_day(
         self, day, day_start_row, day_start_col, day_end_row, day_fill_color
     ):
-        self.sheet.merge_cells(
-            start_row=day_start_row,
-            start_column=day_start_col,
-            end_row=day_end_row,
-            end_column=day_start_col,
-        )
+        if day_end_row > day_start_row:
+            self.sheet.merge_cells(
+                start_row=day_start_row,
+                start_column=day_start_col,
+                end_row=day_end_row,
+                end_column=day_start_col,
+            )
         cell = self.sheet.cell(row=day_start_row, column=day_start_col)
         cell.value = day
-        cell.fill = PatternFill(
-            start_color=day_fill_color, end_color=day_fill_color, fill_type="solid"
-        )
-        cell.alignment = Alignment(horizontal="center", vertical="center")
+        cell.fill = solid_fill(day_fill_color)
+        cell.alignment = alignment(horizontal="center", vertical="center")
         cell.font = BOLD_FONT
         self.add_border_to_label(
             day_start_row, day_start_col, day_end_row, day_start_col
@@ -85,17 +101,44 @@ class LabelCreator:
             self._create_merged_cell(row, start_col, "", exercise_fill_color)
 
     def _create_merged_cell(self, row, col, value, fill_color):
-        self.sheet.merge_cells(
-            start_row=row, start_column=col, end_row=row, end_column=col + 1
-        )
-        cell = self.sheet.cell(row=row, column=col)
+        cell = self._span_label(row, col, col + 1, fill_color, "left")
         cell.value = value
-        cell.fill = PatternFill(
-            start_color=fill_color, end_color=fill_color, fill_type="solid"
-        )
-        cell.alignment = Alignment(horizontal="left", vertical="center")
+
+    def _span_label(self, row, start_col, end_col, fill_color, horizontal):
+        """
+        Style row[start_col..end_col] as one bold label and return the cell
+        that holds its text.
+        """
+        if self.merge_mode == "merge":
+            self.sheet.merge_cells(
+                start_row=row, start_column=start_col, end_row=row, end_column=end_col
+            )
+            cell = self.sheet.cell(row=row, column=start_col)
+            cell.fill = solid_fill(fill_color)
+            cell.alignment = alignment(horizontal=horizontal, vertical="center")
+            cell.font = BOLD_FONT
+            self.add_border_to_label(row, start_col, row, end_col)
+            return cell
+
+        fill = solid_fill(fill_color)
+        if horizontal == "center":
+            # Centres the first cell's text over the empty cells after it
+            # that share this alignment.
+            horizontal = "centerContinuous"
+        label_alignment = alignment(horizontal=horizontal, vertical="center")
+        for col in range(start_col, end_col + 1):
+            edges = ["top", "bottom"]
+            if col == start_col:
+                edges.append("left")
+            if col == end_col:
+                edges.append("right")
+            cell = self.sheet.cell(row=row, column=col)
+            cell.fill = fill
+            cell.border = thin_border(*edges)
+            cell.alignment = label_alignment
+        cell = self.sheet.cell(row=row, column=start_col)
         cell.font = BOLD_FONT
-        self.add_border_to_label(row, col, row, col + 1)
+        return cell
 
     def _fill_sets(
         self, start_row, end_row, start_col, num_sets, set_width, grid_fill_color
@@ -114,25 +157,21 @@ class LabelCreator:
     def label_weeks(
         self, start_row, start_col, box_width, week_number, start_date, week_fill_color
     ):
-        week_label = (
-            f"Week {week_number} - Week Commencing {start_date.strftime('%d-%m-%Y')}"
-        )
-        start_column = start_col + 1
-        end_column = start_col + box_width - 2
-        self.sheet.merge_cells(
-            start_row=start_row + 1,
-            start_column=start_column,
-            end_row=start_row + 1,
-            end_column=end_column,
+        self._span_label(
+            start_row + 1,
+            start_col + 1,
+            start_col + box_width - 2,
+            week_fill_color,
+            "center",
         )
-        cell = self.sheet.cell(row=start_row + 1, column=start_column)
-        cell.value = week_label
-        cell.fill = PatternFill(
-            start_color=week_fill_color, end_color=week_fill_color, fill_type="solid"
+        self.set_week_label(start_row, start_col, week_number, start_date)
+
+    def set_week_label(self, start_row, start_col, week_number, start_date):
+        cell = self.sheet.cell(row=start_row + 1, column=start_col + 1)
+        cell.value = (
+            f"Week {week_number} - Week Commencing {start_date.strftime('%d-%m-%Y')}"
         )
-        cell.alignment = Alignment(horizontal="center", vertical="center")
-        cell.font = BOLD_FONT
-        self.add_border_to_label(start_row + 1, start_column, start_row + 1, end_column)
+        return cell
 
     def label_sets(
         self, start_row, start_col, num_sets, set_fill_color, set_width, headers
@@ -149,30 +188,16 @@ class LabelCreator:
     def _label_single_set(
         self, start_row, start_col, set_width, set_fill_color, set_number
     ):
-        self.sheet.merge_cells(
-            start_row=start_row,
-            start_column=start_col,
-            end_row=start_row,
-            end_column=start_col + set_width - 1,
+        cell = self._span_label(
+            start_row, start_col, start_col + set_width - 1, set_fill_color, "center"
         )
-        cell = self.sheet.cell(row=start_row, column=start_col)
         cell.value = f"Set {set_number}"
-        cell.fill = PatternFill(
-            start_color=set_fill_color, end_color=set_fill_color, fill_type="solid"
-        )
-        cell.alignment = Alignment(horizontal="center", vertical="center")
-        cell.font = BOLD_FONT
-        self.add_border_to_label(
-            start_row, start_col, start_row, start_col + set_width - 1
-        )
 
     def _label_set_headers(self, start_row, start_col, headers, set_fill_color):
         for j, header in enumerate(headers):
             header_cell = self.sheet.cell(row=start_row, column=start_col + j)
             header_cell.value = header
-            header_cell.fill = PatternFill(
-                start_color=set_fill_color, end_color=set_fill_color, fill_type="solid"
-            )
-            header_cell.alignment = Alignment(horizontal="center", vertical="center")
+            header_cell.fill = solid_fill(set_fill_color)
+            header_cell.alignment = alignment(horizontal="center", vertical="center")
             header_cell.font = BOLD_FONT
             self.add_border_to_label(start_row, start_col + j, start_row, start_col + j)
@@ -0,0 +1,38 @@
+"""
+Writing a workbook's xlsx package at a chosen zip compression.
+
+"deflate" is what openpyxl's Workbook.save does. "fast" deflates at the
+lowest level, and "stored" does not compress at all: quickest to write,
+largest on disk.
+"""
+
+import datetime
+from zipfile import ZIP_DEFLATED, ZIP_STORED, ZipFile
+
+from openpyxl.writer.excel import ExcelWriter
+
+COMPRESSION_MODES = ("deflate", "fast", "stored")
+
+
+def open_package(filename, compression="deflate"):
+    """A ZipFile to write an xlsx package to."""
+    if compression not in COMPRESSION_MODES:
+        raise ValueError(
+            f"Unknown compression {compression!r}; expected one of {COMPRESSION_MODES}"
+        )
+    if compression == "stored":
+        return ZipFile(filename, "w", ZIP_STORED, allowZip64=True)
+    level = 1 if compression == "fast" else None
+    return ZipFile(filename, "w", ZIP_DEFLATED, allowZip64=True, compresslevel=level)
+
+
+def save_workbook(workbook, filename, compression="deflate", writer=ExcelWriter):
+    """
+    openpyxl's save_workbook at the given compression. writer is called
+    with (workbook, archive) and must return an ExcelWriter.
+    """
+    archive = open_package(filename, compression)
+    workbook.properties.modified = datetime.datetime.now(
+        tz=datetime.timezone.utc
+    ).replace(tzinfo=None)
+    writer(workbook, archive).save()
@@ -0,0 +1,363 @@
+"""
+In-memory sheet composition for the write-only and xml render backends.
+
+SheetPlan records the subset of the openpyxl Worksheet API that the box,
+label and data creators (and the chart and companion-view builders) use.
+Each cell's final value and style are composed in a compact grid, then
+emitted once, row by row, into an openpyxl write-only worksheet (or, for
+the xml backend, as raw sheet XML; see xml_writer).
+"""
+
+import logging
+
+import openpyxl
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Border
+from openpyxl.utils import (
+    column_index_from_string,
+    coordinate_to_tuple,
+    get_column_letter,
+)
+from openpyxl.utils.units import DEFAULT_COLUMN_WIDTH
+from openpyxl.worksheet.cell_range import CellRange, MultiCellRange
+from openpyxl.worksheet.datavalidation import DataValidationList
+from openpyxl.worksheet.properties import WorksheetProperties
+from openpyxl.worksheet.views import SheetViewList
+from openpyxl.worksheet.worksheet import Worksheet
+
+from colorful_training_template.excel_generator.package import save_workbook
+from colorful_training_template.excel_generator.styles import StyleStamp
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BORDER = Border()
+MERGE_EDGES = ("top", "left", "right", "bottom")
+
+
+class PlanCell:
+    __slots__ = (
+        "row",
+        "column",
+        "value",
+        "fill",
+        "border",
+        "font",
+        "alignment",
+        "number_format",
+    )
+
+    def __init__(self, row, column, value=None):
+        self.row = row
+        self.column = column
+        self.value = value
+        self.fill = None
+        self.border = None
+        self.font = None
+        self.alignment = None
+        self.number_format = None
+
+    @property
+    def coordinate(self):
+        return f"{get_column_letter(self.column)}{self.row}"
+
+    @property
+    def has_style(self):
+        return (
+            self.fill is not None
+            or self.border is not None
+            or self.font is not None
+            or self.alignment is not None
+            or self.number_format is not None
+        )
+
+    def style_key(self):
+        # Style objects are kept alive by the plan, so their ids are stable.
+        return (
+            id(self.fill),
+            id(self.border),
+            id(self.font),
+            id(self.alignment),
+            self.number_format,
+        )
+
+    def to_write_only_cell(self, ws, stamp):
+        """An openpyxl cell for ws, styled through stamp (a StyleStamp)."""
+        cell = WriteOnlyCell(ws, value=self.value)
+        if self.has_style:
+            stamp.apply(
+                cell,
+                fill=self.fill,
+                border=self.border,
+                font=self.font,
+                alignment=self.alignment,
+                number_format=self.number_format,
+            )
+        return cell
+
+
+class _ColumnDimension:
+    __slots__ = ("width", "hidden")
+
+    def __init__(self):
+        self.width = DEFAULT_COLUMN_WIDTH
+        self.hidden = False
+
+
+class _RowDimension:
+    __slots__ = ("height", "outline_level")
+
+    def __init__(self):
+        self.height = None
+        self.outline_level = 0
+
+
+class _DimensionHolder(dict):
+    def __init__(self, factory):
+        super().__init__()
+        self._factory = factory
+
+    def __missing__(self, key):
+        value = self[key] = self._factory()
+        return value
+
+
+class SheetPlan:
+    """
+    A worksheet stand-in that stores cells as PlanCell records keyed by
+    (row, column). Merges follow openpyxl's rules: non-anchor cells lose
+    their value and style, then edge cells take the anchor's border sides.
+    """
+
+    # Reuse openpyxl's view handling so panes serialise identically.
+    sheet_view = Worksheet.sheet_view
+    freeze_panes = Worksheet.freeze_panes
+
+    def __init__(self, title):
+        self.title = title
+        self._cells = {}
+        # column index -> row indices with a cell, for column lookups
+        self._column_rows = {}
+        self.merged_ranges = []
+        self.column_dimensions = _DimensionHolder(_ColumnDimension)
+        self.row_dimensions = _DimensionHolder(_RowDimension)
+        self.views = SheetViewList()
+        self.sheet_properties = WorksheetProperties()
+        self.data_validations = DataValidationList()
+        self.sheet_state = "visible"
+        self._charts = []
+        self._current_row = 0
+
+    @property
+    def max_row(self):
+        return max((row for row, _ in self._cells), default=1)
+
+    @property
+    def max_column(self):
+        return max((col for _, col in self._cells), default=1)
+
+    def cell(self, row, column, value=None):
+        key = (row, column)
+        cell = self._cells.get(key)
+        if cell is None:
+            cell = self._cells[key] = PlanCell(row, column)
+            self._column_rows.setdefault(column, set()).add(row)
+        if value is not None:
+            cell.value = value
+        return cell
+
+    def __getitem__(self, key):
+        if isinstance(key, int):
+            coords = sorted(coord for coord in self._cells if coord[0] == key)
+            return tuple(self._cells[coord] for coord in coords)
+        if key.isalpha():
+            col = column_index_from_string(key)
+            rows = sorted(self._column_rows.get(col, ()))
+            return tuple(self._cells[(row, col)] for row in rows)
+        row, col = coordinate_to_tuple(key)
+        return self.cell(row, col)
+
+    def __setitem__(self, key, value):
+        self[key].value = value
+
+    def append(self, values):
+        self._current_row += 1
+        for col, value in enumerate(values, start=1):
+            self.cell(self._current_row, col, value)
+
+    def merge_cells(
+        self,
+        range_string=None,
+        start_row=None,
+        start_column=None,
+        end_row=None,
+        end_column=None,
+    ):
+        cr = CellRange(
+            range_string=range_string,
+            min_col=start_column,
+            min_row=start_row,
+            max_col=end_column,
+            max_row=end_row,
+        )
+        self.merged_ranges.append(cr)
+
+        anchor = self.cell(cr.min_row, cr.min_col)
+        end_cell = self._cells.get((cr.max_row, cr.max_col))
+        if end_cell is not None:
+            end_border = end_cell.border or DEFAULT_BORDER
+            anchor.border = (anchor.border or DEFAULT_BORDER) + Border(
+                right=end_border.right, bottom=end_border.bottom
+            )
+
+        for row, col in cr.cells:
+            if (row, col) != (cr.min_row, cr.min_col):
+                self._cells[(row, col)] = PlanCell(row, col)
+                self._column_rows.setdefault(col, set()).add(row)
+
+        anchor_border = anchor.border or DEFAULT_BORDER
+        for name in MERGE_EDGES:
+            side = getattr(anchor_border, name)
+            if side is None or side.style is None:
+                continue
+            edge_border = Border(**{name: side})
+            for row, col in getattr(cr, name):
+                cell = self.cell(row, col)
+                cell.border = (cell.border or DEFAULT_BORDER) + edge_border
+
+    def add_data_validation(self, data_validation):
+        self.data_validations.append(data_validation)
+
+    def add_chart(self, chart, anchor=None):
+        if anchor is not None:
+            chart.anchor = anchor
+        self._charts.append(chart)
+
+    def write_to(self, ws, stamp=None):
+        """Emit the composed sheet into an openpyxl write-only worksheet."""
+        if stamp is None:
+            stamp = StyleStamp()
+        self.write_layout(ws)
+
+        next_row = 1
+        for row, cells in self.rows():
+            for _ in range(next_row, row):
+                ws.append([])
+            values = [None] * cells[-1].column
+            for cell in cells:
+                values[cell.column - 1] = cell.to_write_only_cell(ws, stamp)
+            ws.append(values)
+            next_row = row + 1
+
+    def write_layout(self, ws):
+        """
+        Set everything but the cells on an openpyxl write-only worksheet:
+        dimensions, views, properties, merges, validations and charts.
+        """
+        # Like openpyxl, every column dimension that was touched is written,
+        # even at the default width.
+        for letter, dim in self.column_dimensions.items():
+            ws.column_dimensions[letter].width = dim.width
+            if dim.hidden:
+                ws.column_dimensions[letter].hidden = True
+
+        for row, dim in self.row_dimensions.items():
+            if dim.height is not None:
+                ws.row_dimensions[row].height = dim.height
+            if dim.outline_level:
+                ws.row_dimensions[row].outline_level = dim.outline_level
+
+        ws.views = self.views
+        ws.sheet_properties = self.sheet_properties
+        ws.sheet_state = self.sheet_state
+
+        # MultiCellRange.add checks containment against every existing range,
+        # so build the set in one go.
+        ws.merged_cells = MultiCellRange(self.merged_ranges)
+        for data_validation in self.data_validations.dataValidation:
+            ws.data_validations.append(data_validation)
+        for chart in self._charts:
+            ws.add_chart(chart)
+
+    def rows(self):
+        """
+        (row, cells) for every row with a value or styled cell, in order;
+        cells are sorted by column and skip empty, unstyled cells.
+        """
+        rows = {}
+        for (row, col), cell in self._cells.items():
+            if cell.value is None and not cell.has_style:
+                continue
+            rows.setdefault(row, []).append(cell)
+        for row in sorted(rows):
+            cells = rows[row]
+            cells.sort(key=lambda cell: cell.column)
+            yield row, cells
+
+
+class PlanWorkbook:
+    """
+    A Workbook stand-in whose sheets are SheetPlans. save() streams every
+    sheet through an openpyxl write-only workbook.
+    """
+
+    def __init__(self):
+        self._sheets = [SheetPlan("Sheet")]
+        self._active_index = 0
+        # name -> openpyxl DefinedName, as on Workbook.defined_names
+        self.defined_names = {}
+
+    @property
+    def sheetnames(self):
+        return [sheet.title for sheet in self._sheets]
+
+    @property
+    def worksheets(self):
+        return list(self._sheets)
+
+    @property
+    def active(self):
+        return self._sheets[self._active_index]
+
+    @active.setter
+    def active(self, value):
+        if isinstance(value, int):
+            self._active_index = value
+        else:
+            self._active_index = self._sheets.index(value)
+
+    def create_sheet(self, title):
+        sheet = SheetPlan(title)
+        self._sheets.append(sheet)
+        return sheet
+
+    def __getitem__(self, title):
+        for sheet in self._sheets:
+            if sheet.title == title:
+                return sheet
+        raise KeyError(f"Worksheet {title} does not exist.")
+
+    def __delitem__(self, title):
+        self._sheets.remove(self[title])
+
+    def to_openpyxl(self, cells=True):
+        """
+        Return an openpyxl write-only workbook with every sheet written.
+        With cells=False, only each sheet's layout is set (see
+        SheetPlan.write_layout), for writers that emit the cells themselves.
+        """
+        workbook = openpyxl.Workbook(write_only=True)
+        stamp = StyleStamp()
+        for sheet in self._sheets:
+            ws = workbook.create_sheet(sheet.title)
+            if cells:
+                sheet.write_to(ws, stamp)
+            else:
+                sheet.write_layout(ws)
+        for name, defined_name in self.defined_names.items():
+            workbook.defined_names[name] = defined_name
+        workbook.active = self._active_index
+        return workbook
+
+    def save(self, filename, compression="deflate"):
+        save_workbook(self.to_openpyxl(), filename, compression)
+        logger.info("Streamed %d sheets to %s", len(self._sheets), filename)
@@ -0,0 +1,108 @@
+"""
+Shared, interned openpyxl style objects.
+
+Every factory here returns the same object for the same arguments, so
+cells that look alike share one PatternFill, Border, Font or Alignment
+instead of each carrying a fresh copy for openpyxl to hash and
+deduplicate. The returned objects are shared and must not be mutated.
+"""
+
+from copy import copy
+from functools import lru_cache
+
+from openpyxl.cell import Cell
+from openpyxl.styles import Alignment, Border, Font, PatternFill, Side
+
+THIN_SIDE = Side(style="thin", color="000000")
+BORDER_EDGES = ("left", "right", "top", "bottom")
+
+
+@lru_cache(maxsize=None)
+def solid_fill(color):
+    return PatternFill(start_color=color, end_color=color, fill_type="solid")
+
+
+@lru_cache(maxsize=None)
+def thin_border(*edges):
+    """A thin black border on the given edges, e.g. thin_border("top", "left")."""
+    return Border(**{edge: THIN_SIDE for edge in edges})
+
+
+def font(size=None, bold=None, italic=None):
+    # Normalise to positional arguments so keyword and positional calls
+    # share a cache entry.
+    return _font(size, bold, italic)
+
+
+@lru_cache(maxsize=None)
+def _font(size, bold, italic):
+    return Font(size=size, bold=bold, italic=italic)
+
+
+def alignment(horizontal=None, vertical=None, wrap_text=None):
+    return _alignment(horizontal, vertical, wrap_text)
+
+
+@lru_cache(maxsize=None)
+def _alignment(horizontal, vertical, wrap_text):
+    return Alignment(horizontal=horizontal, vertical=vertical, wrap_text=wrap_text)
+
+
+THIN_BORDER = thin_border(*BORDER_EDGES)
+BOLD_FONT = font(bold=True)
+
+
+def set_styles(
+    cell, fill=None, border=None, font=None, alignment=None, number_format=None
+):
+    """Set the given styles on cell; None leaves that style as it is."""
+    if fill is not None:
+        cell.fill = fill
+    if border is not None:
+        cell.border = border
+    if font is not None:
+        cell.font = font
+    if alignment is not None:
+        cell.alignment = alignment
+    if number_format is not None:
+        cell.number_format = number_format
+
+
+class StyleStamp:
+    """
+    set_styles for the many unstyled cells of one workbook that share a
+    few combinations of the objects above.
+
+    Assigning a style object to an openpyxl cell looks it up in the
+    workbook's style tables, which hashes the object every time, shared or
+    not. A stamp styles the first cell of each combination normally and
+    copies the indexes that lookup produced (openpyxl's private
+    Cell._style StyleArray) onto every later cell with that combination.
+    On a 52-week plan that is about a third of the openpyxl backend's box
+    drawing and of the write-only backend's save. Other cells, such as a
+    SheetPlan's PlanCells, are styled with set_styles.
+    """
+
+    def __init__(self):
+        # style key -> (StyleArray, the style objects, kept so ids stay unique)
+        self._styles = {}
+
+    def apply(
+        self,
+        cell,
+        fill=None,
+        border=None,
+        font=None,
+        alignment=None,
+        number_format=None,
+    ):
+        if not isinstance(cell, Cell):
+            set_styles(cell, fill, border, font, alignment, number_format)
+            return
+        key = (id(fill), id(border), id(font), id(alignment), number_format)
+        cached = self._styles.get(key)
+        if cached is not None:
+            cell._style = copy(cached[0])
+            return
+        set_styles(cell, fill, border, font, alignment, number_format)
+        self._styles[key] = (copy(cell._style), (fill, border, font, alignment))
@@ -0,0 +1,85 @@
+"""
+One week box, composed once and stamped onto the sheet for every week.
+
+Drawing a week box runs several passes (outer box, week label, set
+labels, day labels) that restyle cells earlier passes already styled.
+WeekBoxTemplate runs those passes a single time on a scratch SheetPlan,
+keeps only each cell's final value and style, and then writes every cell
+of every week exactly once.
+"""
+
+from colorful_training_template.excel_generator.sheet_plan import SheetPlan
+from colorful_training_template.excel_generator.styles import StyleStamp
+
+STYLE_ATTRS = ("fill", "border", "font", "alignment")
+
+
+class WeekBoxTemplate:
+    def __init__(self, plan, origin_row, origin_col):
+        # Each cell is stored as (row offset, col offset, value, style index)
+        # with the distinct (fill, border, font, alignment) tuples in styles.
+        self.cells = []
+        self.styles = []
+        self.merges = []
+        self._stamp = StyleStamp()
+
+        style_indexes = {}
+        for (row, col), cell in sorted(plan._cells.items()):
+            if cell.value is None and not cell.has_style:
+                continue
+            style = tuple(getattr(cell, attr) for attr in STYLE_ATTRS)
+            key = tuple(id(obj) for obj in style)
+            index = style_indexes.get(key)
+            if index is None:
+                index = style_indexes[key] = len(self.styles)
+                self.styles.append(style)
+            self.cells.append((row - origin_row, col - origin_col, cell.value, index))
+
+        for cr in plan.merged_ranges:
+            self.merges.append(
+                (
+                    cr.min_row - origin_row,
+                    cr.min_col - origin_col,
+                    cr.max_row - origin_row,
+                    cr.max_col - origin_col,
+                )
+            )
+
+    @classmethod
+    def compose(cls, draw):
+        """
+        Build a template from draw(sheet, start_row, start_col), which must
+        draw one complete week box at the given position.
+        """
+        plan = SheetPlan("Week box")
+        draw(plan, 1, 1)
+        return cls(plan, 1, 1)
+
+    def stamp(self, sheet, start_row, start_col):
+        # Merge first so that, on an openpyxl sheet, the merged cells exist
+        # and take their final borders from the template like any other cell.
+        for min_row, min_col, max_row, max_col in self.merges:
+            sheet.merge_cells(
+                start_row=start_row + min_row,
+                start_column=start_col + min_col,
+                end_row=start_row + max_row,
+                end_column=start_col + max_col,
+            )
+
+        for row_offset, col_offset, value, style_index in self.cells:
+            cell = sheet.cell(row=start_row + row_offset, column=start_col + col_offset)
+            if value is not None:
+                cell.value = value
+            self._apply_style(cell, style_index)
+
+    def values(self, start_row, start_col):
+        """Yield (row, col, value) for the cells stamp() gives a value."""
+        for row_offset, col_offset, value, _ in self.cells:
+            if value is not None:
+                yield start_row + row_offset, start_col + col_offset, value
+
+    def _apply_style(self, cell, style_index):
+        fill, border, font, alignment = self.styles[style_index]
+        self._stamp.apply(
+            cell, fill=fill, border=border, font=font, alignment=alignment
+        )
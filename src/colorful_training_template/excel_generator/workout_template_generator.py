@@ -4,25 +4,55 @@ from datetime import timedelta
 import openpyxl
 
 from colorful_training_template.excel_generator.box_creator import BoxCreator
+from colorful_training_template.excel_generator.box_layout import (
+    block_sheet_title,
+    place_boxes,
+    plan_box_layouts,
+)
 from colorful_training_template.excel_generator.data_populator import DataPopulator
 from colorful_training_template.excel_generator.label_creator import LabelCreator
+from colorful_training_template.excel_generator.package import save_workbook
+from colorful_training_template.excel_generator.sheet_plan import PlanWorkbook
+from colorful_training_template.excel_generator.week_template import WeekBoxTemplate
+from colorful_training_template.excel_generator.xml_writer import XmlPlanWorkbook
+from colorful_training_template.timing import stage
 
 logger = logging.getLogger(__name__)
 
+# "openpyxl" edits a normal in-memory workbook cell by cell. "write_only"
+# composes every sheet in a SheetPlan and streams it out once on save.
+# "xml" composes the same way but writes the cells as raw sheet XML.
+RENDER_BACKENDS = ("openpyxl", "write_only", "xml")
+
+# Rows below the top of a week box where the set labels and days start.
+SET_LABEL_ROW_OFFSET = 3
+DAY_ROW_OFFSET = SET_LABEL_ROW_OFFSET + 4
+
 
 class WorkoutTemplateGenerator:
-    def __init__(self, workbook_name, start_date):
-        self.workbook = openpyxl.Workbook()
+    def __init__(self, workbook_name, start_date, backend="openpyxl"):
+        if backend == "openpyxl":
+            self.workbook = openpyxl.Workbook()
+        elif backend == "write_only":
+            self.workbook = PlanWorkbook()
+        elif backend == "xml":
+            self.workbook = XmlPlanWorkbook()
+        else:
+            raise ValueError(
+                f"Unknown render backend {backend!r}; expected one of {RENDER_BACKENDS}"
+            )
+        self.backend = backend
         self.sheet = self.workbook.active
         self.workbook_name = workbook_name
         self.start_date = start_date
-        self.box_creator = BoxCreator(self.sheet)
-        self.label_creator = LabelCreator(self.sheet)
-        self.data_populator = DataPopulator(self.sheet)
+        # sheet -> DataPopulator of each sheet weeks are rendered on
+        self._populators = {}
         logger.info(
-            "Initialized WorkoutTemplateGenerator with workbook '%s' and start_date %s",
+            "Initialized WorkoutTemplateGenerator with workbook '%s', start_date %s "
+            "and backend '%s'",
             workbook_name,
             start_date,
+            backend,
         )
 
     def create_consecutive_boxes(
@@ -42,98 +72,259 @@ class WorkoutTemplateGenerator:
         set_width,
         headers,
         workout_data,
+        box_size="fixed",
+        compact_rest_days=False,
+        week_layout="horizontal",
+        weeks_per_row=4,
+        weeks_per_sheet=4,
+        merge_mode="merge",
+        auto_width=True,
     ):
+        """
+        Draw and fill one box per week. Boxes are num_sets sets by
+        num_exercises exercises unless box_size derives the sizes from
+        workout_data (see box_layout.plan_box_layouts), and are arranged
+        by week_layout (see box_layout.place_boxes). merge_mode is how
+        labels spanning several columns are drawn (see
+        label_creator.MERGE_MODES). Without auto_width the data columns
+        keep their default widths.
+        """
         logger.info(
-            "Creating %d consecutive boxes with %d sets and %d exercises each.",
-            num_boxes,
+            "Creating %d consecutive boxes (box size '%s').", num_boxes, box_size
+        )
+        layouts = plan_box_layouts(
+            workout_data.weeks[:num_boxes],
+            box_size,
             num_sets,
             num_exercises,
+            compact_rest_days,
         )
-        box_height, box_width = self.calculate_box_dimensions(
-            set_width, num_sets, num_exercises
+        sizes = [
+            self.calculate_box_dimensions(
+                set_width, layout.num_sets, layout.num_exercises, layout.day_heights
+            )
+            for layout in layouts
+        ]
+        placements = place_boxes(
+            sizes,
+            week_layout,
+            start_row,
+            start_col,
+            space_between,
+            weeks_per_row,
+            weeks_per_sheet,
         )
-        logger.debug(
-            "Calculated box dimensions: height=%d, width=%d", box_height, box_width
+        sheets = self._week_sheets(placements, week_layout)
+        # Weeks with the same layout differ only in the week label and the
+        # workout data, so each layout is composed once and stamped.
+        templates = {}
+        for i, (layout, (box_height, box_width), placement) in enumerate(
+            zip(layouts, sizes, placements)
+        ):
+            template = templates.get(layout)
+            if template is None:
+                logger.debug(
+                    "Calculated box dimensions: height=%d, width=%d",
+                    box_height,
+                    box_width,
+                )
+                with stage("template"):
+                    template = templates[layout] = WeekBoxTemplate.compose(
+                        lambda sheet, row, col: self._draw_week_box(
+                            sheet,
+                            row,
+                            col,
+                            box_height,
+                            box_width,
+                            layout.num_sets,
+                            layout.num_exercises,
+                            fill_color,
+                            week_fill_color,
+                            set_fill_color,
+                            day_fill_color,
+                            exercise_fill_color,
+                            grid_fill_color,
+                            set_width,
+                            headers,
+                            layout.day_heights,
+                            merge_mode,
+                        )
+                    )
+                logger.debug(
+                    "Composed week box template with %d cells and %d merges",
+                    len(template.cells),
+                    len(template.merges),
+                )
+            with stage(f"week {i + 1}"):
+                self._render_week(
+                    template,
+                    i,
+                    sheets[placement.sheet_index],
+                    placement.row,
+                    placement.col,
+                    workout_data.weeks[i].days,
+                    layout,
+                    set_width,
+                )
+        if not auto_width:
+            return
+        # Size the data columns once every week has been written.
+        with stage("column widths"):
+            for sheet in sheets:
+                self._populator(sheet).column_widths.apply()
+
+    def _week_sheets(self, placements, week_layout):
+        """The sheets the placed boxes go on, the main sheet first."""
+        sheet_count = max((p.sheet_index for p in placements), default=0) + 1
+        sheets = [self.sheet] + [
+            self.workbook.create_sheet(f"Sheet{index + 1}")
+            for index in range(1, sheet_count)
+        ]
+        if week_layout == "per_block":
+            for index, sheet in enumerate(sheets):
+                weeks = [
+                    week_index + 1
+                    for week_index, placement in enumerate(placements)
+                    if placement.sheet_index == index
+                ]
+                if weeks:
+                    sheet.title = block_sheet_title(weeks[0], weeks[-1])
+        return sheets
+
+    def _populator(self, sheet):
+        populator = self._populators.get(sheet)
+        if populator is None:
+            populator = self._populators[sheet] = DataPopulator(sheet)
+        return populator
+
+    def _render_week(
+        self,
+        template,
+        week_index,
+        sheet,
+        start_row,
+        current_start_col,
+        week_days,
+        layout,
+        set_width,
+    ):
+        logger.info(
+            "Creating box %d on '%s' at row %d, col %d",
+            week_index + 1,
+            sheet.title,
+            start_row,
+            current_start_col,
         )
-        for i in range(num_boxes):
-            current_start_col = start_col + i * (box_width + space_between)
-            logger.info(
-                "Creating box %d at row %d, col %d", i + 1, start_row, current_start_col
-            )
-            # Create the outer box with a fill color
-            self.box_creator.create_box(
-                start_row,
-                current_start_col,
-                start_row + box_height - 1,
-                current_start_col + box_width - 1,
-                fill_color,
-            )
-            current_week_start_date = self.start_date + timedelta(weeks=i)
-            logger.info(
-                "Labeling week %d (commencing %s)",
-                i + 1,
-                current_week_start_date.strftime("%Y-%m-%d"),
-            )
-            # Label the week at the top of the box
-            self.label_creator.label_weeks(
-                start_row,
-                current_start_col,
-                box_width,
-                i + 1,
-                current_week_start_date,
-                week_fill_color,
-            )
-            # Label the sets (starting a few rows down)
-            set_start_row = start_row + 3
-            logger.info("Labeling sets starting at row %d", set_start_row)
-            self.label_creator.label_sets(
-                set_start_row,
-                current_start_col + 1,
-                num_sets,
-                set_fill_color,
-                set_width,
-                headers,
-            )
-            # Label days and fill in the exercise grid
-            day_start_row = set_start_row + 4
-            logger.info("Labeling days starting at row %d", day_start_row)
-            self.label_creator.label_days(
-                day_start_row,
-                current_start_col,
-                num_exercises,
-                day_fill_color,
-                exercise_fill_color,
-                num_sets,
-                set_width,
-                grid_fill_color,
-            )
-            logger.info("Populating workout data for week %d", i + 1)
-            self.data_populator.populate_workout_data(
-                day_start_row,
+        data_populator = self._populator(sheet)
+        with stage("stamp"):
+            template.stamp(sheet, start_row, current_start_col)
+            for _, col, value in template.values(start_row, current_start_col):
+                data_populator.column_widths.record(col, value)
+        current_week_start_date = self.start_date + timedelta(weeks=week_index)
+        logger.info(
+            "Labeling week %d (commencing %s)",
+            week_index + 1,
+            current_week_start_date.strftime("%Y-%m-%d"),
+        )
+        week_label = LabelCreator(sheet).set_week_label(
+            start_row, current_start_col, week_index + 1, current_week_start_date
+        )
+        data_populator.column_widths.record(week_label.column, week_label.value)
+        logger.info("Populating workout data for week %d", week_index + 1)
+        with stage("populate"):
+            data_populator.populate_workout_data(
+                start_row + DAY_ROW_OFFSET,
                 current_start_col,
-                workout_data[i][f"week_{i+1}"],
-                num_sets,
+                week_days,
+                layout.num_sets,
                 set_width,
-                num_exercises,
+                layout.num_exercises,
+                layout.day_offsets,
             )
 
-    def calculate_box_dimensions(self, set_width, num_sets, num_exercises):
+    def _draw_week_box(
+        self,
+        sheet,
+        start_row,
+        start_col,
+        box_height,
+        box_width,
+        num_sets,
+        num_exercises,
+        fill_color,
+        week_fill_color,
+        set_fill_color,
+        day_fill_color,
+        exercise_fill_color,
+        grid_fill_color,
+        set_width,
+        headers,
+        day_heights=None,
+        merge_mode="merge",
+    ):
+        box_creator = BoxCreator(sheet)
+        label_creator = LabelCreator(sheet, merge_mode)
+        # Create the outer box with a fill color
+        box_creator.create_box(
+            start_row,
+            start_col,
+            start_row + box_height - 1,
+            start_col + box_width - 1,
+            fill_color,
+        )
+        # Label the week at the top of the box
+        label_creator.label_weeks(
+            start_row, start_col, box_width, 1, self.start_date, week_fill_color
+        )
+        # Label the sets (starting a few rows down)
+        set_start_row = start_row + SET_LABEL_ROW_OFFSET
+        label_creator.label_sets(
+            set_start_row,
+            start_col + 1,
+            num_sets,
+            set_fill_color,
+            set_width,
+            headers,
+        )
+        # Label days and fill in the exercise grid
+        day_start_row = start_row + DAY_ROW_OFFSET
+        label_creator.label_days(
+            day_start_row,
+            start_col,
+            num_exercises,
+            day_fill_color,
+            exercise_fill_color,
+            num_sets,
+            set_width,
+            grid_fill_color,
+            day_heights,
+        )
+
+    def calculate_box_dimensions(
+        self, set_width, num_sets, num_exercises, day_heights=None
+    ):
         # Header: 2 (top) + 1 (week) + 2 (set titles) + 1 (set headers) = 6 rows
         header_height = 6
-        # Each day block gets num_exercises rows plus 1 spacer row
-        day_block_height = num_exercises + 1
-        min_height = header_height + 7 * day_block_height + 1
+        # Day block i is day_heights[i] rows high (num_exercises for every
+        # day when not given), and each is followed by 1 spacer row
+        if day_heights is None:
+            day_heights = [num_exercises] * 7
+        min_height = header_height + sum(height + 1 for height in day_heights) + 1
         # Width calculation (adjustable as needed)
         min_width = 1 + 3 + num_sets * (set_width + 1) - 1 + 2 + 1
         logger.debug(
-            "Box dimensions calculated: header_height=%d, day_block_height=%d, min_height=%d, min_width=%d",
+            "Box dimensions calculated: header_height=%d, day_heights=%s, min_height=%d, min_width=%d",
             header_height,
-            day_block_height,
+            list(day_heights),
             min_height,
             min_width,
         )
         return min_height, min_width
 
-    def save_workbook(self):
-        self.workbook.save(self.workbook_name)
+    def save_workbook(self, compression="deflate"):
+        """Save at a package.COMPRESSION_MODES compression."""
+        if self.backend == "openpyxl":
+            save_workbook(self.workbook, self.workbook_name, compression)
+        else:
+            self.workbook.save(self.workbook_name, compression)
         logger.info("Workbook saved as %s", self.workbook_name)
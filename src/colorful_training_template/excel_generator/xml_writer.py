@@ -0,0 +1,187 @@
+"""
+SpreadsheetML emitter for the "xml" render backend.
+
+The sheets are composed in SheetPlans exactly as for the write-only
+backend, but on save each sheet's cells are written straight into the
+package as raw <sheetData> XML, a row at a time, instead of going through
+an openpyxl cell object per cell. Everything around the cells (sheet
+properties, views, columns, merges, validations, drawings) and the rest of
+the package, including styles.xml from the workbook's interned style
+tables, is still written by openpyxl.
+"""
+
+import logging
+import math
+from functools import partial
+from types import SimpleNamespace
+from xml.sax.saxutils import escape
+
+from openpyxl.cell._writer import etree_write_cell
+from openpyxl.cell.cell import ERROR_CODES, ILLEGAL_CHARACTERS_RE
+from openpyxl.drawing.spreadsheet_drawing import SpreadsheetDrawing
+from openpyxl.utils import get_column_letter
+from openpyxl.worksheet._writer import WorksheetWriter
+from openpyxl.writer.excel import ExcelWriter
+from openpyxl.xml.constants import SHEET_MAIN_NS
+from openpyxl.xml.functions import tostring
+
+from colorful_training_template.excel_generator.package import save_workbook
+from colorful_training_template.excel_generator.sheet_plan import PlanWorkbook
+from colorful_training_template.excel_generator.styles import StyleStamp
+
+logger = logging.getLogger(__name__)
+
+# Rows of XML buffered before they are written to the archive.
+ROWS_PER_CHUNK = 256
+# Longest string a cell can hold; openpyxl truncates longer ones.
+MAX_STRING_LENGTH = 32767
+
+
+class SheetXmlWriter(WorksheetWriter):
+    """
+    A WorksheetWriter that takes a SheetPlan's cells instead of the
+    worksheet's. ws is a write-only worksheet carrying the plan's layout
+    (see SheetPlan.write_layout) and out a binary stream.
+
+    style_ids maps PlanCell.style_key() to an index in the workbook's cell
+    style table and stamp is the StyleStamp that registers the styles; both
+    are shared by every sheet.
+    """
+
+    def __init__(self, ws, plan, out, style_ids, stamp):
+        self.plan = plan
+        self.style_ids = style_ids
+        self.stamp = stamp
+        super().__init__(ws, out)
+
+    def get_stream(self):
+        # Same protocol as WorksheetWriter.get_stream, serialising the
+        # elements the base class sends with tostring.
+        self.out.write(f'<worksheet xmlns="{SHEET_MAIN_NS}">'.encode())
+        try:
+            while True:
+                element = yield
+                if element is not None:
+                    self.out.write(tostring(element))
+        except GeneratorExit:
+            self.out.write(b"</worksheet>")
+
+    def write_rows(self):
+        row_dimensions = self.ws.row_dimensions
+        rows = dict(self.plan.rows())
+        # Rows with a height or outline level but no cells are still written.
+        row_numbers = sorted(rows.keys() | row_dimensions.keys())
+
+        chunk = ["<sheetData>"]
+        for index, row in enumerate(row_numbers, start=1):
+            attributes = ""
+            if row in row_dimensions:
+                attributes = "".join(
+                    f' {name}="{value}"' for name, value in row_dimensions[row]
+                )
+            chunk.append(f'<row r="{row}"{attributes}>')
+            for cell in rows.get(row, ()):
+                chunk.append(self._cell_xml(cell))
+            chunk.append("</row>")
+            if index % ROWS_PER_CHUNK == 0:
+                self.out.write("".join(chunk).encode())
+                chunk = []
+        chunk.append("</sheetData>")
+        self.out.write("".join(chunk).encode())
+
+    def write_merged_cells(self):
+        # The plan sheets merge thousands of ranges; skip building a
+        # MergeCell object for each.
+        merged = self.ws.merged_cells.ranges
+        if merged:
+            refs = "".join(f'<mergeCell ref="{ref.coord}"/>' for ref in merged)
+            self.out.write(
+                f'<mergeCells count="{len(merged)}">{refs}</mergeCells>'.encode()
+            )
+
+    def _cell_xml(self, cell):
+        attributes = f'r="{get_column_letter(cell.column)}{cell.row}"'
+        if cell.has_style:
+            attributes += f' s="{self._style_id(cell)}"'
+
+        value = cell.value
+        kind = type(value)
+        if value is None or value == "":
+            return f"<c {attributes}/>"
+        if kind is str:
+            if (
+                len(value) > MAX_STRING_LENGTH
+                or value in ERROR_CODES
+                or ILLEGAL_CHARACTERS_RE.search(value)
+            ):
+                return self._openpyxl_cell_xml(cell)
+            if len(value) > 1 and value[0] == "=":
+                return f"<c {attributes}><f>{escape(value[1:])}</f></c>"
+            space = ' xml:space="preserve"' if value != value.strip() else ""
+            return (
+                f'<c {attributes} t="inlineStr"><is><t{space}>{escape(value)}</t>'
+                "</is></c>"
+            )
+        if kind is int or (kind is float and math.isfinite(value)):
+            # repr is the shortest text that reads back as the same number.
+            return f"<c {attributes}><v>{value!r}</v></c>"
+        # Dates, booleans, numpy scalars and the like are rare; let openpyxl
+        # convert them.
+        return self._openpyxl_cell_xml(cell)
+
+    def _style_id(self, cell):
+        key = cell.style_key()
+        style_id = self.style_ids.get(key)
+        if style_id is None:
+            openpyxl_cell = cell.to_write_only_cell(self.ws, self.stamp)
+            style_id = self.style_ids[key] = openpyxl_cell.style_id
+        return style_id
+
+    def _openpyxl_cell_xml(self, cell):
+        openpyxl_cell = cell.to_write_only_cell(self.ws, self.stamp)
+        openpyxl_cell.row = cell.row
+        openpyxl_cell.column = cell.column
+        elements = []
+        etree_write_cell(
+            SimpleNamespace(write=elements.append),
+            self.ws,
+            openpyxl_cell,
+            openpyxl_cell.has_style,
+        )
+        return tostring(elements[0]).decode()
+
+
+class PlanExcelWriter(ExcelWriter):
+    """An ExcelWriter that writes each worksheet with a SheetXmlWriter."""
+
+    def __init__(self, workbook, archive, plans):
+        super().__init__(workbook, archive)
+        # sheet title -> SheetPlan
+        self._plans = {plan.title: plan for plan in plans}
+        self._style_ids = {}
+        self._stamp = StyleStamp()
+
+    def write_worksheet(self, ws):
+        ws._drawing = SpreadsheetDrawing()
+        ws._drawing.charts = ws._charts
+        ws._drawing.images = ws._images
+        with self._archive.open(ws.path[1:], "w") as out:
+            writer = SheetXmlWriter(
+                ws, self._plans[ws.title], out, self._style_ids, self._stamp
+            )
+            writer.write()
+        ws._rels = writer._rels
+        self.manifest.append(ws)
+
+
+class XmlPlanWorkbook(PlanWorkbook):
+    """A PlanWorkbook that saves through PlanExcelWriter."""
+
+    def save(self, filename, compression="deflate"):
+        save_workbook(
+            self.to_openpyxl(cells=False),
+            filename,
+            compression,
+            writer=partial(PlanExcelWriter, plans=self._sheets),
+        )
+        logger.info("Wrote %d sheets as XML to %s", len(self._sheets), filename)
@@ -0,0 +1,303 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from colorful_training_template.build_cache import BUILD_CACHE_DIR, source_digest
+from colorful_training_template.calculator import (
+    calculate_program,
+    canonical_exercise_name,
+)
+from colorful_training_template.model import Program, ProgramError, Week
+from colorful_training_template.rep_table import DEFAULT_REP_TABLE_DIR
+
+WEEK_CACHE_DIR = BUILD_CACHE_DIR / "weeks"
+# Once cached weeks take up more than this, the least recently used are
+# evicted.
+DEFAULT_MAX_WEEK_CACHE_BYTES = 64 * 1024 * 1024
+
+
+@dataclass(slots=True)
+class WeekArtifacts:
+    """Everything derived from one calculated week that later stages use."""
+
+    week: Week
+    # (stress_index, volume, intensity), as returned by get_week_metrics
+    metrics: tuple[float, float, float]
+    # companion_views.week_summaries() of the calculated week
+    summaries: list[list[tuple[str, str, str]]]
+
+    def to_data(self) -> dict[str, Any]:
+        """Plain JSON-serialisable data; see from_data."""
+        return {
+            "week": self.week.to_dict(),
+            # Not part of the week's YAML form, so kept alongside it.
+            "weight_kg": [
+                set_data.weight_kg
+                for day in self.week.days
+                for exercise in day.exercises
+                for set_data in exercise.sets
+            ],
+            "metrics": list(self.metrics),
+            "summaries": self.summaries,
+        }
+
+    @classmethod
+    def from_data(cls, data: dict[str, Any]) -> WeekArtifacts:
+        week = Week.from_data(data["week"])
+        sets = [
+            set_data
+            for day in week.days
+            for exercise in day.exercises
+            for set_data in exercise.sets
+        ]
+        if len(sets) != len(data["weight_kg"]):
+            raise ValueError("weight_kg does not match the week's sets")
+        for set_data, weight_kg in zip(sets, data["weight_kg"]):
+            set_data.weight_kg = weight_kg
+        return cls(
+            week=week,
+            metrics=tuple(data["metrics"]),
+            summaries=[[tuple(row) for row in day] for day in data["summaries"]],
+        )
+
+
+def _round_trips_json(value: Any) -> bool:
+    """
+    Whether json.loads(json.dumps(value)) == value with the same types.
+    JSON turns int, bool and None mapping keys into strings and tuples into
+    lists, and cannot hold dates at all.
+    """
+    if isinstance(value, dict):
+        return all(
+            isinstance(key, str) and _round_trips_json(item)
+            for key, item in value.items()
+        )
+    if isinstance(value, list):
+        return all(_round_trips_json(item) for item in value)
+    return value is None or isinstance(value, (str, int, float))
+
+
+def _week_uses_rep_table(week: Week, settings: dict[str, Any]) -> bool:
+    if settings.get("calculation_mode") == "rep_table":
+        return True
+    return any(
+        exercise.calculation_mode == "rep_table"
+        or any(set_data.calculation_mode == "rep_table" for set_data in exercise.sets)
+        for day in week.days
+        for exercise in day.exercises
+    )
+
+
+def _rep_table_digest(rep_table_dir: str | Path) -> str:
+    digest = hashlib.sha256()
+    rep_table_dir = Path(rep_table_dir)
+    if rep_table_dir.is_dir():
+        for path in sorted(rep_table_dir.glob("*.xlsx")):
+            digest.update(path.name.encode())
+            digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+def week_fingerprint(
+    week: Week,
+    training_maxes: dict[str, float],
+    settings: dict[str, Any],
+    rep_table_digest: str | None = None,
+) -> str:
+    """
+    Hash a week's program subtree together with the inputs its calculation
+    reads: the training max and rounding increment of each exercise in the
+    week, the global calculation mode and, if the week can use rep_table
+    mode, the rep tables.
+    """
+    rounding_cfg = settings.get("rounding", {"default": 2.5})
+    names = sorted(
+        {
+            canonical_exercise_name(exercise.name)
+            for day in week.days
+            for exercise in day.exercises
+        }
+    )
+    if isinstance(rounding_cfg, dict):
+        default_increment = rounding_cfg.get("default", 2.5)
+        rounding = {name: rounding_cfg.get(name, default_increment) for name in names}
+    else:
+        rounding = rounding_cfg
+
+    context = {
+        "source": source_digest(),
+        "calculation_mode": settings.get("calculation_mode", "training_max"),
+        "training_maxes": {name: training_maxes.get(name) for name in names},
+        "rounding": rounding,
+    }
+    if _week_uses_rep_table(week, settings):
+        context["rep_table_dir"] = str(
+            settings.get("rep_table_dir", DEFAULT_REP_TABLE_DIR)
+        )
+        context["rep_tables"] = rep_table_digest
+
+    digest = hashlib.sha256()
+    digest.update(json.dumps(context, sort_keys=True, default=repr).encode())
+    # Key order is part of the week: it decides the order of calculated keys.
+    digest.update(json.dumps(week.to_dict(), default=repr).encode())
+    return digest.hexdigest()
+
+
+class IncrementalBuild:
+    """
+    Week-granular reuse of calculated output between builds.
+
+    Each week's calculated form, chart metrics and companion-view summaries
+    are stored as JSON under cache_dir by the week's fingerprint. A later
+    build recalculates only the weeks whose fingerprint is not in the
+    cache. The weeks of the last calculated program are also kept in
+    memory, so a long-lived instance (see watch mode) does not go back to
+    disk for them.
+
+    Cached weeks are kept to max_bytes in total: after a build that stored
+    new weeks, the least recently used are evicted until the rest fit.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str | Path = WEEK_CACHE_DIR,
+        max_bytes: int = DEFAULT_MAX_WEEK_CACHE_BYTES,
+    ):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.reused = 0
+        self.recalculated = 0
+        self._memory: dict[str, WeekArtifacts] = {}
+
+    def _path(self, fingerprint: str) -> Path:
+        return self.cache_dir / f"{fingerprint}.json"
+
+    def _load(self, fingerprint: str) -> WeekArtifacts | None:
+        cached = self._memory.get(fingerprint)
+        if cached is not None:
+            return cached
+        path = self._path(fingerprint)
+        try:
+            with path.open("rb") as f:
+                artifacts = WeekArtifacts.from_data(json.load(f))
+            # Mark the week as recently used for eviction.
+            os.utime(path)
+        except (OSError, ValueError, TypeError, KeyError, ProgramError):
+            return None
+        return artifacts
+
+    def _store(self, fingerprint: str, artifacts: WeekArtifacts) -> None:
+        data = artifacts.to_data()
+        if not _round_trips_json(data["week"]):
+            # The YAML gave the week e.g. a date or a non-string key, which
+            # would come back from JSON changed; it is simply recalculated
+            # next time.
+            return
+        data = json.dumps(data, separators=(",", ":"))
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        path = self._path(fingerprint)
+        staging = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        staging.write_text(data, encoding="utf-8")
+        os.replace(staging, path)
+
+    def prune(self) -> list[Path]:
+        """
+        Evict the least recently used weeks until the rest take up at most
+        max_bytes, and remove cache files in older formats. Returns the
+        removed paths.
+        """
+        try:
+            children = list(self.cache_dir.iterdir())
+        except FileNotFoundError:
+            return []
+
+        removed = []
+        weeks = []
+        for path in children:
+            try:
+                if path.suffix == ".pickle":
+                    path.unlink()
+                    removed.append(path)
+                elif path.suffix == ".json":
+                    stat = path.stat()
+                    weeks.append((stat.st_mtime, stat.st_size, path))
+            except FileNotFoundError:
+                continue
+        weeks.sort(reverse=True)
+
+        total = 0
+        for _, size, path in weeks:
+            if total + size <= self.max_bytes:
+                total += size
+                continue
+            path.unlink(missing_ok=True)
+            removed.append(path)
+        return removed
+
+    def calculate(
+        self,
+        program: Program,
+        training_maxes: dict[str, float],
+        settings: dict[str, Any],
+    ) -> tuple[Program, list[WeekArtifacts]]:
+        """
+        Calculate program like calculator.calculate_program, reusing cached
+        weeks. Returns the calculated program and every week's artifacts.
+        """
+        from colorful_training_template.excel_generator.charts import get_week_metrics
+        from colorful_training_template.excel_generator.companion_views import (
+            week_summaries,
+        )
+
+        rep_table_digest = None
+        if any(_week_uses_rep_table(week, settings) for week in program.weeks):
+            rep_table_digest = _rep_table_digest(
+                settings.get("rep_table_dir", DEFAULT_REP_TABLE_DIR)
+            )
+
+        fingerprints = [
+            week_fingerprint(week, training_maxes, settings, rep_table_digest)
+            for week in program.weeks
+        ]
+        artifacts: list[WeekArtifacts | None] = [
+            self._load(fingerprint) for fingerprint in fingerprints
+        ]
+
+        changed = [index for index, cached in enumerate(artifacts) if cached is None]
+        if changed:
+            calculated = calculate_program(
+                program=Program(weeks=[program.weeks[index] for index in changed]),
+                training_maxes=training_maxes,
+                settings=settings,
+            )
+            for index, week in zip(changed, calculated.weeks):
+                week_artifacts = WeekArtifacts(
+                    week=week,
+                    metrics=get_week_metrics(week),
+                    summaries=week_summaries(week),
+                )
+                self._store(fingerprints[index], week_artifacts)
+                artifacts[index] = week_artifacts
+            self.prune()
+
+        self._memory = dict(zip(fingerprints, artifacts))
+        self.recalculated = len(changed)
+        self.reused = len(artifacts) - len(changed)
+        return Program(weeks=[item.week for item in artifacts]), artifacts
+
+
+def chart_metrics(
+    artifacts: list[WeekArtifacts],
+) -> tuple[list[int], list[float], list[float], list[float]]:
+    """Per-week artifacts in the shape returned by charts.get_chart_data."""
+    return (
+        list(range(1, len(artifacts) + 1)),
+        [item.metrics[0] for item in artifacts],
+        [item.metrics[1] for item in artifacts],
+        [item.metrics[2] for item in artifacts],
+    )
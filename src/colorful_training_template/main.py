@@ -1,45 +1,124 @@
+from typing import Any
+
+from colorful_training_template.build_cache import BuildCache, build_cache_key
 from colorful_training_template.config import (
+    input_paths,
     load_program,
     load_settings,
     load_training_maxes,
 )
 from colorful_training_template.calculator import calculate_program
+from colorful_training_template.incremental import IncrementalBuild, chart_metrics
+from colorful_training_template.model import Program
+from colorful_training_template.rep_table import DEFAULT_REP_TABLE_DIR
 from colorful_training_template.renderer import (
+    draft_settings,
     render_workbook,
     write_yaml_output,
 )
+from colorful_training_template.timing import stage
 
 
-def build() -> int:
+def build(use_cache: bool = True, draft: bool = False) -> int:
     """
     Main build path:
     1. Load inputs
     2. Calculate weights from training maxes and percentages
     3. Write calculated YAML
     4. Render workbook
+
+    With use_cache, a build whose inputs are unchanged since an earlier
+    build restores that build's outputs from the build cache instead, and
+    otherwise only the weeks that changed are recalculated.
+
+    A draft build renders a quick, uncompressed workbook without charts
+    or companion views (see renderer.render_workbook's render.draft).
     """
-    training_maxes = load_training_maxes()
-    settings = load_settings()
-    program = load_program()
+    with stage("load settings"):
+        settings = load_settings()
+        if draft:
+            settings = draft_settings(settings)
+    outputs = [settings["output_yaml"], settings["output_workbook"]]
 
-    calculated_program = calculate_program(
-        program=program,
-        training_maxes=training_maxes,
-        settings=settings,
-    )
+    cache_key = None
+    if use_cache:
+        with stage("cache lookup"):
+            cache_key = build_cache_key(
+                input_paths(),
+                rep_table_dir=settings.get("rep_table_dir", DEFAULT_REP_TABLE_DIR),
+                # A draft and a full build of the same inputs differ.
+                extra={"draft": "1"} if draft else None,
+            )
+            restored = BuildCache().restore(cache_key, outputs)
+        if restored:
+            print("Workout plan is up to date (restored from the build cache):")
+            for output in outputs:
+                print(f"- {output}")
+            return 0
 
-    output_yaml = settings["output_yaml"]
-    output_workbook = settings["output_workbook"]
+    with stage("load inputs"):
+        training_maxes = load_training_maxes()
+        program = load_program()
 
-    write_yaml_output(calculated_program, output_yaml)
-    render_workbook(calculated_program, settings)
+    incremental = IncrementalBuild() if use_cache else None
+    build_plan(program, training_maxes, settings, incremental)
+    if incremental is not None and incremental.reused:
+        print(
+            f"Reused {incremental.reused} unchanged weeks, "
+            f"recalculated {incremental.recalculated}."
+        )
+    if cache_key is not None:
+        with stage("cache store"):
+            BuildCache().store(cache_key, outputs)
 
     print("Built workout plan successfully:")
-    print(f"- {output_yaml}")
-    print(f"- {output_workbook}")
+    for output in outputs:
+        print(f"- {output}")
     return 0
 
 
+def build_plan(
+    program: Program,
+    training_maxes: dict[str, float],
+    settings: dict[str, Any],
+    incremental: IncrementalBuild | None = None,
+) -> Program:
+    """
+    Calculate one plan from already loaded inputs and write its YAML and
+    workbook outputs. Returns the calculated program.
+
+    With an IncrementalBuild, only weeks that changed since an earlier
+    build are recalculated; the rest, with their chart metrics and
+    companion-view rows, come from its week cache.
+    """
+    with stage("calculate"):
+        if incremental is None:
+            calculated_program = calculate_program(
+                program=program,
+                training_maxes=training_maxes,
+                settings=settings,
+            )
+            metrics = summaries = None
+        else:
+            calculated_program, artifacts = incremental.calculate(
+                program, training_maxes, settings
+            )
+            metrics = chart_metrics(artifacts)
+            summaries = [item.summaries for item in artifacts]
+
+    with stage("write yaml"):
+        write_yaml_output(calculated_program.to_data(), settings["output_yaml"])
+
+    with stage("render"):
+        render_workbook(
+            calculated_program,
+            settings,
+            chart_metrics=metrics,
+            week_summaries=summaries,
+        )
+    return calculated_program
+
+
 def main() -> int:
     return build()
 
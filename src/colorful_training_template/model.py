@@ -0,0 +1,184 @@
+from __future__ import annotations
+
+from copy import deepcopy
+from dataclasses import dataclass, field
+from typing import Any
+
+
+class ProgramError(Exception):
+    """Raised when program data does not have the expected structure."""
+
+
+@dataclass(slots=True)
+class SetPrescription:
+    """
+    One set line from program.yaml.
+
+    `source` is the mapping the set was parsed from. It is kept so to_dict()
+    reproduces the original keys and key order, and expanded sets share it
+    rather than copying it. `computed` holds extra calculated fields that
+    are written after the source keys, e.g. rep-table lookup details.
+    `weight_kg` is the numeric form of a calculated weight and is not
+    written to YAML.
+    """
+
+    reps: Any
+    percentage_1rm: Any = None
+    weight: Any = None
+    weight_kg: float | None = None
+    notes: Any = None
+    calculation_mode: str | None = None
+    computed: dict[str, Any] = field(default_factory=dict)
+    source: dict[str, Any] = field(default_factory=dict, repr=False)
+
+    @classmethod
+    def from_data(cls, data: Any) -> SetPrescription:
+        if not isinstance(data, dict):
+            raise ProgramError(f"Each set must be a mapping, got: {data!r}")
+
+        if "reps" not in data:
+            raise ProgramError(f"Missing 'reps' in set: {data!r}")
+
+        return cls(
+            reps=data["reps"],
+            percentage_1rm=data.get("percentage_1rm"),
+            weight=data.get("weight"),
+            notes=data.get("notes"),
+            calculation_mode=data.get("calculation_mode"),
+            source=data,
+        )
+
+    @property
+    def has_percentage(self) -> bool:
+        return "percentage_1rm" in self.source
+
+    def with_reps(self, reps: int) -> SetPrescription:
+        """Return a copy of this set with a different reps value."""
+        return SetPrescription(
+            reps=reps,
+            percentage_1rm=self.percentage_1rm,
+            weight=self.weight,
+            weight_kg=self.weight_kg,
+            notes=self.notes,
+            calculation_mode=self.calculation_mode,
+            source=self.source,
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        data = dict(self.source)
+        for key, value in data.items():
+            # Copy nested containers so sets expanded from the same source
+            # never alias each other in the YAML output.
+            if isinstance(value, (dict, list)):
+                data[key] = deepcopy(value)
+
+        data["reps"] = self.reps
+        if "percentage_1rm" in data:
+            data["percentage_1rm"] = self.percentage_1rm
+        if self.weight is not None or "weight" in data:
+            data["weight"] = self.weight
+        data.update(self.computed)
+        return data
+
+
+@dataclass(slots=True)
+class Exercise:
+    name: str
+    sets: list[SetPrescription] = field(default_factory=list)
+    calculation_mode: str | None = None
+    source: dict[str, Any] = field(default_factory=dict, repr=False)
+
+    @classmethod
+    def from_data(cls, data: Any) -> Exercise:
+        if not isinstance(data, dict):
+            raise ProgramError(f"Each exercise must be a mapping, got: {data!r}")
+
+        name = data.get("name")
+        if not isinstance(name, str) or not name.strip():
+            raise ProgramError(f"Exercise must have a valid name: {data!r}")
+
+        raw_sets = data.get("sets", [])
+        if not isinstance(raw_sets, list):
+            raise ProgramError(f"Exercise '{name}' has invalid 'sets': {raw_sets!r}")
+
+        return cls(
+            name=name,
+            sets=[SetPrescription.from_data(set_data) for set_data in raw_sets],
+            calculation_mode=data.get("calculation_mode"),
+            source=data,
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        data = dict(self.source)
+        data["sets"] = [set_data.to_dict() for set_data in self.sets]
+        return data
+
+
+@dataclass(slots=True)
+class Day:
+    weekday: str | None = None
+    session: str | None = None
+    exercises: list[Exercise] = field(default_factory=list)
+    source: dict[str, Any] = field(default_factory=dict, repr=False)
+
+    @classmethod
+    def from_data(cls, data: Any) -> Day:
+        if not isinstance(data, dict):
+            raise ProgramError(f"Each training day must be a mapping, got: {data!r}")
+
+        exercises = data.get("exercises", [])
+        if not isinstance(exercises, list):
+            raise ProgramError("Day 'exercises' must be a list")
+
+        return cls(
+            weekday=data.get("weekday"),
+            session=data.get("session"),
+            exercises=[Exercise.from_data(exercise) for exercise in exercises],
+            source=data,
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        data = dict(self.source)
+        if "exercises" in data:
+            data["exercises"] = [exercise.to_dict() for exercise in self.exercises]
+        return data
+
+
+@dataclass(slots=True)
+class Week:
+    key: str
+    days: list[Day] = field(default_factory=list)
+
+    @classmethod
+    def from_data(cls, data: Any) -> Week:
+        if not isinstance(data, dict):
+            raise ProgramError("Each week entry must be a mapping")
+
+        if len(data) != 1:
+            raise ProgramError(
+                f"Each week entry must have exactly one key like 'week_1', got {list(data)!r}"
+            )
+
+        key, days = next(iter(data.items()))
+        if not isinstance(days, list):
+            raise ProgramError("Each week value must be a list of training days")
+
+        return cls(key=key, days=[Day.from_data(day) for day in days])
+
+    def to_dict(self) -> dict[str, Any]:
+        return {self.key: [day.to_dict() for day in self.days]}
+
+
+@dataclass(slots=True)
+class Program:
+    weeks: list[Week] = field(default_factory=list)
+
+    @classmethod
+    def from_data(cls, data: Any) -> Program:
+        if not isinstance(data, list):
+            raise ProgramError("Program must be a list of week objects")
+
+        return cls(weeks=[Week.from_data(week) for week in data])
+
+    def to_data(self) -> list[dict[str, Any]]:
+        return [week.to_dict() for week in self.weeks]
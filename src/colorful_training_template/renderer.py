@@ -5,16 +5,10 @@ from pathlib import Path
 from typing import Any
 import random
 
-import yaml
-
-from colorful_training_template.excel_generator.charts import add_charts_to_workbook
-from colorful_training_template.excel_generator.companion_views import (
-    add_companion_views_to_workbook,
-)
-from colorful_training_template.excel_generator.workout_template_generator import (
-    WorkoutTemplateGenerator,
-)
+from colorful_training_template.model import Program
+from colorful_training_template.timing import stage
 from colorful_training_template.utils.color_utils import generate_random_gradient
+from colorful_training_template.yaml_io import safe_dump
 
 
 class RenderError(Exception):
@@ -26,7 +20,7 @@ def write_yaml_output(data: list[dict[str, Any]], output_path: str | Path) -> No
     output_path.parent.mkdir(parents=True, exist_ok=True)
 
     with output_path.open("w", encoding="utf-8") as f:
-        yaml.safe_dump(
+        safe_dump(
             data,
             f,
             sort_keys=False,
@@ -35,9 +29,16 @@ def write_yaml_output(data: list[dict[str, Any]], output_path: str | Path) -> No
         )
 
 
+def draft_settings(settings: dict[str, Any]) -> dict[str, Any]:
+    """A copy of settings with render.draft turned on."""
+    return {**settings, "render": {**(settings.get("render") or {}), "draft": True}}
+
+
 def render_workbook(
-    calculated_program: list[dict[str, Any]],
+    calculated_program: Program,
     settings: dict[str, Any],
+    chart_metrics: tuple[list, list, list, list] | None = None,
+    week_summaries: list | None = None,
 ) -> None:
     """
     Render the Excel workbook from calculated program data.
@@ -45,18 +46,60 @@ def render_workbook(
     Expected settings keys:
     - start_date
     - output_workbook
-    - output_yaml
+
+    Optional settings:
+    - render.backend: "openpyxl" (default), "write_only" or "xml" (the
+      draft default)
+    - render.box_size: "fixed" (default, 7 sets x 8 exercises), "global" or
+      "per_week" to size week boxes to the program (see box_layout)
+    - render.compact_rest_days: draw days without training one row high
+    - render.week_layout: "horizontal" (default), "vertical", "grid" with
+      render.weeks_per_row (default 4) weeks to a row, or "per_block" with
+      render.weeks_per_sheet (default 4) weeks to a sheet
+    - render.merge_mode: "merge" (default) merges the week, set and
+      exercise label cells; "center_across" draws them unmerged with
+      centre-across-selection alignment, which sorts, filters and
+      copy-pastes cleanly
+    - render.draft: skip the charts, the companion views and column
+      auto-width, and save uncompressed with the xml backend, for quick
+      rebuilds while editing
+    - render.compression: zip compression of the saved workbook,
+      "deflate" (default), "fast" or "stored" (the draft default)
+    - companion_views: "formulas" (default) for interactive Week View and
+      Today sheets, or "static" to write every week out as values in Week
+      View alone
+
+    chart_metrics and week_summaries may carry per-week results already
+    computed for this program (see incremental.IncrementalBuild); they are
+    computed here otherwise.
     """
+    # openpyxl and the excel_generator package are only imported once a
+    # workbook is actually rendered.
+    from colorful_training_template.excel_generator.box_layout import (
+        BOX_SIZE_MODES,
+        WEEK_LAYOUTS,
+    )
+    from colorful_training_template.excel_generator.charts import (
+        add_charts_to_workbook,
+    )
+    from colorful_training_template.excel_generator.companion_views import (
+        COMPANION_VIEW_MODES,
+        add_companion_views_to_workbook,
+    )
+    from colorful_training_template.excel_generator.label_creator import MERGE_MODES
+    from colorful_training_template.excel_generator.package import COMPRESSION_MODES
+    from colorful_training_template.excel_generator.workout_template_generator import (
+        RENDER_BACKENDS,
+        WorkoutTemplateGenerator,
+    )
+
     start_date_raw = settings.get("start_date")
     output_workbook = settings.get("output_workbook")
-    output_yaml = settings.get("output_yaml")
 
     if not start_date_raw:
         raise RenderError("settings is missing 'start_date'")
     if not output_workbook:
         raise RenderError("settings is missing 'output_workbook'")
-    if not output_yaml:
-        raise RenderError("settings is missing 'output_yaml'")
 
     try:
         start_date = datetime.strptime(str(start_date_raw), "%Y-%m-%d")
@@ -65,10 +108,58 @@ def render_workbook(
             f"start_date must be in YYYY-MM-DD format, got {start_date_raw!r}"
         ) from exc
 
+    render_cfg = settings.get("render") or {}
+    draft = bool(render_cfg.get("draft", False))
+    backend = render_cfg.get("backend", "xml" if draft else "openpyxl")
+    if backend not in RENDER_BACKENDS:
+        raise RenderError(
+            f"render.backend must be one of {RENDER_BACKENDS}, got {backend!r}"
+        )
+
+    box_size = render_cfg.get("box_size", "fixed")
+    if box_size not in BOX_SIZE_MODES:
+        raise RenderError(
+            f"render.box_size must be one of {BOX_SIZE_MODES}, got {box_size!r}"
+        )
+
+    week_layout = render_cfg.get("week_layout", "horizontal")
+    if week_layout not in WEEK_LAYOUTS:
+        raise RenderError(
+            f"render.week_layout must be one of {WEEK_LAYOUTS}, got {week_layout!r}"
+        )
+    weeks_per_row = render_cfg.get("weeks_per_row", 4)
+    weeks_per_sheet = render_cfg.get("weeks_per_sheet", 4)
+    for key, value in (
+        ("weeks_per_row", weeks_per_row),
+        ("weeks_per_sheet", weeks_per_sheet),
+    ):
+        if isinstance(value, bool) or not isinstance(value, int) or value < 1:
+            raise RenderError(f"render.{key} must be a positive integer, got {value!r}")
+
+    merge_mode = render_cfg.get("merge_mode", "merge")
+    if merge_mode not in MERGE_MODES:
+        raise RenderError(
+            f"render.merge_mode must be one of {MERGE_MODES}, got {merge_mode!r}"
+        )
+
+    compression = render_cfg.get("compression", "stored" if draft else "deflate")
+    if compression not in COMPRESSION_MODES:
+        raise RenderError(
+            f"render.compression must be one of {COMPRESSION_MODES}, "
+            f"got {compression!r}"
+        )
+
+    companion_mode = settings.get("companion_views", "formulas")
+    if companion_mode not in COMPANION_VIEW_MODES:
+        raise RenderError(
+            f"companion_views must be one of {COMPANION_VIEW_MODES}, "
+            f"got {companion_mode!r}"
+        )
+
     output_workbook = Path(output_workbook)
     output_workbook.parent.mkdir(parents=True, exist_ok=True)
 
-    generator = WorkoutTemplateGenerator(str(output_workbook), start_date)
+    generator = WorkoutTemplateGenerator(str(output_workbook), start_date, backend)
 
     base_color = (random.randint(180, 240), 0.5, 0.7)
     gradient_colors = generate_random_gradient(
@@ -77,36 +168,55 @@ def render_workbook(
         num_colors=6,
     )
 
-    generator.create_consecutive_boxes(
-        start_row=2,
-        start_col=2,
-        num_boxes=len(calculated_program),
-        num_sets=7,
-        num_exercises=8,
-        space_between=3,
-        set_width=4,
-        headers=["Reps", "Weights", "%1RM", "Notes"],
-        workout_data=calculated_program,
-        fill_color=gradient_colors[0],
-        week_fill_color=gradient_colors[1],
-        set_fill_color=gradient_colors[2],
-        day_fill_color=gradient_colors[3],
-        exercise_fill_color=gradient_colors[4],
-        grid_fill_color=gradient_colors[5],
-    )
-
-    try:
-        add_charts_to_workbook(generator.workbook, yaml_path=output_yaml)
-    except Exception as exc:
-        raise RenderError(f"Failed to add charts: {exc}") from exc
-
-    try:
-        add_companion_views_to_workbook(
-            generator.workbook,
-            calculated_program=calculated_program,
-            start_date=start_date,
+    with stage("boxes"):
+        generator.create_consecutive_boxes(
+            start_row=2,
+            start_col=2,
+            num_boxes=len(calculated_program.weeks),
+            num_sets=7,
+            num_exercises=8,
+            space_between=3,
+            set_width=4,
+            headers=["Reps", "Weights", "%1RM", "Notes"],
+            workout_data=calculated_program,
+            fill_color=gradient_colors[0],
+            week_fill_color=gradient_colors[1],
+            set_fill_color=gradient_colors[2],
+            day_fill_color=gradient_colors[3],
+            exercise_fill_color=gradient_colors[4],
+            grid_fill_color=gradient_colors[5],
+            box_size=box_size,
+            compact_rest_days=bool(render_cfg.get("compact_rest_days", False)),
+            week_layout=week_layout,
+            weeks_per_row=weeks_per_row,
+            weeks_per_sheet=weeks_per_sheet,
+            merge_mode=merge_mode,
+            auto_width=not draft,
         )
-    except Exception as exc:
-        raise RenderError(f"Failed to add week/today views: {exc}") from exc
 
-    generator.save_workbook()
+    # Draft renders leave out everything that is not the plan itself.
+    if not draft:
+        try:
+            with stage("charts"):
+                add_charts_to_workbook(
+                    generator.workbook,
+                    calculated_program=calculated_program,
+                    metrics=chart_metrics,
+                )
+        except Exception as exc:
+            raise RenderError(f"Failed to add charts: {exc}") from exc
+
+        try:
+            with stage("companion views"):
+                add_companion_views_to_workbook(
+                    generator.workbook,
+                    calculated_program=calculated_program,
+                    start_date=start_date,
+                    summaries=week_summaries,
+                    mode=companion_mode,
+                )
+        except Exception as exc:
+            raise RenderError(f"Failed to add week/today views: {exc}") from exc
+
+    with stage("save"):
+        generator.save_workbook(compression)
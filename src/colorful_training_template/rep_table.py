@@ -1,8 +1,12 @@
 from __future__ import annotations
 
 from pathlib import Path
+from typing import TYPE_CHECKING
 
-import pandas as pd
+import numpy as np
+
+if TYPE_CHECKING:
+    import pandas as pd
 
 
 class RepTableError(Exception):
@@ -17,6 +21,12 @@ REP_TABLE_FILES = {
     "Close Grip Bench Press": "one_rep_max_data_cgbp_90kg.xlsx",
 }
 
+DEFAULT_REP_TABLE_DIR = "reference/rep_max_tables"
+
+# Compiled tables live next to their source xlsx with this suffix.
+COMPILED_SUFFIX = ".npz"
+COMPILED_FORMAT_VERSION = 1
+
 
 def get_rep_table_path(exercise_name: str, rep_table_dir: str | Path) -> Path:
     if exercise_name not in REP_TABLE_FILES:
@@ -24,7 +34,13 @@ def get_rep_table_path(exercise_name: str, rep_table_dir: str | Path) -> Path:
     return Path(rep_table_dir) / REP_TABLE_FILES[exercise_name]
 
 
+def get_compiled_table_path(exercise_name: str, rep_table_dir: str | Path) -> Path:
+    return get_rep_table_path(exercise_name, rep_table_dir).with_suffix(COMPILED_SUFFIX)
+
+
 def _parse_kg(value) -> float:
+    import pandas as pd
+
     if pd.isna(value):
         raise RepTableError("Encountered empty value in rep table")
 
@@ -36,11 +52,32 @@ def _parse_kg(value) -> float:
 
 
 def load_rep_table_matrix(exercise_name: str, rep_table_dir: str | Path) -> pd.DataFrame:
+    """
+    Load a rep table as a DataFrame with a 'base_weight' column and one
+    integer column per rep count. A compiled table is preferred when it is
+    at least as new as its source xlsx.
+    """
+    import pandas as pd
+
     path = get_rep_table_path(exercise_name, rep_table_dir)
 
     if not path.exists():
         raise RepTableError(f"Rep table file not found: {path}")
 
+    compiled_path = path.with_suffix(COMPILED_SUFFIX)
+    if _is_compiled_fresh(path, compiled_path):
+        table = load_compiled_rep_table(exercise_name, compiled_path)
+        data = {"base_weight": table.base_weights}
+        for rep in table.reps:
+            data[rep] = table.column(rep)
+        return pd.DataFrame(data)
+
+    return _read_rep_table_xlsx(path)
+
+
+def _read_rep_table_xlsx(path: Path) -> pd.DataFrame:
+    import pandas as pd
+
     df = pd.read_excel(path, sheet_name=0)
 
     if df.empty or len(df) < 2:
@@ -77,9 +114,224 @@ def load_rep_table_matrix(exercise_name: str, rep_table_dir: str | Path) -> pd.D
     return data_rows
 
 
+class RepTable:
+    """
+    In-memory rep table compiled for fast nearest-e1RM lookups.
+
+    Each rep column is stored sorted alongside the argsort order that maps it
+    back onto base_weights, so a lookup is a binary search instead of a scan.
+    """
+
+    __slots__ = ("exercise_name", "base_weights", "reps", "_columns")
+
+    def __init__(
+        self,
+        exercise_name: str,
+        base_weights: np.ndarray,
+        columns: dict[int, np.ndarray],
+    ) -> None:
+        self.exercise_name = exercise_name
+        self.base_weights = np.asarray(base_weights, dtype=np.float64)
+        self.reps = sorted(columns)
+        self._columns: dict[int, tuple[np.ndarray, np.ndarray]] = {}
+
+        for rep in self.reps:
+            values = np.asarray(columns[rep], dtype=np.float64)
+            order = np.argsort(values, kind="stable")
+            self._columns[rep] = (values[order], order)
+
+    @classmethod
+    def from_frame(cls, exercise_name: str, df: pd.DataFrame) -> RepTable:
+        columns = {
+            col: df[col].to_numpy(dtype=np.float64)
+            for col in df.columns
+            if isinstance(col, int)
+        }
+        return cls(exercise_name, df["base_weight"].to_numpy(dtype=np.float64), columns)
+
+    def column(self, reps: int) -> np.ndarray:
+        """Return a rep column in base_weights row order."""
+        self.require_reps(reps)
+        values, order = self._columns[reps]
+        column = np.empty_like(values)
+        column[order] = values
+        return column
+
+    def require_reps(self, reps: int) -> None:
+        if reps not in self._columns:
+            raise RepTableError(
+                f"Reps={reps} not supported in rep table for '{self.exercise_name}'. "
+                f"Supported reps: {self.reps}"
+            )
+
+    def nearest_base_weights(self, reps: int, targets) -> np.ndarray:
+        """
+        Return the base weight whose estimated 1RM is closest to each target.
+
+        Ties resolve to the earliest row, matching a linear idxmin scan.
+        """
+        self.require_reps(reps)
+        values, order = self._columns[reps]
+        targets = np.asarray(targets, dtype=np.float64)
+
+        pos = np.searchsorted(values, targets, side="left")
+        right = np.minimum(pos, len(values) - 1)
+        left = np.maximum(pos - 1, 0)
+        # Step back to the first row of a run of equal values so ties keep
+        # the lowest original row index.
+        left = np.searchsorted(values, values[left], side="left")
+
+        left_dist = np.abs(values[left] - targets)
+        right_dist = np.abs(values[right] - targets)
+        pick_right = (right_dist < left_dist) | (
+            (right_dist == left_dist) & (order[right] < order[left])
+        )
+        rows = np.where(pick_right, order[right], order[left])
+        return self.base_weights[rows]
+
+    def nearest_base_weight(self, reps: int, target: float) -> float:
+        return float(self.nearest_base_weights(reps, [float(target)])[0])
+
+
+class RepTableStore:
+    """
+    Process-wide cache of compiled rep tables.
+
+    Each table is parsed once and reused until its source file's mtime changes.
+    """
+
+    def __init__(self) -> None:
+        self._tables: dict[tuple[str, Path], tuple[tuple, RepTable]] = {}
+
+    def get(self, exercise_name: str, rep_table_dir: str | Path) -> RepTable:
+        path = get_rep_table_path(exercise_name, rep_table_dir)
+
+        compiled_path = path.with_suffix(COMPILED_SUFFIX)
+        stamp = (_mtime_ns(path), _mtime_ns(compiled_path))
+
+        if stamp[0] is None:
+            raise RepTableError(f"Rep table file not found: {path}")
+
+        key = (exercise_name, path)
+        cached = self._tables.get(key)
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
+
+        table = load_rep_table(exercise_name, rep_table_dir)
+        self._tables[key] = (stamp, table)
+        return table
+
+    def clear(self) -> None:
+        self._tables.clear()
+
+
+_STORE = RepTableStore()
+
+
+def _mtime_ns(path: Path) -> int | None:
+    try:
+        return path.stat().st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+
+def _is_compiled_fresh(source_path: Path, compiled_path: Path) -> bool:
+    compiled_mtime = _mtime_ns(compiled_path)
+    if compiled_mtime is None:
+        return False
+    return compiled_mtime >= _mtime_ns(source_path)
+
+
+def load_rep_table(exercise_name: str, rep_table_dir: str | Path) -> RepTable:
+    """
+    Load a rep table for lookups. Reads the compiled artifact when it is
+    fresh, so pandas and openpyxl are only needed for stale or uncompiled
+    tables.
+    """
+    path = get_rep_table_path(exercise_name, rep_table_dir)
+
+    if not path.exists():
+        raise RepTableError(f"Rep table file not found: {path}")
+
+    compiled_path = path.with_suffix(COMPILED_SUFFIX)
+    if _is_compiled_fresh(path, compiled_path):
+        return load_compiled_rep_table(exercise_name, compiled_path)
+
+    return RepTable.from_frame(exercise_name, _read_rep_table_xlsx(path))
+
+
+def load_compiled_rep_table(exercise_name: str, compiled_path: str | Path) -> RepTable:
+    try:
+        with np.load(compiled_path, allow_pickle=False) as data:
+            version = int(data["format_version"])
+            base_weights = data["base_weight"]
+            reps = data["reps"]
+            matrix = data["e1rm"]
+    except (OSError, KeyError, ValueError) as exc:
+        raise RepTableError(
+            f"Could not read compiled rep table {compiled_path}: {exc}"
+        ) from exc
+
+    if version != COMPILED_FORMAT_VERSION:
+        raise RepTableError(
+            f"Compiled rep table {compiled_path} has format version {version}, "
+            f"expected {COMPILED_FORMAT_VERSION}. Re-run 'training-plan compile-tables'."
+        )
+
+    if matrix.shape != (len(base_weights), len(reps)):
+        raise RepTableError(f"Compiled rep table is malformed: {compiled_path}")
+
+    columns = {int(rep): matrix[:, i] for i, rep in enumerate(reps)}
+    return RepTable(exercise_name, base_weights, columns)
+
+
+def compile_rep_table(exercise_name: str, rep_table_dir: str | Path) -> Path:
+    """
+    Parse the source xlsx for an exercise and write its compiled artifact.
+
+    Values are kept as float64 so compiled lookups match xlsx lookups exactly.
+    """
+    path = get_rep_table_path(exercise_name, rep_table_dir)
+
+    if not path.exists():
+        raise RepTableError(f"Rep table file not found: {path}")
+
+    table = RepTable.from_frame(exercise_name, _read_rep_table_xlsx(path))
+    compiled_path = path.with_suffix(COMPILED_SUFFIX)
+    matrix = np.column_stack([table.column(rep) for rep in table.reps])
+
+    with compiled_path.open("wb") as f:
+        np.savez(
+            f,
+            format_version=np.int64(COMPILED_FORMAT_VERSION),
+            base_weight=table.base_weights,
+            reps=np.asarray(table.reps, dtype=np.int64),
+            e1rm=matrix,
+        )
+
+    return compiled_path
+
+
+def compile_rep_tables(rep_table_dir: str | Path) -> dict[str, Path]:
+    """
+    Compile every mapped rep table found in rep_table_dir.
+
+    Returns:
+        {exercise_name: compiled_path} for the tables that were compiled
+    """
+    compiled: dict[str, Path] = {}
+    for exercise_name in REP_TABLE_FILES:
+        if get_rep_table_path(exercise_name, rep_table_dir).exists():
+            compiled[exercise_name] = compile_rep_table(exercise_name, rep_table_dir)
+    return compiled
+
+
+def get_rep_table_store() -> RepTableStore:
+    return _STORE
+
+
 def get_supported_reps(exercise_name: str, rep_table_dir: str | Path) -> list[int]:
-    df = load_rep_table_matrix(exercise_name, rep_table_dir)
-    return [col for col in df.columns if isinstance(col, int)]
+    return list(_STORE.get(exercise_name, rep_table_dir).reps)
 
 
 def get_rep_table_percent_for_reps(
@@ -87,12 +339,7 @@ def get_rep_table_percent_for_reps(
     reps: int,
     rep_table_dir: str | Path,
 ) -> float:
-    supported = get_supported_reps(exercise_name, rep_table_dir)
-    if reps not in supported:
-        raise RepTableError(
-            f"Reps={reps} not supported in rep table for '{exercise_name}'. "
-            f"Supported reps: {supported}"
-        )
+    _STORE.get(exercise_name, rep_table_dir).require_reps(reps)
     return float(reps)
 
 
@@ -113,16 +360,5 @@ def calculate_weight_from_rep_table(
     - find the row whose estimated-1RM cell is closest to target_weight
     - return that row's base_weight
     """
-    df = load_rep_table_matrix(exercise_name, rep_table_dir)
-
-    if reps not in df.columns:
-        supported = [col for col in df.columns if isinstance(col, int)]
-        raise RepTableError(
-            f"Reps={reps} not supported in rep table for '{exercise_name}'. "
-            f"Supported reps: {supported}"
-        )
-
-    target_estimated_1rm = float(target_weight)
-
-    idx = (df[reps] - target_estimated_1rm).abs().idxmin()
-    return float(df.loc[idx, "base_weight"])
+    table = _STORE.get(exercise_name, rep_table_dir)
+    return table.nearest_base_weight(reps, float(target_weight))
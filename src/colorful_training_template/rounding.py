@@ -3,6 +3,8 @@ from __future__ import annotations
 import math
 from typing import Any
 
+import numpy as np
+
 
 class RoundingError(Exception):
     """Raised when rounding configuration is invalid."""
@@ -69,3 +71,35 @@ def round_to_increment(value: float, increment: float, mode: str = "nearest") ->
 
     # Avoid float junk like 75.0000000001
     return round(rounded, 6)
+
+
+def round_to_increment_array(
+    values: np.ndarray,
+    increments: np.ndarray,
+    mode: str = "nearest",
+) -> np.ndarray:
+    """
+    Vectorised round_to_increment over matching arrays of values and increments.
+
+    Uses round-half-to-even for "nearest", like the built-in round().
+    """
+    values = np.asarray(values, dtype=np.float64)
+    increments = np.asarray(increments, dtype=np.float64)
+
+    invalid = increments <= 0
+    if invalid.any():
+        raise RoundingError(f"increment must be > 0, got {increments[invalid][0]}")
+
+    scaled = values / increments
+
+    if mode == "nearest":
+        rounded = np.rint(scaled) * increments
+    elif mode == "up":
+        rounded = np.ceil(scaled) * increments
+    elif mode == "down":
+        rounded = np.floor(scaled) * increments
+    else:
+        raise RoundingError(f"Unknown rounding mode: {mode!r}")
+
+    # Avoid float junk like 75.0000000001
+    return np.round(rounded, 6)
@@ -0,0 +1,133 @@
+"""
+Stage timing for the build pipeline.
+
+Code marks its stages with `with stage("name"):`. Outside of a
+`recording(...)` block that is a no-op, so components can be instrumented
+without threading a timer through every call. Inside one, each stage's
+wall time (and, with trace_memory, its peak traced memory) is recorded in
+a tree that mirrors how the stages nest.
+"""
+
+from __future__ import annotations
+
+import json
+import time
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Iterator
+
+
+@dataclass(slots=True)
+class StageRecord:
+    name: str
+    seconds: float = 0.0
+    peak_bytes: int | None = None
+    children: list[StageRecord] = field(default_factory=list)
+
+    def to_dict(self) -> dict[str, Any]:
+        data: dict[str, Any] = {"name": self.name, "seconds": round(self.seconds, 6)}
+        if self.peak_bytes is not None:
+            data["peak_bytes"] = self.peak_bytes
+        if self.children:
+            data["children"] = [child.to_dict() for child in self.children]
+        return data
+
+
+class StageTimer:
+    def __init__(self, trace_memory: bool = False) -> None:
+        self.trace_memory = trace_memory
+        self.root = StageRecord("total")
+        self._stack: list[StageRecord] = [self.root]
+
+    def _sample_peak(self, record: StageRecord) -> None:
+        peak = tracemalloc.get_traced_memory()[1]
+        record.peak_bytes = max(record.peak_bytes or 0, peak)
+        tracemalloc.reset_peak()
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[StageRecord]:
+        parent = self._stack[-1]
+        record = StageRecord(name)
+        parent.children.append(record)
+        if self.trace_memory:
+            # Close the parent's peak so far, then measure this stage alone.
+            self._sample_peak(parent)
+
+        self._stack.append(record)
+        started = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record.seconds = time.perf_counter() - started
+            self._stack.pop()
+            if self.trace_memory:
+                self._sample_peak(record)
+                parent.peak_bytes = max(parent.peak_bytes or 0, record.peak_bytes)
+
+    def top_level(self) -> dict[str, float]:
+        """Seconds per top-level stage, summed over repeats."""
+        totals: dict[str, float] = {}
+        for record in self.root.children:
+            totals[record.name] = totals.get(record.name, 0.0) + record.seconds
+        return totals
+
+    def to_dict(self) -> dict[str, Any]:
+        return self.root.to_dict()
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict(), indent=2)
+
+    def format_table(self) -> str:
+        show_memory = self.trace_memory
+        lines = []
+        header = f"{'Stage':<44} {'Time (ms)':>10}"
+        if show_memory:
+            header += f" {'Peak (MiB)':>11}"
+        lines.append(header)
+        lines.append("-" * len(header))
+
+        def add(record: StageRecord, depth: int) -> None:
+            line = f"{'  ' * depth + record.name:<44} {record.seconds * 1000:>10.1f}"
+            if show_memory and record.peak_bytes is not None:
+                line += f" {record.peak_bytes / (1024 * 1024):>11.1f}"
+            lines.append(line)
+            for child in record.children:
+                add(child, depth + 1)
+
+        add(self.root, 0)
+        return "\n".join(lines)
+
+
+_ACTIVE: StageTimer | None = None
+
+
+@contextmanager
+def recording(timer: StageTimer) -> Iterator[StageTimer]:
+    """Send every stage() entered inside this block to timer."""
+    global _ACTIVE
+    previous = _ACTIVE
+    _ACTIVE = timer
+    started_tracing = timer.trace_memory and not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    started = time.perf_counter()
+    try:
+        yield timer
+    finally:
+        timer.root.seconds += time.perf_counter() - started
+        if timer.trace_memory:
+            timer._sample_peak(timer.root)
+        if started_tracing:
+            tracemalloc.stop()
+        _ACTIVE = previous
+
+
+@contextmanager
+def stage(name: str) -> Iterator[StageRecord | None]:
+    """Time a stage of the build if a recording is active."""
+    if _ACTIVE is None:
+        yield None
+        return
+    with _ACTIVE.stage(name) as record:
+        yield record
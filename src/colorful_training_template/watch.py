@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+import time
+from pathlib import Path
+from typing import Any
+
+from colorful_training_template import config
+from colorful_training_template.config import (
+    load_program,
+    load_settings,
+    load_training_maxes,
+)
+from colorful_training_template.incremental import IncrementalBuild
+from colorful_training_template.main import build_plan
+from colorful_training_template.rep_table import DEFAULT_REP_TABLE_DIR
+from colorful_training_template.renderer import draft_settings
+from colorful_training_template.timing import StageTimer, recording, stage
+
+DEFAULT_POLL_INTERVAL = 0.2
+DEFAULT_DEBOUNCE = 0.3
+WATCHED_SUFFIXES = (".yaml", ".yml", ".xlsx")
+
+# path -> (mtime_ns, size)
+Snapshot = dict[Path, tuple[int, int]]
+
+
+def snapshot(directories: list[Path], exclude: set[Path]) -> Snapshot:
+    """Stat every watched file directly under the given directories."""
+    files: Snapshot = {}
+    for directory in directories:
+        if not directory.is_dir():
+            continue
+        for path in directory.iterdir():
+            if path.suffix not in WATCHED_SUFFIXES or path.resolve() in exclude:
+                continue
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            files[path] = (stat.st_mtime_ns, stat.st_size)
+    return files
+
+
+def changed_files(before: Snapshot, after: Snapshot) -> list[Path]:
+    return sorted(
+        path
+        for path in before.keys() | after.keys()
+        if before.get(path) != after.get(path)
+    )
+
+
+class WatchEngine:
+    """
+    A build engine that stays warm between rebuilds.
+
+    Imports, parsed YAML documents (yaml_io), rep tables (RepTableStore)
+    and the calculated weeks of the last build (IncrementalBuild) all live
+    for as long as the engine, so a rebuild only re-parses the files that
+    changed and recalculates the weeks that changed. A draft engine
+    renders draft workbooks (see renderer.draft_settings).
+    """
+
+    def __init__(self, draft: bool = False) -> None:
+        self.incremental = IncrementalBuild()
+        self.draft = draft
+
+    def rebuild(self) -> tuple[dict[str, Any], dict[str, float]]:
+        """Build once. Returns the settings used and per-stage seconds."""
+        timer = StageTimer()
+        with recording(timer):
+            with stage("load"):
+                settings = load_settings()
+                if self.draft:
+                    settings = draft_settings(settings)
+                training_maxes = load_training_maxes()
+                program = load_program()
+
+            build_plan(program, training_maxes, settings, self.incremental)
+        return settings, timer.top_level()
+
+
+def watched_directories() -> list[Path]:
+    directories = [config.DATA_DIR]
+    try:
+        rep_table_dir = load_settings().get("rep_table_dir", DEFAULT_REP_TABLE_DIR)
+    except config.ConfigError:
+        rep_table_dir = DEFAULT_REP_TABLE_DIR
+    directories.append(Path(rep_table_dir))
+    return directories
+
+
+def output_paths() -> set[Path]:
+    """Outputs the build writes itself, which must not trigger a rebuild."""
+    try:
+        settings = load_settings()
+    except config.ConfigError:
+        return set()
+    return {
+        Path(settings[key]).resolve() for key in ("output_yaml", "output_workbook")
+    }
+
+
+def format_timings(timings: dict[str, float]) -> str:
+    total = sum(timings.values())
+    stages = " | ".join(
+        f"{stage} {seconds * 1000:.0f}ms" for stage, seconds in timings.items()
+    )
+    return f"{stages} | total {total * 1000:.0f}ms"
+
+
+def watch(
+    poll_interval: float = DEFAULT_POLL_INTERVAL,
+    debounce: float = DEFAULT_DEBOUNCE,
+    draft: bool = False,
+) -> int:
+    """
+    Rebuild whenever an input under DATA_DIR or the rep table directory
+    changes. Changes are detected by polling file mtimes and sizes; a
+    rebuild starts once no file has changed for `debounce` seconds.
+    Runs until interrupted. With draft, every build is a draft build.
+    """
+    engine = WatchEngine(draft)
+
+    def run_build(reason: str) -> None:
+        print(f"[watch] {reason}")
+        try:
+            settings, timings = engine.rebuild()
+        except Exception as exc:
+            print(f"[watch] Build failed: {exc}")
+            return
+        print(
+            f"[watch] Built {settings['output_workbook']} "
+            f"(reused {engine.incremental.reused} weeks, "
+            f"recalculated {engine.incremental.recalculated})"
+        )
+        print(f"[watch] {format_timings(timings)}")
+
+    directories = watched_directories()
+    exclude = output_paths()
+    current = snapshot(directories, exclude)
+    run_build("Initial build")
+    print(
+        "[watch] Watching "
+        + ", ".join(str(directory) for directory in directories)
+        + " (Ctrl+C to stop)"
+    )
+
+    try:
+        while True:
+            time.sleep(poll_interval)
+            latest = snapshot(directories, exclude)
+            if latest == current:
+                continue
+
+            # Debounce: editors often write a file in several steps, so wait
+            # for the files to settle before building.
+            changed = set(changed_files(current, latest))
+            while True:
+                time.sleep(debounce)
+                settled = snapshot(directories, exclude)
+                if settled == latest:
+                    break
+                changed.update(changed_files(latest, settled))
+                latest = settled
+
+            # settings.yaml may have moved the outputs or the rep tables.
+            directories = watched_directories()
+            exclude = output_paths()
+            current = snapshot(directories, exclude)
+            run_build(
+                "Changed: " + ", ".join(str(path) for path in sorted(changed))
+            )
+    except KeyboardInterrupt:
+        print("[watch] Stopped")
+    return 0
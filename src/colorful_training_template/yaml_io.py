@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import hashlib
+import io
+import os
+from pathlib import Path
+from typing import IO, Any
+
+import yaml
+
+# Prefer the libyaml-backed C implementations; they produce the same
+# documents as the pure-Python ones, only faster.
+try:
+    from yaml import CSafeDumper as SafeDumper
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeDumper, SafeLoader
+
+# Absolute path -> (SHA-256 of the file's bytes, parsed document)
+_DOCUMENT_CACHE: dict[str, tuple[bytes, Any]] = {}
+
+
+def safe_load(stream: str | bytes | IO) -> Any:
+    return yaml.load(stream, Loader=SafeLoader)
+
+
+def safe_dump(data: Any, stream: IO | None = None, **kwargs: Any) -> str | None:
+    return yaml.dump(data, stream, Dumper=SafeDumper, **kwargs)
+
+
+def load_yaml_file(path: str | Path) -> Any:
+    """
+    Parse a YAML file, reusing the previous result while the file's
+    content is unchanged.
+
+    The file is read every time and compared by hash: a stamp of mtime and
+    size misses a same-size edit saved within one mtime tick, which a quick
+    save-and-rebuild in watch mode can produce on coarse-mtime filesystems.
+    Reading and hashing costs a small fraction of parsing.
+
+    The returned document is shared between callers and must be treated as
+    read-only.
+    """
+    key = os.path.abspath(path)
+    with open(key, "rb") as f:
+        raw = f.read()
+    digest = hashlib.sha256(raw).digest()
+
+    cached = _DOCUMENT_CACHE.get(key)
+    if cached is not None and cached[0] == digest:
+        return cached[1]
+
+    # Decoded as open(key, encoding="utf-8") would, newlines included.
+    data = safe_load(io.TextIOWrapper(io.BytesIO(raw), encoding="utf-8"))
+
+    _DOCUMENT_CACHE[key] = (digest, data)
+    return data
+
+
+def clear_yaml_cache() -> None:
+    _DOCUMENT_CACHE.clear()